@@ -1,23 +1,45 @@
+import logging
+import os
+import time
+from agent_config.dsql_pool import get_sql_backend
 from agent_config.memory_hook_provider import MemoryHook
+from agent_config.model_clients import get_bedrock_model
+from agent_config.prompt_cache import cache_hit_ratio, cacheable_system_prompt, model_id_of
+from agent_config.schema_catalog import get_schema_catalog, row_estimates_prompt, schema_prompt
+from agent_config.structured_logging import DEFAULT_LOG_SAMPLE_RATE, log_event
+from agent_config.telemetry import record_time_to_first_token, record_tokens, stage, traced_iter
 from agent_config.tools.dsql_mcp_assistant import dsql_assistant
+from agent_config.tools.sql_tool_proxy import wrap_sql_tools
 from strands import Agent
 from strands_tools import think
-from strands.models import BedrockModel
 from typing import List
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+# How database tools are exposed to the agent:
+#   nested - through the dsql_assistant tool, which runs a SQL sub-agent
+#   flat   - the pooled MCP database tools directly, in one reasoning loop
+TOOL_MODES = ("nested", "flat")
+DEFAULT_TOOL_MODE = os.environ.get("DSQL_TOOL_MODE", "nested")
+
 
 class DSQLAssistant:
     def __init__(
         self,
         memory_hook: MemoryHook,
-        bedrock_model_id: str = "us.amazon.nova-pro-v1:0",
+        bedrock_model_id: str = DEFAULT_MODEL_ID,
         system_prompt: str = None,
         tools: List[callable] = None,
+        tool_mode: str = DEFAULT_TOOL_MODE,
     ):
+        if tool_mode not in TOOL_MODES:
+            raise ValueError(f"Unknown tool mode {tool_mode!r}, expected one of {TOOL_MODES}")
+        self.tool_mode = tool_mode
         self.model_id = bedrock_model_id
-        self.model = BedrockModel(
-            model_id=self.model_id,
-        )
+        # Shared per model id, so requests reuse the client's warm connections to Bedrock
+        self.model = get_bedrock_model(self.model_id)
         self.system_prompt = (
             system_prompt
             if system_prompt
@@ -53,19 +75,29 @@ You have been provided with database tools to help resolve user inquiries.
 </guidelines>"""
         )
 
-        # Use only the dsql_assistant tool (which handles MCP client internally)
-        self.tools = (
-            [
-                think,
-                dsql_assistant,
-            ]
-            + (tools or [])
-        )
-        
+        prompt_sections = [self.system_prompt]
+        uncached_sections = []
+        if self.tool_mode == "flat":
+            # Register the pooled database tools on this agent, saving the sub-agent's
+            # extra model round trips, and give it the schema the sub-agent would get
+            database_tools = wrap_sql_tools(get_sql_backend().tools())
+            catalog = get_schema_catalog()
+            prompt_sections.append(schema_prompt(catalog.digest()))
+            uncached_sections.append(row_estimates_prompt(catalog.row_estimates()))
+        else:
+            # Use only the dsql_assistant tool (which handles MCP client internally)
+            database_tools = [dsql_assistant]
+
+        self.tools = [think] + database_tools + (tools or [])
+
         self.memory_hook = memory_hook
+        # Cleared when a turn fails partway, so the agent pool does not reuse a broken conversation
+        self.healthy = True
+        # Only static sections go before the system prompt's cache point, so it is
+        # cached across requests and sessions; the memory hook adds history as messages
         self.agent = Agent(
             model=self.model,
-            system_prompt=self.system_prompt,
+            system_prompt=cacheable_system_prompt(prompt_sections, model_id_of(self.model), uncached_sections),
             tools=self.tools,
             hooks=[self.memory_hook],
         )
@@ -78,10 +110,47 @@ You have been provided with database tools to help resolve user inquiries.
         return response
 
     async def stream(self, user_query: str):
-        try:
-            async for event in self.agent.stream_async(user_query):
-                if "data" in event:
-                    # Only stream text chunks to the client
-                    yield event["data"]
-        except Exception as e:
-            yield f"We are unable to process your request at the moment. Error: {e}"
\ No newline at end of file
+        attributes = {"session.id": self.memory_hook.session_id, "agent.tool_mode": self.tool_mode}
+        # Not current across yields: the span is made current only while the agent produces an event
+        with stage("agent.stream", attributes, {"tool_mode": self.tool_mode}, current=False) as span:
+            started = time.perf_counter()
+            first_chunk = True
+            usage = {"inputTokens": 0, "outputTokens": 0, "cacheReadInputTokens": 0, "cacheWriteInputTokens": 0}
+            model_latency_ms = 0
+            try:
+                async for event in traced_iter(span, self.agent.stream_async(user_query)):
+                    if "data" in event:
+                        if first_chunk:
+                            first_chunk = False
+                            elapsed_ms = (time.perf_counter() - started) * 1000
+                            span.set_attribute("gen_ai.time_to_first_token_ms", elapsed_ms)
+                            record_time_to_first_token(elapsed_ms, {"tool_mode": self.tool_mode})
+                        # Only stream text chunks to the client
+                        yield event["data"]
+                    elif "event" in event and "metadata" in event["event"]:
+                        metadata = event["event"]["metadata"]
+                        for key, value in metadata.get("usage", {}).items():
+                            if key in usage:
+                                usage[key] += value
+                        model_latency_ms += metadata.get("metrics", {}).get("latencyMs", 0)
+            except Exception as e:
+                self.healthy = False
+                span.set_attribute("error.message", str(e))
+                yield f"We are unable to process your request at the moment. Error: {e}"
+            hit_ratio = cache_hit_ratio(usage)
+            span.set_attribute("gen_ai.usage.input_tokens", usage["inputTokens"])
+            span.set_attribute("gen_ai.usage.output_tokens", usage["outputTokens"])
+            span.set_attribute("gen_ai.usage.cache_read_input_tokens", usage["cacheReadInputTokens"])
+            span.set_attribute("gen_ai.usage.cache_write_input_tokens", usage["cacheWriteInputTokens"])
+            span.set_attribute("prompt_cache.hit_ratio", hit_ratio)
+            span.set_attribute("gen_ai.model_latency_ms", model_latency_ms)
+            record_tokens(
+                usage["inputTokens"], usage["outputTokens"], {"agent": "assistant", "tool_mode": self.tool_mode},
+                cache_read_tokens=usage["cacheReadInputTokens"], cache_write_tokens=usage["cacheWriteInputTokens"],
+            )
+            log_event(
+                logger, logging.INFO, "agent.usage", sample=DEFAULT_LOG_SAMPLE_RATE,
+                input_tokens=usage["inputTokens"], output_tokens=usage["outputTokens"],
+                cache_read_tokens=usage["cacheReadInputTokens"], cache_write_tokens=usage["cacheWriteInputTokens"],
+                cache_hit_ratio=round(hit_ratio, 3), model_latency_ms=model_latency_ms,
+            )
@@ -0,0 +1,187 @@
+"""
+Agent Pool for DSQL Assistant
+
+This module keeps warm DSQLAssistant instances keyed by (actor_id, session_id)
+so a session's agent, with its conversation state, is reused across turns.
+Agents are evicted by idle time, LRU order and an approximate memory cap,
+and each session is served by at most one turn at a time.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pool limits (overridable through the environment)
+DEFAULT_MAX_AGENTS = int(os.environ.get("AGENT_POOL_MAX_AGENTS", "64"))
+DEFAULT_MAX_IDLE_SECONDS = float(os.environ.get("AGENT_POOL_MAX_IDLE_SECONDS", "900"))
+DEFAULT_MAX_TOTAL_BYTES = int(os.environ.get("AGENT_POOL_MAX_BYTES", str(64 * 1024 * 1024)))
+
+SessionKey = Tuple[str, str]
+
+
+class _PoolEntry:
+    """A pooled agent and the per-session guard serializing its turns"""
+
+    def __init__(self):
+        self.agent: Optional[Any] = None
+        self.lock = asyncio.Lock()
+        self.leases = 0  # turns holding or waiting for the lock
+        self.last_used = time.monotonic()
+        self.size_bytes = 0
+
+
+def estimate_agent_bytes(agent: Any) -> int:
+    """
+    Approximate the memory held by an agent's conversation.
+
+    Args:
+        agent: A DSQLAssistant (or anything exposing agent.messages)
+
+    Returns:
+        int: Serialized size of the conversation in bytes
+    """
+    inner = getattr(agent, "agent", agent)
+    messages = getattr(inner, "messages", None) or []
+    try:
+        return len(json.dumps(messages, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class AgentPool:
+    """Process-level pool of session agents with LRU and idle-time eviction"""
+
+    def __init__(
+        self,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+        max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+        size_estimator: Callable[[Any], int] = estimate_agent_bytes,
+    ):
+        """
+        Initialize the agent pool.
+
+        Args:
+            max_agents: Maximum number of pooled agents
+            max_idle_seconds: Seconds after which an unused agent is evicted
+            max_total_bytes: Approximate cap on conversation memory across all agents
+            size_estimator: Callable estimating the memory held by one agent
+        """
+        self.max_agents = max_agents
+        self.max_idle_seconds = max_idle_seconds
+        self.max_total_bytes = max_total_bytes
+        self._size_estimator = size_estimator
+        self._entries: "OrderedDict[SessionKey, _PoolEntry]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        actor_id: str,
+        session_id: str,
+        factory: Callable[[], Any],
+    ) -> AsyncIterator[Any]:
+        """
+        Lease the agent for a session, creating it with factory on a miss.
+
+        Turns for the same session wait for each other; different sessions
+        never share an agent. A turn that ends with an exception, is
+        cancelled (e.g. the client disconnected) or leaves the agent with
+        healthy set to False drops the agent, since its conversation may be
+        left half finished, such as a toolUse without its toolResult; the
+        session's next turn builds a new agent.
+
+        Args:
+            actor_id: ID of the user/actor
+            session_id: ID of the conversation session
+            factory: Blocking callable building a new agent, run in a worker thread
+        """
+        key = (actor_id, session_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _PoolEntry()
+        self._entries.move_to_end(key)
+
+        entry.leases += 1
+        try:
+            async with entry.lock:
+                if entry.agent is None:
+                    self._stats["misses"] += 1
+                    entry.agent = await asyncio.to_thread(factory)
+                else:
+                    self._stats["hits"] += 1
+                completed = False
+                try:
+                    yield entry.agent
+                    completed = True
+                finally:
+                    entry.last_used = time.monotonic()
+                    if completed and getattr(entry.agent, "healthy", True):
+                        entry.size_bytes = self._size_estimator(entry.agent)
+                    else:
+                        entry.agent = None
+                        entry.size_bytes = 0
+        finally:
+            entry.leases -= 1
+            if entry.agent is None and entry.leases == 0 and self._entries.get(key) is entry:
+                # Agent creation or the turn failed; do not keep an empty slot around
+                del self._entries[key]
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Evict idle agents, then least recently used agents over the limits.
+
+        Agents with a turn in progress or waiting are never evicted.
+
+        Returns:
+            int: Number of evicted agents
+        """
+        now = time.monotonic()
+        evicted = 0
+        for key, entry in list(self._entries.items()):
+            if entry.leases == 0 and now - entry.last_used > self.max_idle_seconds:
+                del self._entries[key]
+                evicted += 1
+
+        total_bytes = sum(entry.size_bytes for entry in self._entries.values())
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_agents and total_bytes <= self.max_total_bytes:
+                break
+            if entry.leases:
+                continue
+            del self._entries[key]
+            total_bytes -= entry.size_bytes
+            evicted += 1
+
+        if evicted:
+            self._stats["evictions"] += evicted
+            logger.info(f"Evicted {evicted} pooled agents, {len(self._entries)} remaining")
+        return evicted
+
+    def discard(self, actor_id: str, session_id: str) -> None:
+        """Drop a session's agent so its next turn starts fresh"""
+        entry = self._entries.get((actor_id, session_id))
+        if entry is not None and entry.leases == 0:
+            del self._entries[(actor_id, session_id)]
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters and current occupancy"""
+        return dict(
+            self._stats,
+            agents=len(self._entries),
+            total_bytes=sum(entry.size_bytes for entry in self._entries.values()),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+agent_pool = AgentPool()
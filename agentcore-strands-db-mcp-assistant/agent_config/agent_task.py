@@ -1,40 +1,62 @@
+from .agent_pool import agent_pool
 from .context import DSQLAssistantContext
 from .memory_hook_provider import MemoryHook
+from .telemetry import stage
 from scripts.utils import get_ssm_parameter
 from agent_config.agent import DSQLAssistant
-from bedrock_agentcore.memory import MemoryClient
 import logging
+import threading
 
-# Logging setup
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-memory_client = MemoryClient()
+# AgentCore Memory client, created on first use rather than at import
+memory_client = None
+_memory_client_lock = threading.Lock()
+
+def get_memory_client():
+    """Get the process-wide AgentCore Memory client, creating it on first use"""
+    global memory_client
+    if memory_client is None:
+        with _memory_client_lock:
+            if memory_client is None:
+                from bedrock_agentcore.memory import MemoryClient
+
+                memory_client = MemoryClient()
+    return memory_client
+
+def create_agent(actor_id: str, session_id: str) -> DSQLAssistant:
+    """Build a new agent whose memory hook is bound to one actor and session"""
+    with stage("ssm.lookup", {"ssm.parameter": "MEMORY_ID"}):
+        memory_id = get_ssm_parameter("/agentcore-db-mcp-assistant/MEMORY_ID")
+    memory_hook = MemoryHook(
+        memory_client=get_memory_client(),
+        memory_id=memory_id,
+        actor_id=actor_id,
+        session_id=session_id,
+    )
+    return DSQLAssistant(
+        memory_hook=memory_hook,
+    )
 
 async def agent_task(user_message: str, session_id: str, actor_id: str):
-    agent = DSQLAssistantContext.get_agent_ctx()
     response_queue = DSQLAssistantContext.get_response_queue_ctx()
     gateway_access_token = DSQLAssistantContext.get_gateway_token_ctx()
     
     try:
-        if agent is None:
-            memory_hook = MemoryHook(
-                memory_client=memory_client,
-                memory_id=get_ssm_parameter("/agentcore-db-mcp-assistant/MEMORY_ID"),
-                actor_id=actor_id,
-                session_id=session_id,
-            )
-            
-            agent = DSQLAssistant(
-                memory_hook=memory_hook,
-            )
-            DSQLAssistantContext.set_agent_ctx(agent)
-        
-        async for chunk in agent.stream(user_query=user_message):
-            await response_queue.put(chunk)
+        with stage("agent_task", {"session.id": session_id, "actor.id": actor_id}) as span:
+            chunks = 0
+            async with agent_pool.lease(
+                actor_id, session_id, lambda: create_agent(actor_id, session_id)
+            ) as agent:
+                async for chunk in agent.stream(user_query=user_message):
+                    await response_queue.put(chunk)
+                    chunks += 1
+            span.set_attribute("stream.chunks", chunks)
             
     except Exception as e:
+        # The pool has already dropped the agent, whose conversation may be incomplete;
+        # the same happens on cancellation, which is not an Exception
         logger.exception("Agent execution failed.")
         await response_queue.put(f"Error: {str(e)}")
     finally:
-        await response_queue.finish()
\ No newline at end of file
+        await response_queue.finish()
@@ -1,8 +1,10 @@
 """
 DSQL Assistant Context Management
 
-This module manages the context for the DSQL assistant, including
-streaming queue and other shared state.
+This module manages the per-request context for the DSQL assistant,
+including the streaming queue, the client's query result format and the
+gateway token. Agents are kept in the
+session-keyed pool in agent_pool.
 """
 
 from contextvars import ContextVar
@@ -14,8 +16,8 @@ class DSQLAssistantContext:
     """Context manager for DSQL Assistant shared state"""
     
     _response_queue_ctx: ContextVar[Optional[StreamingQueue]] = ContextVar('response_queue', default=None)
+    _result_format_ctx: ContextVar[Optional[str]] = ContextVar('result_format', default=None)
     _gateway_token_ctx: ContextVar[Optional[str]] = ContextVar('gateway_token', default=None)
-    _agent_ctx: ContextVar[Optional[object]] = ContextVar('agent', default=None)
     
     @classmethod
     def get_response_queue_ctx(cls) -> Optional[StreamingQueue]:
@@ -27,6 +29,16 @@ class DSQLAssistantContext:
         """Set the response queue in context"""
         cls._response_queue_ctx.set(queue)
     
+    @classmethod
+    def get_result_format_ctx(cls) -> Optional[str]:
+        """Get the query result format the client asked for, None if it did not"""
+        return cls._result_format_ctx.get()
+    
+    @classmethod
+    def set_result_format_ctx(cls, result_format: Optional[str]) -> None:
+        """Set the query result format the client asked for"""
+        cls._result_format_ctx.set(result_format)
+    
     @classmethod
     def get_gateway_token_ctx(cls) -> Optional[str]:
         """Get the current gateway token from context"""
@@ -36,13 +48,3 @@ class DSQLAssistantContext:
     def set_gateway_token_ctx(cls, token: str) -> None:
         """Set the gateway token in context"""
         cls._gateway_token_ctx.set(token)
-    
-    @classmethod
-    def get_agent_ctx(cls) -> Optional[object]:
-        """Get the current agent from context"""
-        return cls._agent_ctx.get()
-    
-    @classmethod
-    def set_agent_ctx(cls, agent: object) -> None:
-        """Set the agent in context"""
-        cls._agent_ctx.set(agent)
\ No newline at end of file
@@ -0,0 +1,488 @@
+"""
+Direct DSQL Connection Pool for DSQL Assistant
+
+This module is an alternative SQL backend to the MCP session pool. It
+serves the readonly_query, transact and get_schema tools of the Aurora
+DSQL MCP server from an in-process asyncpg connection pool to the DSQL
+endpoint, so a query no longer crosses the stdio JSON-RPC hop to the MCP
+server process. IAM auth tokens are generated once and reused for new
+connections until shortly before they expire. SQL_BACKEND selects the
+backend; both expose the same tools, so the SQL proxy, schema catalog and
+agents work unchanged.
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+from .mcp_session_pool import (
+    DEFAULT_ACQUIRE_TIMEOUT,
+    MCPSessionPool,
+    PoolExhaustedError,
+    dsql_endpoint,
+    get_mcp_session_pool,
+)
+from .structured_logging import log_event
+from .telemetry import stage
+
+try:
+    import asyncpg
+except ImportError:  # The direct backend is optional
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+# SQL backend: "mcp" (Aurora DSQL MCP server) or "direct" (asyncpg pool)
+SQL_BACKEND = os.environ.get("SQL_BACKEND", "mcp").lower()
+
+# Pool sizing (overridable through the environment)
+DEFAULT_DSQL_POOL_MIN_SIZE = int(os.environ.get("DSQL_POOL_MIN_SIZE", "1"))
+DEFAULT_DSQL_POOL_MAX_SIZE = int(os.environ.get("DSQL_POOL_MAX_SIZE", "4"))
+# Seconds an idle connection is kept open
+DEFAULT_DSQL_POOL_MAX_IDLE = float(os.environ.get("DSQL_POOL_MAX_IDLE", "300"))
+
+# IAM auth token lifetime, and how long before expiry a new token is generated
+DEFAULT_DSQL_TOKEN_EXPIRES_IN = int(os.environ.get("DSQL_TOKEN_EXPIRES_IN", "900"))
+DEFAULT_DSQL_TOKEN_REFRESH_MARGIN = float(os.environ.get("DSQL_TOKEN_REFRESH_MARGIN", "60"))
+
+DSQL_DATABASE_USER = os.environ.get("DSQL_DATABASE_USER", "admin")
+DSQL_DATABASE_NAME = "postgres"
+
+GET_SCHEMA_SQL = (
+    "SELECT column_name, data_type, is_nullable, column_default FROM information_schema.columns "
+    "WHERE table_name = $1 ORDER BY ordinal_position"
+)
+
+# Same tool names and inputs as the Aurora DSQL MCP server
+DSQL_TOOL_SPECS: List[ToolSpec] = [
+    {
+        "name": "readonly_query",
+        "description": "Run a read-only SQL query against the Aurora DSQL cluster and return the rows",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"sql": {"type": "string", "description": "The SQL query to run"}},
+            "required": ["sql"],
+        }},
+    },
+    {
+        "name": "transact",
+        "description": "Run one or more SQL statements in a single transaction against the Aurora DSQL cluster",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"sql_list": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "The SQL statements to run, in order",
+            }},
+            "required": ["sql_list"],
+        }},
+    },
+    {
+        "name": "get_schema",
+        "description": "Get the columns of a table in the Aurora DSQL cluster",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"table_name": {"type": "string", "description": "Name of the table"}},
+            "required": ["table_name"],
+        }},
+    },
+]
+
+
+DIRECT_BACKEND_UNAVAILABLE = "SQL_BACKEND=direct requires asyncpg; install it (pip install asyncpg) or set SQL_BACKEND=mcp"
+
+
+def asyncpg_available() -> bool:
+    """Whether the direct backend can be used"""
+    return asyncpg is not None
+
+
+def _json_value(value: Any) -> Any:
+    """JSON form of a database value that json cannot encode, as the MCP server returns it"""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class DSQLAuthTokenCache:
+    """Generates DSQL IAM auth tokens and reuses each until shortly before it expires"""
+
+    def __init__(
+        self,
+        hostname: str,
+        region: str,
+        user: str = DSQL_DATABASE_USER,
+        expires_in: int = DEFAULT_DSQL_TOKEN_EXPIRES_IN,
+        refresh_margin: float = DEFAULT_DSQL_TOKEN_REFRESH_MARGIN,
+        client: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the token cache.
+
+        Args:
+            hostname: DSQL cluster endpoint
+            region: AWS region of the cluster
+            user: Database user; "admin" gets an admin token
+            expires_in: Lifetime of a token in seconds
+            refresh_margin: Seconds before expiry at which a new token is generated
+            client: boto3 DSQL client, created on first use if None
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.hostname = hostname
+        self.region = region
+        self.user = user
+        self.expires_in = expires_in
+        self.refresh_margin = min(refresh_margin, expires_in / 2)
+        self._client = client
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._stats = {"generated": 0, "reused": 0}
+
+    def _generate(self) -> str:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("dsql", region_name=self.region)
+        if self.user == "admin":
+            return self._client.generate_db_connect_admin_auth_token(self.hostname, self.region, self.expires_in)
+        return self._client.generate_db_connect_auth_token(self.hostname, self.region, self.expires_in)
+
+    def token(self) -> str:
+        """
+        Get a valid auth token, generating one if the cached token is about to expire.
+
+        Returns:
+            str: Token used as the database password
+        """
+        with self._lock:
+            now = self._clock()
+            if self._token is None or now >= self._expires_at - self.refresh_margin:
+                self._token = self._generate()
+                self._expires_at = now + self.expires_in
+                self._stats["generated"] += 1
+                logger.info(f"Generated DSQL auth token for {self.user}, valid for {self.expires_in} s")
+            else:
+                self._stats["reused"] += 1
+            return self._token
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of generated and reused tokens"""
+        with self._lock:
+            return dict(self._stats)
+
+
+class DSQLConnectionPool:
+    """
+    asyncpg connection pool serving the DSQL database tools in process.
+
+    The pool runs on its own event loop thread, because asyncpg connections
+    belong to the loop that opened them while agents call tools from
+    several loops. Callers on any loop or thread submit work to it.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        token_cache: Optional[DSQLAuthTokenCache] = None,
+        min_size: int = DEFAULT_DSQL_POOL_MIN_SIZE,
+        max_size: int = DEFAULT_DSQL_POOL_MAX_SIZE,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        max_idle: float = DEFAULT_DSQL_POOL_MAX_IDLE,
+        **connect_kwargs: Any,
+    ):
+        """
+        Initialize the connection pool. Connections are opened by warm() or the first call.
+
+        Args:
+            dsn: PostgreSQL connection URL, e.g. of a local Postgres stand-in
+            token_cache: Auth token source used as the password of new connections
+            min_size: Number of connections opened when the pool starts
+            max_size: Maximum number of open connections
+            acquire_timeout: Seconds to wait for a free connection before failing
+            max_idle: Seconds after which an idle connection is closed
+            connect_kwargs: Further asyncpg connection arguments (host, user, database, ssl, ...)
+        """
+        if asyncpg is None:
+            raise RuntimeError("The direct SQL backend requires asyncpg (pip install asyncpg)")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._dsn = dsn
+        self._token_cache = token_cache
+        self._connect_kwargs = connect_kwargs
+        if token_cache is not None:
+            self._connect_kwargs["password"] = token_cache.token
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle = max_idle
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool = None
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "errors": 0, "retries": 0}
+
+    def _start(self) -> None:
+        """Start the pool's event loop thread and open min_size connections. Blocking."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DSQL connection pool is closed")
+            if self._pool is not None:
+                return
+            started = time.perf_counter()
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="dsql-pool", daemon=True)
+            thread.start()
+            with stage("db.pool_start"):
+                try:
+                    pool = asyncio.run_coroutine_threadsafe(self._create_pool(), loop).result()
+                except Exception:
+                    loop.call_soon_threadsafe(loop.stop)
+                    thread.join()
+                    loop.close()
+                    raise
+            # Publish the pool last: callers check _pool without the lock, then use _loop
+            self._loop, self._thread = loop, thread
+            self._pool = pool
+        log_event(
+            logger,
+            logging.INFO,
+            "db.pool_opened",
+            min_size=self.min_size,
+            max_size=self.max_size,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    async def _create_pool(self):
+        return await asyncpg.create_pool(
+            dsn=self._dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_idle,
+            **self._connect_kwargs,
+        )
+
+    async def _with_connection(self, work: Callable[[Any], Any], retry: bool) -> Any:
+        """Run work(connection) on a pooled connection. Runs on the pool's loop."""
+        for attempt in range(2 if retry else 1):
+            try:
+                connection = await self._pool.acquire(timeout=self.acquire_timeout)
+            except asyncio.TimeoutError:
+                raise PoolExhaustedError(
+                    f"No database connection available after waiting; pool size is {self.max_size}"
+                ) from None
+            try:
+                return await work(connection)
+            except (asyncpg.ConnectionDoesNotExistError, asyncpg.InterfaceError, ConnectionError):
+                # DSQL closes connections after an hour; a read can safely run again on a new one
+                if attempt or not retry:
+                    raise
+                with self._stats_lock:
+                    self._stats["retries"] += 1
+                logger.info("Database connection was closed, retrying on a new connection")
+            finally:
+                await self._pool.release(connection)
+
+    @staticmethod
+    async def _readonly_query(connection, sql: str) -> List[Dict[str, Any]]:
+        async with connection.transaction(readonly=True):
+            return [dict(record) for record in await connection.fetch(sql)]
+
+    @staticmethod
+    async def _transact(connection, sql_list: List[str]) -> List[Dict[str, Any]]:
+        records = []
+        async with connection.transaction():
+            for sql in sql_list:
+                records = await connection.fetch(sql)
+        return [dict(record) for record in records]
+
+    @staticmethod
+    async def _get_schema(connection, table_name: str) -> List[Dict[str, Any]]:
+        return [dict(record) for record in await connection.fetch(GET_SCHEMA_SQL, table_name)]
+
+    async def _call(self, name: str, arguments: Dict[str, Any], tool_use_id: str) -> Dict[str, Any]:
+        """Run a tool call and build its tool result. Runs on the pool's loop."""
+        try:
+            if name == "readonly_query":
+                rows = await self._with_connection(lambda c: self._readonly_query(c, arguments["sql"]), retry=True)
+            elif name == "transact":
+                rows = await self._with_connection(lambda c: self._transact(c, list(arguments["sql_list"])), retry=False)
+            elif name == "get_schema":
+                rows = await self._with_connection(lambda c: self._get_schema(c, arguments["table_name"]), retry=True)
+            else:
+                raise ValueError(f"Unknown tool: {name}")
+        except (asyncpg.PostgresError, KeyError, ValueError) as e:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            return {"toolUseId": tool_use_id, "status": "error", "content": [{"text": f"Error: {e}"}]}
+        return {
+            "toolUseId": tool_use_id,
+            "status": "success",
+            "content": [{"text": json.dumps(rows, default=_json_value)}],
+        }
+
+    async def call_tool_async(self, name: str, arguments: Dict[str, Any], tool_use_id: str = "pool-call") -> Dict[str, Any]:
+        """
+        Call a database tool from any event loop.
+
+        Args:
+            name: Tool name, as served by the MCP server
+            arguments: Tool input arguments
+            tool_use_id: Identifier echoed back in the tool result
+
+        Returns:
+            dict: Tool result with the rows as JSON text, like the MCP server's
+        """
+        if self._pool is None:
+            await asyncio.to_thread(self._start)
+        with self._stats_lock:
+            self._stats["calls"] += 1
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._call(name, arguments, tool_use_id), self._loop)
+        )
+
+    def call_tool(self, name: str, arguments: Dict[str, Any], tool_use_id: str = "pool-call") -> Dict[str, Any]:
+        """Call a database tool synchronously; see call_tool_async"""
+        self._start()
+        with self._stats_lock:
+            self._stats["calls"] += 1
+        return asyncio.run_coroutine_threadsafe(self._call(name, arguments, tool_use_id), self._loop).result()
+
+    def warm(self) -> int:
+        """
+        Open the pool's min_size connections.
+
+        Returns:
+            int: Number of connections open
+        """
+        self._start()
+        return self._pool.get_size()
+
+    def tool_specs(self) -> List[ToolSpec]:
+        """Tool specifications of the database tools"""
+        return list(DSQL_TOOL_SPECS)
+
+    def tools(self) -> List["DSQLPoolTool"]:
+        """Agent tools running their SQL on pooled connections"""
+        return [DSQLPoolTool(self, spec) for spec in self.tool_specs()]
+
+    def stats(self) -> Dict[str, int]:
+        """Call counters, current occupancy and auth token counters"""
+        with self._stats_lock:
+            stats = dict(self._stats, max_size=self.max_size)
+        if self._pool is not None:
+            stats.update(size=self._pool.get_size(), idle=self._pool.get_idle_size())
+        if self._token_cache is not None:
+            stats.update({f"tokens_{name}": count for name, count in self._token_cache.stats().items()})
+        return stats
+
+    def close(self) -> None:
+        """Close all connections and stop the pool's event loop"""
+        with self._lock:
+            self._closed = True
+            pool, loop, thread = self._pool, self._loop, self._thread
+            self._pool = self._loop = self._thread = None
+        if pool is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result(timeout=self.acquire_timeout)
+        except Exception as e:
+            logger.warning(f"Failed to close DSQL connection pool cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+class DSQLPoolTool(AgentTool):
+    """Agent tool running a database tool call on the direct connection pool"""
+
+    def __init__(self, pool: DSQLConnectionPool, tool_spec: ToolSpec):
+        super().__init__()
+        self._pool = pool
+        self._tool_spec = tool_spec
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool_spec["name"]
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self._tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return "python"
+
+    async def stream(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        """Run the tool call on a pooled connection and yield the result"""
+        attributes = {"tool.name": self.tool_name}
+        with stage("db.call_tool", attributes, attributes) as span:
+            result = await self._pool.call_tool_async(self.tool_name, tool_use["input"], tool_use["toolUseId"])
+            span.set_attribute("db.status", result.get("status"))
+        yield result
+
+
+def build_dsql_connection_pool() -> DSQLConnectionPool:
+    """
+    Create the connection pool for the Aurora DSQL cluster.
+
+    DSQL_DATABASE_URL, if set, points the pool at another PostgreSQL
+    database, such as a local stand-in, with its own credentials.
+
+    Returns:
+        DSQLConnectionPool: Pool authenticating with cached IAM auth tokens
+    """
+    dsn = os.environ.get("DSQL_DATABASE_URL")
+    if dsn:
+        return DSQLConnectionPool(dsn=dsn)
+    cluster_endpoint, aws_region = dsql_endpoint()
+    return DSQLConnectionPool(
+        token_cache=DSQLAuthTokenCache(cluster_endpoint, aws_region),
+        host=cluster_endpoint,
+        user=DSQL_DATABASE_USER,
+        database=DSQL_DATABASE_NAME,
+        ssl="require",
+    )
+
+
+_pool: Optional[DSQLConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_dsql_connection_pool() -> DSQLConnectionPool:
+    """Get the process-wide direct DSQL connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = build_dsql_connection_pool()
+    return _pool
+
+
+def get_sql_backend() -> Union[MCPSessionPool, DSQLConnectionPool]:
+    """
+    Get the process-wide SQL backend selected by SQL_BACKEND.
+
+    Both backends offer tools(), tool_specs(), call_tool(), warm(), stats()
+    and close().
+
+    Raises:
+        RuntimeError: If SQL_BACKEND is direct and asyncpg is not installed
+    """
+    if SQL_BACKEND == "direct":
+        if not asyncpg_available():
+            raise RuntimeError(DIRECT_BACKEND_UNAVAILABLE)
+        return get_dsql_connection_pool()
+    return get_mcp_session_pool()
@@ -0,0 +1,145 @@
+"""
+Conversation History Cache for DSQL Assistant
+
+This module caches the recent conversation window per session and trims
+it to a token budget before it is added to the agent's prompt. The cache
+is kept current with the messages this process writes, so the remote
+history fetch is skipped while an entry is fresh.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# History budget settings (overridable through the environment)
+DEFAULT_HISTORY_TOKEN_BUDGET = int(os.environ.get("HISTORY_TOKEN_BUDGET", "2000"))
+DEFAULT_MESSAGE_TOKEN_LIMIT = int(os.environ.get("HISTORY_MESSAGE_TOKEN_LIMIT", "400"))
+DEFAULT_HISTORY_CACHE_TTL = float(os.environ.get("HISTORY_CACHE_TTL_SECONDS", "300"))
+
+# Rough characters-per-token ratio used for budgeting
+CHARS_PER_TOKEN = 4
+
+SessionKey = Tuple[str, str, str]  # (memory_id, actor_id, session_id)
+HistoryMessage = Tuple[str, str]  # (role, text)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of model tokens in text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to roughly max_tokens, keeping its beginning and end.
+
+    Args:
+        text: Message text
+        max_tokens: Token limit for the result
+
+    Returns:
+        str: The text unchanged if it fits, otherwise head and tail around an omission marker
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    return f"{text[:head]} [... {omitted} characters omitted ...] {text[-tail:]}"
+
+
+def select_history(
+    messages: List[HistoryMessage],
+    token_budget: int = DEFAULT_HISTORY_TOKEN_BUDGET,
+    message_token_limit: int = DEFAULT_MESSAGE_TOKEN_LIMIT,
+) -> List[HistoryMessage]:
+    """
+    Pick the most recent messages that fit the token budget.
+
+    Oversized messages (for example dumped query results) are truncated to
+    message_token_limit first, so one large turn cannot crowd out the rest.
+
+    Args:
+        messages: Conversation messages, oldest first
+        token_budget: Total tokens allowed for the returned window
+        message_token_limit: Tokens allowed for a single message
+
+    Returns:
+        list: The selected (role, text) messages, oldest first
+    """
+    selected = []
+    used = 0
+    for role, text in reversed(messages):
+        text = truncate_text(text, message_token_limit)
+        tokens = estimate_tokens(text) + 1
+        if used + tokens > token_budget:
+            break
+        selected.append((role, text))
+        used += tokens
+    selected.reverse()
+    return selected
+
+
+class SessionHistoryCache:
+    """Process-wide, LRU-bounded cache of recent messages per session"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_HISTORY_CACHE_TTL,
+        max_messages: int = 100,
+        max_sessions: int = 1024,
+    ):
+        """
+        Initialize the history cache.
+
+        Args:
+            ttl_seconds: Seconds a loaded window is trusted before it is fetched again
+            max_messages: Messages kept per session
+            max_sessions: Sessions kept before the least recently used is dropped
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self._entries: "OrderedDict[SessionKey, Tuple[List[HistoryMessage], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: SessionKey) -> Optional[List[HistoryMessage]]:
+        """Return a copy of the cached window, or None if it is missing or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            messages, loaded_at = entry
+            if time.monotonic() - loaded_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(messages)
+
+    def put(self, key: SessionKey, messages: List[HistoryMessage]) -> None:
+        """Store a freshly loaded window"""
+        with self._lock:
+            self._entries[key] = (list(messages[-self.max_messages:]), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+
+    def append(self, key: SessionKey, role: str, text: str) -> None:
+        """Add a message written by this process to a cached window"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            messages = entry[0]
+            messages.append((role, text))
+            del messages[:-self.max_messages]
+
+    def invalidate(self, key: SessionKey) -> None:
+        """Forget a session's window"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+history_cache = SessionHistoryCache()
@@ -0,0 +1,427 @@
+"""
+MCP Session Pool for DSQL Assistant
+
+This module keeps a warm pool of connected MCP clients for the Aurora DSQL
+MCP server so that tool calls no longer pay the process spawn and stdio
+handshake cost on every database question.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+from .structured_logging import log_event
+from .telemetry import stage
+
+if TYPE_CHECKING:
+    from strands.tools.mcp import MCPClient
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing and health-check settings (overridable through the environment)
+DEFAULT_POOL_MAX_SIZE = int(os.environ.get("MCP_POOL_MAX_SIZE", "4"))
+DEFAULT_POOL_MIN_SIZE = int(os.environ.get("MCP_POOL_MIN_SIZE", "1"))
+DEFAULT_ACQUIRE_TIMEOUT = float(os.environ.get("MCP_POOL_ACQUIRE_TIMEOUT", "30"))
+DEFAULT_HEALTH_CHECK_INTERVAL = float(os.environ.get("MCP_POOL_HEALTH_CHECK_INTERVAL", "60"))
+DEFAULT_MAX_SESSION_AGE = float(os.environ.get("MCP_POOL_MAX_SESSION_AGE", "3600"))
+
+# Aurora DSQL MCP server release installed into the image (keep in step with requirements.txt)
+DSQL_MCP_SERVER_PACKAGE = "awslabs.aurora-dsql-mcp-server"
+DSQL_MCP_SERVER_VERSION = "1.1.4"
+DSQL_MCP_SERVER_MODULE = "awslabs.aurora_dsql_mcp_server.server"
+
+# Seconds allowed for the MCP server to start and complete its handshake
+MCP_SERVER_STARTUP_TIMEOUT = int(os.environ.get("MCP_SERVER_STARTUP_TIMEOUT", "30"))
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no MCP session becomes available within the acquire timeout"""
+
+
+class PooledMCPSession:
+    """A connected MCP client together with its bookkeeping"""
+
+    def __init__(self, client: "MCPClient"):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_checked = self.created_at
+        self.last_used = self.created_at
+        self.uses = 0
+
+    def is_alive(self) -> bool:
+        """Cheap liveness check of the client's background transport thread"""
+        thread = getattr(self.client, "_background_thread", None)
+        return thread is None or thread.is_alive()
+
+    def close(self) -> None:
+        """Stop the client and its MCP server subprocess"""
+        try:
+            self.client.stop(None, None, None)
+        except Exception as e:
+            logger.warning(f"Failed to stop MCP session cleanly: {e}")
+
+
+class MCPSessionPool:
+    """
+    Thread-safe pool of long-lived MCP client sessions.
+
+    Sessions are started lazily up to ``max_size``, lent out one caller at a
+    time, health-checked on checkout and respawned when they fail.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], "MCPClient"],
+        max_size: int = DEFAULT_POOL_MAX_SIZE,
+        min_size: int = DEFAULT_POOL_MIN_SIZE,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        max_session_age: float = DEFAULT_MAX_SESSION_AGE,
+    ):
+        """
+        Initialize the session pool.
+
+        Args:
+            client_factory: Callable returning a new, not yet started MCPClient
+            max_size: Maximum number of concurrently open sessions
+            min_size: Number of sessions started by warm()
+            acquire_timeout: Seconds to wait for a free session before failing
+            health_check_interval: Seconds between round-trip health checks of an idle session
+            max_session_age: Seconds after which a session is recycled
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._client_factory = client_factory
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.max_session_age = max_session_age
+
+        self._condition = threading.Condition()
+        self._idle: List[PooledMCPSession] = []
+        self._size = 0  # open sessions, idle or lent out
+        self._closed = False
+        self._tool_specs: Optional[List[ToolSpec]] = None
+        self._stats = {"spawned": 0, "respawned": 0, "acquired": 0, "waits": 0, "discarded": 0}
+
+    def _spawn(self) -> PooledMCPSession:
+        """Start a new MCP client. Called without holding the pool lock."""
+        started = time.perf_counter()
+        with stage("mcp.spawn"):
+            client = self._client_factory()
+            client.start()
+        session = PooledMCPSession(client)
+        if self._tool_specs is None:
+            try:
+                with stage("mcp.list_tools") as span:
+                    self._tool_specs = [tool.tool_spec for tool in client.list_tools_sync()]
+                    span.set_attribute("mcp.tools", len(self._tool_specs))
+            except Exception:
+                # Stop the started client so its MCP server subprocess does not outlive the failed spawn
+                session.close()
+                raise
+        log_event(logger, logging.INFO, "mcp.session_spawned", elapsed_ms=round((time.perf_counter() - started) * 1000, 1))
+        return session
+
+    def _is_healthy(self, session: PooledMCPSession) -> bool:
+        """Check a session before lending it out"""
+        now = time.monotonic()
+        if not session.is_alive():
+            return False
+        if now - session.created_at > self.max_session_age:
+            return False
+        if now - session.last_checked > self.health_check_interval:
+            try:
+                session.client.list_tools_sync()
+            except Exception as e:
+                logger.warning(f"MCP session failed health check: {e}")
+                return False
+            session.last_checked = now
+        return True
+
+    def _discard(self, session: PooledMCPSession) -> None:
+        """Close a session and free its slot"""
+        session.close()
+        with self._condition:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledMCPSession:
+        """
+        Borrow a session, spawning one if the pool has room.
+
+        Args:
+            timeout: Seconds to wait for a free session, defaults to acquire_timeout
+
+        Returns:
+            PooledMCPSession: A healthy session that must be given back with release()
+
+        Raises:
+            PoolExhaustedError: If no session is available within the timeout
+        """
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            session = None
+            spawn = False
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("MCP session pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No MCP session available after waiting; pool size is {self.max_size}"
+                        )
+                    self._stats["waits"] += 1
+                    self._condition.wait(remaining)
+                if self._idle:
+                    session = self._idle.pop()
+                else:
+                    self._size += 1
+                    spawn = True
+
+            if spawn:
+                try:
+                    session = self._spawn()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._stats["spawned"] += 1
+            elif not self._is_healthy(session):
+                logger.info("Respawning unhealthy MCP session")
+                self._discard(session)
+                with self._condition:
+                    self._stats["respawned"] += 1
+                continue
+
+            session.uses += 1
+            session.last_used = time.monotonic()
+            with self._condition:
+                self._stats["acquired"] += 1
+            return session
+
+    def release(self, session: PooledMCPSession, healthy: bool = True) -> None:
+        """
+        Return a borrowed session to the pool.
+
+        Args:
+            session: Session obtained from acquire()
+            healthy: False if the caller saw a transport failure; the session is then closed
+        """
+        if not healthy or self._closed:
+            self._discard(session)
+            return
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[PooledMCPSession]:
+        """Context manager lending a session for the duration of the block"""
+        session = self.acquire(timeout)
+        healthy = True
+        try:
+            yield session
+        except Exception:
+            healthy = session.is_alive()
+            raise
+        finally:
+            self.release(session, healthy=healthy)
+
+    def warm(self) -> int:
+        """
+        Start sessions until min_size are open.
+
+        Returns:
+            int: Number of sessions started
+        """
+        started = []
+        try:
+            with self._condition:
+                missing = max(0, self.min_size - self._size)
+            for _ in range(missing):
+                started.append(self.acquire())
+        finally:
+            for session in started:
+                self.release(session)
+        return len(started)
+
+    def tool_specs(self) -> List[ToolSpec]:
+        """Tool specifications advertised by the MCP server, fetched once per pool"""
+        if self._tool_specs is None:
+            with self.session():
+                pass
+        return list(self._tool_specs or [])
+
+    def tools(self) -> List["PooledMCPTool"]:
+        """Agent tools that borrow a pooled session for each call"""
+        return [PooledMCPTool(self, spec) for spec in self.tool_specs()]
+
+    def call_tool(self, name: str, arguments: Dict[str, Any], tool_use_id: str = "pool-call") -> Dict[str, Any]:
+        """
+        Call an MCP tool synchronously on a pooled session.
+
+        Args:
+            name: MCP tool name
+            arguments: Tool input arguments
+            tool_use_id: Identifier echoed back in the tool result
+
+        Returns:
+            dict: The MCP tool result
+        """
+        with self.session() as session:
+            return session.client.call_tool_sync(tool_use_id=tool_use_id, name=name, arguments=arguments)
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters and current occupancy"""
+        with self._condition:
+            return dict(self._stats, size=self._size, idle=len(self._idle), max_size=self.max_size)
+
+    def close(self) -> None:
+        """Close all idle sessions; lent sessions are closed when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+
+class PooledMCPTool(AgentTool):
+    """Agent tool proxying an MCP tool through a session borrowed from the pool"""
+
+    def __init__(self, pool: MCPSessionPool, tool_spec: ToolSpec):
+        super().__init__()
+        self._pool = pool
+        self._tool_spec = tool_spec
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool_spec["name"]
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self._tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return "python"
+
+    async def stream(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        """Borrow a session, run the MCP tool call on it and yield the result"""
+        attributes = {"tool.name": self.tool_name}
+        with stage("mcp.call_tool", attributes, attributes) as span:
+            started = time.perf_counter()
+            session = await asyncio.to_thread(self._pool.acquire)
+            span.set_attribute("mcp.acquire_ms", (time.perf_counter() - started) * 1000)
+            healthy = True
+            try:
+                result = await session.client.call_tool_async(
+                    tool_use_id=tool_use["toolUseId"],
+                    name=self.tool_name,
+                    arguments=tool_use["input"],
+                )
+            except Exception:
+                healthy = session.is_alive()
+                raise
+            finally:
+                self._pool.release(session, healthy=healthy)
+            span.set_attribute("mcp.status", result.get("status"))
+        yield result
+
+
+def dsql_mcp_server_command() -> Tuple[str, List[str]]:
+    """
+    Resolve how to launch the pinned Aurora DSQL MCP server without a package index.
+
+    The console script installed with the image is preferred, then the
+    installed module run under this interpreter, and finally uvx restricted
+    to its local cache.
+
+    Returns:
+        tuple: (command, leading arguments)
+    """
+    script = shutil.which(DSQL_MCP_SERVER_PACKAGE)
+    if script:
+        return script, []
+    try:
+        installed = importlib.util.find_spec(DSQL_MCP_SERVER_MODULE) is not None
+    except ModuleNotFoundError:
+        installed = False
+    if installed:
+        return sys.executable, ["-m", DSQL_MCP_SERVER_MODULE]
+    logger.warning(f"{DSQL_MCP_SERVER_PACKAGE} is not installed, falling back to uvx's offline cache")
+    return "uvx", ["--offline", f"{DSQL_MCP_SERVER_PACKAGE}=={DSQL_MCP_SERVER_VERSION}"]
+
+
+def dsql_endpoint() -> Tuple[str, str]:
+    """
+    Look up the Aurora DSQL cluster endpoint in SSM.
+
+    Returns:
+        tuple: (cluster endpoint, AWS region)
+    """
+    from scripts.utils import get_ssm_parameter
+
+    dsql_cluster_id = get_ssm_parameter("/agentcore-db-mcp-assistant/DSQL_CLUSTER_ID")
+    aws_region = get_ssm_parameter("/agentcore-db-mcp-assistant/AWS_REGION")
+    return f"{dsql_cluster_id}.dsql.{aws_region}.on.aws", aws_region
+
+
+def build_dsql_mcp_client() -> "MCPClient":
+    """
+    Create an MCP client for the Aurora DSQL MCP server.
+
+    Returns:
+        MCPClient: Client that spawns the server over stdio when started
+    """
+    # The MCP SDK is slow to import and only needed once a session is spawned
+    from mcp import StdioServerParameters, stdio_client
+    from strands.tools.mcp import MCPClient
+
+    cluster_endpoint, aws_region = dsql_endpoint()
+
+    command, command_args = dsql_mcp_server_command()
+    command_args = command_args + [
+        "--cluster_endpoint", cluster_endpoint,
+        "--database_user", "admin",
+        "--region", aws_region
+    ]
+    log_event(logger, logging.INFO, "mcp.command", command=" ".join([command] + command_args))
+
+    return MCPClient(
+        lambda: stdio_client(
+            StdioServerParameters(
+                command=command,
+                args=command_args,
+            )
+        ),
+        startup_timeout=MCP_SERVER_STARTUP_TIMEOUT,
+    )
+
+
+_pool: Optional[MCPSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get the process-wide DSQL MCP session pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = MCPSessionPool(build_dsql_mcp_client)
+    return _pool
@@ -6,9 +6,21 @@ HR assistant pattern.
 """
 
 import logging
+from typing import Optional
 from strands.hooks.events import AgentInitializedEvent, MessageAddedEvent
 from strands.hooks.registry import HookProvider, HookRegistry
 from bedrock_agentcore.memory import MemoryClient
+from .history_cache import (
+    DEFAULT_HISTORY_TOKEN_BUDGET,
+    DEFAULT_MESSAGE_TOKEN_LIMIT,
+    SessionHistoryCache,
+    history_cache,
+    select_history,
+)
+from .memory_writer import MemoryWriteBehind, get_memory_writer
+from .prompt_cache import history_messages, model_id_of
+from .structured_logging import DEFAULT_LOG_SAMPLE_RATE, log_event
+from .telemetry import stage
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +30,18 @@ class MemoryHook(HookProvider):
     Memory hook provider for DSQL Assistant.
     """
     
-    def __init__(self, memory_client: MemoryClient, memory_id: str, actor_id: str, session_id: str, last_k_turns: int = 10):
+    def __init__(
+        self,
+        memory_client: MemoryClient,
+        memory_id: str,
+        actor_id: str,
+        session_id: str,
+        last_k_turns: int = 10,
+        writer: Optional[MemoryWriteBehind] = None,
+        history_token_budget: int = DEFAULT_HISTORY_TOKEN_BUDGET,
+        message_token_limit: int = DEFAULT_MESSAGE_TOKEN_LIMIT,
+        cache: Optional[SessionHistoryCache] = None,
+    ):
         """
         Initialize the memory hook provider.
         
@@ -28,46 +51,85 @@ class MemoryHook(HookProvider):
             actor_id: ID of the user/actor
             session_id: ID of the current conversation session
             last_k_turns: Number of conversation turns to retrieve from history
+            writer: Write-behind persistence layer, defaults to the shared writer for memory_client
+            history_token_budget: Approximate tokens of history added to the prompt
+            message_token_limit: Approximate tokens kept from a single history message
+            cache: Per-session history cache, defaults to the process-wide cache
         """
         self.memory_client = memory_client
         self.memory_id = memory_id
         self.actor_id = actor_id
         self.session_id = session_id
         self.last_k_turns = last_k_turns
+        self.writer = writer or get_memory_writer(memory_client)
+        self.history_token_budget = history_token_budget
+        self.message_token_limit = message_token_limit
+        self.cache = cache or history_cache
+
+    @property
+    def cache_key(self):
+        return (self.memory_id, self.actor_id, self.session_id)
+
+    def load_history(self):
+        """
+        Get the session's recent messages, from the cache when it is fresh.
+
+        Returns:
+            list: (role, text) messages, oldest first
+        """
+        with stage("memory.load", {"session.id": self.session_id}) as span:
+            messages = self.cache.get(self.cache_key)
+            span.set_attribute("memory.cache_hit", messages is not None)
+            if messages is not None:
+                return messages
+
+            recent_turns = self.memory_client.get_last_k_turns(
+                memory_id=self.memory_id,
+                actor_id=self.actor_id,
+                session_id=self.session_id,
+                k=self.last_k_turns
+            )
+            messages = [
+                (message['role'], message['content']['text'])
+                for turn in recent_turns or []
+                for message in turn
+            ]
+            span.set_attribute("memory.messages", len(messages))
+            self.cache.put(self.cache_key, messages)
+            log_event(logger, logging.INFO, "memory.history_loaded", sample=DEFAULT_LOG_SAMPLE_RATE, turns=len(recent_turns or []))
+            return messages
     
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """
-        Load recent conversation history when agent starts.
+        Load recent conversation history, within the token budget, when agent starts.
+
+        The history goes ahead of the new question as messages rather than
+        into the system prompt, so the system prompt stays the same for
+        every session and is served from the prompt cache.
         
         Args:
             event: Agent initialization event
         """
         try:
-            recent_turns = self.memory_client.get_last_k_turns(
-                memory_id=self.memory_id,
-                actor_id=self.actor_id,
-                session_id=self.session_id,
-                k=self.last_k_turns
+            history = select_history(
+                self.load_history(),
+                token_budget=self.history_token_budget,
+                message_token_limit=self.message_token_limit,
             )
             
-            if recent_turns:
-                context_messages = []
-                for turn in recent_turns:
-                    for message in turn:
-                        role = message['role']
-                        content = message['content']['text']
-                        context_messages.append(f"{role}: {content}")
-                
-                context = "\n".join(context_messages)
-                event.agent.system_prompt += f"\n\nRecent conversation:\n{context}"
-                logger.info(f"✅ Loaded {len(recent_turns)} conversation turns")
+            if history:
+                model_id = model_id_of(getattr(event.agent, "model", None))
+                event.agent.messages[:0] = history_messages(history, model_id)
                 
         except Exception as e:
             logger.error(f"Memory load error: {e}")
     
     def on_message_added(self, event: MessageAddedEvent):
         """
-        Store messages in memory as they are added to the conversation.
+        Queue messages for persistence as they are added to the conversation.
+
+        The write happens on the background writer, so the agent loop never
+        waits for AgentCore Memory.
         
         Args:
             event: Message added event
@@ -86,13 +148,15 @@ class MemoryHook(HookProvider):
                         break
                 
                 if content_to_save:
-                    self.memory_client.save_conversation(
+                    self.writer.enqueue(
                         memory_id=self.memory_id,
                         actor_id=self.actor_id,
                         session_id=self.session_id,
-                        messages=[(content_to_save, role)]
+                        text=content_to_save,
+                        role=role,
                     )
-                    logger.info("Message saved to memory")
+                    self.cache.append(self.cache_key, role.upper(), content_to_save)
+                    logger.debug("Message queued for memory")
                     
         except Exception as e:
             logger.error(f"Memory save error: {e}")
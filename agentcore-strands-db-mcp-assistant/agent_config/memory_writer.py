@@ -0,0 +1,281 @@
+"""
+Write-Behind Memory Persistence for DSQL Assistant
+
+This module moves AgentCore Memory writes off the agent's critical path.
+Messages are enqueued by the memory hook and saved in batches by a
+background worker, with retries and a drain on shutdown. A failed save is
+retried after a backoff without holding up other sessions' writes.
+"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .structured_logging import log_event
+from .telemetry import stage
+
+logger = logging.getLogger(__name__)
+
+# Write-behind settings (overridable through the environment)
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get("MEMORY_WRITE_MAX_BATCH", "20"))
+DEFAULT_BATCH_WINDOW = float(os.environ.get("MEMORY_WRITE_BATCH_WINDOW_MS", "200")) / 1000
+DEFAULT_MAX_RETRIES = int(os.environ.get("MEMORY_WRITE_MAX_RETRIES", "3"))
+DEFAULT_MAX_BACKLOG = int(os.environ.get("MEMORY_WRITE_MAX_BACKLOG", "10000"))
+
+SessionKey = Tuple[str, str, str]  # (memory_id, actor_id, session_id)
+Messages = List[Tuple[str, str]]  # (text, role)
+
+
+class MemoryWriteBehind:
+    """Background, batching writer for conversation messages"""
+
+    def __init__(
+        self,
+        memory_client: Any,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = 0.2,
+        max_backlog: int = DEFAULT_MAX_BACKLOG,
+    ):
+        """
+        Initialize the writer and start its worker thread.
+
+        Args:
+            memory_client: Client for interacting with Bedrock Agent Core memory
+            max_batch_size: Maximum number of messages saved per worker pass
+            batch_window: Seconds the worker waits to gather more messages into a batch
+            max_retries: Retries of a failed save before its messages are dropped
+            backoff_base: Initial retry delay in seconds, doubled on each retry
+            max_backlog: Messages held before new ones are dropped
+        """
+        self.memory_client = memory_client
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backlog = max_backlog
+
+        self._queue: "queue.Queue[Optional[Tuple[SessionKey, str, str]]]" = queue.Queue()
+        self._idle = threading.Condition()
+        self._outstanding = 0
+        self._closed = False
+        # Failed saves waiting for their backoff: (due, sequence, attempt, session, messages)
+        self._retries: List[Tuple[float, int, int, SessionKey, Messages]] = []
+        self._retrying: Dict[SessionKey, Messages] = {}
+        self._sequence = itertools.count()
+        self._metrics = {
+            "saved": 0,
+            "failed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "retries": 0,
+            "last_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+        self._worker = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, memory_id: str, actor_id: str, session_id: str, text: str, role: str) -> bool:
+        """
+        Queue a message for persistence without blocking.
+
+        Returns:
+            bool: False if the writer is closed or the backlog is full
+        """
+        if self._closed:
+            return False
+        with self._idle:
+            if self._outstanding >= self.max_backlog:
+                self._metrics["dropped"] += 1
+                logger.warning("Memory write backlog is full, dropping message")
+                return False
+            self._outstanding += 1
+        self._queue.put_nowait(((memory_id, actor_id, session_id), text, role))
+        return True
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._outstanding -= count
+            if self._outstanding <= 0:
+                self._idle.notify_all()
+
+    def _next_batch(self) -> Optional[List[Tuple[SessionKey, str, str]]]:
+        """
+        Block for one message, then gather more for up to batch_window.
+
+        Returns:
+            list: The batch, empty if a retry fell due first; None once the writer stops
+        """
+        timeout = max(0.0, self._retries[0][0] - time.monotonic()) if self._retries else None
+        try:
+            first = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the stop marker back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                if batch:
+                    self._flush(batch)
+                self._retry_due()
+            except Exception:
+                # Keep the worker alive; every message is accounted for in _save_group
+                logger.exception("Memory writer pass failed, continuing")
+
+    def _flush(self, batch: List[Tuple[SessionKey, str, str]]) -> None:
+        """Save a batch, one save_conversation call per run of messages from the same session"""
+        started = time.perf_counter()
+        groups: List[Tuple[SessionKey, Messages]] = []
+        for key, text, role in batch:
+            if groups and groups[-1][0] == key:
+                groups[-1][1].append((text, role))
+            else:
+                groups.append((key, [(text, role)]))
+
+        for key, messages in groups:
+            if key in self._retrying:
+                # Keep the session's order: these are saved after the messages awaiting a retry
+                self._retrying[key].extend(messages)
+                continue
+            self._save_group(key, messages, attempt=0)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._metrics["batches"] += 1
+        self._metrics["last_flush_ms"] = elapsed_ms
+        self._metrics["total_flush_ms"] += elapsed_ms
+        log_event(logger, logging.DEBUG, "memory.flushed", messages=len(batch), elapsed_ms=round(elapsed_ms, 1))
+
+    def _retry_due(self) -> None:
+        """Retry the failed saves whose backoff has passed"""
+        now = time.monotonic()
+        while self._retries and self._retries[0][0] <= now:
+            _, _, attempt, key, messages = heapq.heappop(self._retries)
+            del self._retrying[key]
+            self._save_group(key, messages, attempt)
+
+    def _save_group(self, key: SessionKey, messages: Messages, attempt: int) -> None:
+        """Save one session's messages; on failure schedule a retry or drop them once retries are used up"""
+        memory_id, actor_id, session_id = key
+        retrying = False
+        try:
+            with stage("memory.save", {"session.id": session_id, "memory.messages": len(messages)}) as span:
+                try:
+                    self.memory_client.save_conversation(
+                        memory_id=memory_id,
+                        actor_id=actor_id,
+                        session_id=session_id,
+                        messages=messages,
+                    )
+                    error = None
+                except Exception as e:
+                    error = e
+                span.set_attribute("memory.saved", error is None)
+            if error is None:
+                self._metrics["saved"] += len(messages)
+            elif attempt < self.max_retries:
+                self._metrics["retries"] += 1
+                delay = self.backoff_base * (2 ** attempt)
+                logger.warning(f"Memory save failed, retrying in {delay:.1f}s: {error}")
+                heapq.heappush(self._retries, (time.monotonic() + delay, next(self._sequence), attempt + 1, key, messages))
+                self._retrying[key] = messages
+                retrying = True
+            else:
+                logger.error(f"Memory save error after {attempt + 1} attempts, dropping {len(messages)} messages: {error}")
+                self._metrics["failed"] += len(messages)
+        except Exception:
+            logger.exception(f"Memory save of {len(messages)} messages failed unexpectedly, dropping them")
+            self._metrics["failed"] += len(messages)
+        finally:
+            if not retrying:
+                self._done(len(messages))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message has been processed.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if the backlog drained in time
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding <= 0, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Stop accepting messages and drain the backlog.
+
+        Returns:
+            bool: True if the backlog drained before the timeout
+        """
+        if self._closed:
+            return True
+        self._closed = True
+        drained = self.flush(timeout)
+        self._queue.put(None)
+        self._worker.join(timeout)
+        if not drained:
+            logger.warning(f"Memory writer closed with {self._outstanding} unsaved messages")
+        return drained
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Writer metrics.
+
+        Returns:
+            dict: backlog, saved, failed, dropped, retries, batches,
+            last_flush_ms and avg_flush_ms
+        """
+        metrics = dict(self._metrics)
+        total = metrics.pop("total_flush_ms")
+        metrics["avg_flush_ms"] = total / metrics["batches"] if metrics["batches"] else 0.0
+        metrics["backlog"] = self._outstanding
+        return metrics
+
+
+_writers: Dict[int, MemoryWriteBehind] = {}
+_writers_lock = threading.Lock()
+
+
+def get_memory_writer(memory_client: Any) -> MemoryWriteBehind:
+    """Get the process-wide writer for a memory client, starting it on first use"""
+    writer = _writers.get(id(memory_client))
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(id(memory_client))
+            if writer is None:
+                writer = _writers[id(memory_client)] = MemoryWriteBehind(memory_client)
+    return writer
+
+
+@atexit.register
+def _drain_writers() -> None:
+    for writer in list(_writers.values()):
+        writer.close()
@@ -0,0 +1,135 @@
+"""
+Model Client Registry for DSQL Assistant
+
+This module shares Bedrock model clients across requests. Every
+BedrockModel owns a boto3 bedrock-runtime client with its own HTTPS
+connection pool, so the agents get one model per (model id, region,
+configuration) from the registry instead of building a new one per
+question, and their calls reuse warm keep-alive connections instead of
+repeating TLS handshakes. The clients' connection pool size, timeouts and
+retries are configurable.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from botocore.config import Config as BotocoreConfig
+from strands.models import BedrockModel, Model
+
+logger = logging.getLogger(__name__)
+
+# Bedrock runtime client settings (overridable through the environment)
+DEFAULT_BEDROCK_MAX_POOL_CONNECTIONS = int(os.environ.get("BEDROCK_MAX_POOL_CONNECTIONS", "32"))
+DEFAULT_BEDROCK_CONNECT_TIMEOUT = float(os.environ.get("BEDROCK_CONNECT_TIMEOUT", "5"))
+DEFAULT_BEDROCK_READ_TIMEOUT = float(os.environ.get("BEDROCK_READ_TIMEOUT", "120"))
+DEFAULT_BEDROCK_MAX_ATTEMPTS = int(os.environ.get("BEDROCK_MAX_ATTEMPTS", "3"))
+DEFAULT_BEDROCK_RETRY_MODE = os.environ.get("BEDROCK_RETRY_MODE", "standard")
+
+ModelKey = Tuple[str, Optional[str], Tuple[Tuple[str, str], ...]]
+
+
+def bedrock_client_config(
+    max_pool_connections: int = DEFAULT_BEDROCK_MAX_POOL_CONNECTIONS,
+    connect_timeout: float = DEFAULT_BEDROCK_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_BEDROCK_READ_TIMEOUT,
+    max_attempts: int = DEFAULT_BEDROCK_MAX_ATTEMPTS,
+    retry_mode: str = DEFAULT_BEDROCK_RETRY_MODE,
+) -> BotocoreConfig:
+    """
+    Build the botocore configuration of the Bedrock runtime clients.
+
+    Args:
+        max_pool_connections: HTTPS connections kept open per client, the
+            number of model calls one client runs at once
+        connect_timeout: Seconds to wait for a connection to Bedrock
+        read_timeout: Seconds to wait for the next bytes of a response stream
+        max_attempts: Attempts per call, including the first
+        retry_mode: botocore retry mode: standard, adaptive or legacy
+
+    Returns:
+        BotocoreConfig: Client configuration
+    """
+    return BotocoreConfig(
+        max_pool_connections=max_pool_connections,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={"total_max_attempts": max_attempts, "mode": retry_mode},
+        tcp_keepalive=True,
+    )
+
+
+class ModelClientRegistry:
+    """Thread-safe registry of shared model clients, one per model id, region and configuration"""
+
+    def __init__(
+        self,
+        model_factory: Callable[..., Model] = BedrockModel,
+        client_config: Optional[BotocoreConfig] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            model_factory: Builds a model from model_id, region_name,
+                boto_client_config and model configuration
+            client_config: botocore configuration of the clients, defaults to bedrock_client_config()
+        """
+        self._factory = model_factory
+        self.client_config = client_config or bedrock_client_config()
+        self._lock = threading.Lock()
+        self._models: Dict[ModelKey, Model] = {}
+        self._stats = {"created": 0, "reused": 0}
+
+    @staticmethod
+    def _key(model_id: str, region_name: Optional[str], model_config: Dict[str, Any]) -> ModelKey:
+        region = region_name or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
+        return model_id, region, tuple(sorted((name, repr(value)) for name, value in model_config.items()))
+
+    def get(self, model_id: str, region_name: Optional[str] = None, **model_config: Any) -> Model:
+        """
+        Get the shared model for a model id, region and configuration, building it on first use.
+
+        Args:
+            model_id: Bedrock model id
+            region_name: AWS region, defaults to the environment's region
+            model_config: Further model configuration, e.g. temperature or max_tokens
+
+        Returns:
+            Model: Model shared by every caller asking for the same key; do not update its config
+        """
+        key = self._key(model_id, region_name, model_config)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._stats["reused"] += 1
+                return model
+            model = self._factory(
+                model_id=model_id,
+                region_name=region_name,
+                boto_client_config=self.client_config,
+                **model_config,
+            )
+            self._models[key] = model
+            self._stats["created"] += 1
+        logger.info(f"Created shared model client for {model_id} ({key[1] or 'default region'})")
+        return model
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of created and reused model clients"""
+        with self._lock:
+            return dict(self._stats, models=len(self._models))
+
+    def clear(self) -> None:
+        """Drop all shared models; the next get() builds new clients"""
+        with self._lock:
+            self._models.clear()
+
+
+model_client_registry = ModelClientRegistry()
+
+
+def get_bedrock_model(model_id: str, region_name: Optional[str] = None, **model_config: Any) -> Model:
+    """Get the shared model from the process-wide registry; see ModelClientRegistry.get"""
+    return model_client_registry.get(model_id, region_name, **model_config)
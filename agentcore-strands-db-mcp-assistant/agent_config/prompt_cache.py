@@ -0,0 +1,121 @@
+"""
+Prompt Cache Layout for DSQL Assistant
+
+This module assembles the agents' prompts so Bedrock prompt caching can
+reuse them. A request is cached as a prefix in the order tools, system
+prompt, messages, so everything that is the same on every call (the
+instructions and the schema digest) goes into the system prompt, which
+ends with a cache point; sections that change more often, such as table
+row estimates, follow the cache point. The recent conversation, which differs per
+session, follows as messages with a second cache point after it, so the
+turns of one session also reuse the history. Cache points are only added
+for models that accept them.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from strands.types.content import Messages, SystemContentBlock
+
+from .history_cache import HistoryMessage
+
+# Prompt caching switch (overridable through the environment)
+PROMPT_CACHE_ENABLED = os.environ.get("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+
+# Model families that accept cachePoint blocks in the system prompt and messages
+PROMPT_CACHE_MODELS = tuple(
+    family.strip()
+    for family in os.environ.get("PROMPT_CACHE_MODELS", "amazon.nova,anthropic.claude").split(",")
+    if family.strip()
+)
+
+
+def cache_point() -> dict:
+    """A Bedrock cache point block; everything before it is cached as a prefix"""
+    return {"cachePoint": {"type": "default"}}
+
+
+def model_id_of(model: Any) -> Optional[str]:
+    """The model id in a model's configuration, if it has one"""
+    config = model.get_config() if hasattr(model, "get_config") else None
+    return config.get("model_id") if isinstance(config, dict) else None
+
+
+def supports_prompt_cache(model_id: Optional[str]) -> bool:
+    """Whether cache points are sent to a model"""
+    return PROMPT_CACHE_ENABLED and bool(model_id) and any(family in model_id for family in PROMPT_CACHE_MODELS)
+
+
+def cacheable_system_prompt(
+    sections: Iterable[str], model_id: Optional[str], uncached: Iterable[str] = ()
+) -> List[SystemContentBlock]:
+    """
+    Build a system prompt from static sections, ending with a cache point.
+
+    Args:
+        sections: Prompt sections in a fixed order, e.g. instructions then
+            the schema digest; empty sections are skipped. Nothing that
+            changes per request or per session belongs here
+        model_id: Model the prompt is sent to
+        uncached: Sections placed after the cache point, e.g. row estimates
+            that change on each schema refresh; empty sections are skipped
+
+    Returns:
+        list: System content blocks for Agent(system_prompt=...)
+    """
+    blocks: List[SystemContentBlock] = [{"text": section} for section in sections if section]
+    if blocks and supports_prompt_cache(model_id):
+        blocks.append(cache_point())
+    blocks.extend({"text": section} for section in uncached if section)
+    return blocks
+
+
+def history_messages(history: List[HistoryMessage], model_id: Optional[str]) -> Messages:
+    """
+    Turn recent conversation into messages placed ahead of the new question.
+
+    Consecutive messages of one role are merged and the history is trimmed
+    to start with a user message and end with an assistant message, as the
+    Converse API requires alternating turns and the new question follows.
+    A cache point after the last message lets the session's next turns
+    reuse the history.
+
+    Args:
+        history: (role, text) messages, oldest first
+        model_id: Model the messages are sent to
+
+    Returns:
+        list: Messages for agent.messages, empty if no complete turn remains
+    """
+    messages: Messages = []
+    for role, text in history:
+        role = role.lower()
+        if role not in ("user", "assistant") or not text:
+            continue
+        if not messages and role == "assistant":
+            continue  # The conversation must start with a user message
+        if messages and messages[-1]["role"] == role:
+            messages[-1]["content"].append({"text": text})
+        else:
+            messages.append({"role": role, "content": [{"text": text}]})
+    while messages and messages[-1]["role"] != "assistant":
+        messages.pop()  # An unanswered question would precede the new one
+    if messages and supports_prompt_cache(model_id):
+        messages[-1]["content"].append(cache_point())
+    return messages
+
+
+def cache_hit_ratio(usage: Dict[str, int]) -> float:
+    """
+    Share of a request's prompt tokens read from the prompt cache.
+
+    Args:
+        usage: Bedrock usage with inputTokens (uncached prompt tokens),
+            cacheReadInputTokens and cacheWriteInputTokens
+
+    Returns:
+        float: 0 to 1, 0 when there were no prompt tokens
+    """
+    read = usage.get("cacheReadInputTokens", 0)
+    prompt = usage.get("inputTokens", 0) + read + usage.get("cacheWriteInputTokens", 0)
+    return read / prompt if prompt else 0.0
@@ -0,0 +1,310 @@
+"""
+Query Guard for DSQL Assistant
+
+This module checks read-only queries before they reach the Aurora DSQL
+MCP server. Row-returning queries get a LIMIT (or have theirs clamped) so
+a runaway SELECT cannot return an unbounded result, and the planner's
+estimate from EXPLAIN is compared with a cost threshold so expensive
+queries, such as unfiltered cross joins, are rejected with an explanation
+the agent can act on. EXPLAIN is skipped for single-table lookups with a
+small LIMIT, which the planner always costs low, and its estimate is
+cached by normalized SQL, so a repeated query costs no extra round trip.
+Every decision is counted in the telemetry metrics.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .sql_utils import normalize_sql, token_spans
+from .structured_logging import DEFAULT_LOG_SAMPLE_RATE, log_event
+from .telemetry import record_guard_decision
+
+logger = logging.getLogger(__name__)
+
+# Guard limits (overridable through the environment)
+DEFAULT_GUARD_MAX_ROWS = int(os.environ.get("SQL_GUARD_MAX_ROWS", "10000"))
+# Planner cost above which a query is rejected, 0 disables the EXPLAIN check
+DEFAULT_GUARD_MAX_COST = float(os.environ.get("SQL_GUARD_MAX_COST", "1000000"))
+# Largest LIMIT of a simple single-table query that runs without EXPLAIN, 0 explains every query
+DEFAULT_GUARD_EXPLAIN_SKIP_LIMIT = int(os.environ.get("SQL_GUARD_EXPLAIN_SKIP_LIMIT", "100"))
+# Seconds a query's EXPLAIN estimate is reused, 0 disables the cache
+DEFAULT_GUARD_EXPLAIN_CACHE_TTL = float(os.environ.get("SQL_GUARD_EXPLAIN_CACHE_TTL_SECONDS", "300"))
+
+GUARD_ENABLED = os.environ.get("SQL_GUARD_ENABLED", "true").lower() == "true"
+
+# Guard decisions
+ALLOWED = "allowed"
+LIMIT_ADDED = "limit_added"
+LIMIT_CLAMPED = "limit_clamped"
+REJECTED = "rejected"
+
+# Statements returning rows that a LIMIT applies to
+_ROW_RETURNING_KEYWORDS = {"select", "with", "values", "table"}
+
+# Words that make a LIMIT query's cost depend on more than the rows it returns
+_COSTLY_KEYWORDS = {
+    "join", "group", "order", "distinct", "having", "union", "intersect", "except", "over", "window", "offset",
+}
+
+_PLAN_COST_RE = re.compile(r"cost=(?P<startup>[\d.]+)\.\.(?P<total>[\d.]+)\s+rows=(?P<rows>\d+)")
+
+Explain = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+
+class GuardDecision(NamedTuple):
+    """Outcome of checking one query"""
+
+    action: str
+    sql: str
+    reason: str = ""
+    estimated_cost: Optional[float] = None
+    estimated_rows: Optional[int] = None
+
+
+def statement_tokens(sql: str) -> List[Tuple[str, str, int, int]]:
+    """Token spans of a statement without its trailing semicolons; offsets are into sql"""
+    tokens = token_spans(sql)
+    while tokens and tokens[-1][1] == ";":
+        tokens.pop()
+    return tokens
+
+
+def plan_estimate(plan_rows: List[Dict[str, Any]]) -> Optional[Tuple[float, int]]:
+    """
+    Read the estimate of the top plan node from EXPLAIN output.
+
+    Args:
+        plan_rows: Rows of EXPLAIN, one plan line per row
+
+    Returns:
+        tuple: (total cost, estimated rows), or None if the output has no estimate
+    """
+    for row in plan_rows:
+        for value in row.values():
+            match = _PLAN_COST_RE.search(str(value))
+            if match:
+                return float(match.group("total")), int(match.group("rows"))
+    return None
+
+
+class QueryGuard:
+    """Bounds the rows and cost of read-only queries"""
+
+    def __init__(
+        self,
+        max_rows: int = DEFAULT_GUARD_MAX_ROWS,
+        max_cost: float = DEFAULT_GUARD_MAX_COST,
+        explain_skip_limit: int = DEFAULT_GUARD_EXPLAIN_SKIP_LIMIT,
+        explain_cache_ttl: float = DEFAULT_GUARD_EXPLAIN_CACHE_TTL,
+        explain_cache_size: int = 1024,
+    ):
+        """
+        Initialize the guard.
+
+        Args:
+            max_rows: LIMIT added to, or clamped on, row-returning queries; 0 disables
+            max_cost: Planner cost above which a query is rejected; 0 disables the EXPLAIN check
+            explain_skip_limit: Largest LIMIT of a simple single-table SELECT run without EXPLAIN; 0 disables
+            explain_cache_ttl: Seconds an EXPLAIN estimate is reused for the same query; 0 disables
+            explain_cache_size: EXPLAIN estimates kept
+        """
+        self.max_rows = max_rows
+        self.max_cost = max_cost
+        self.explain_skip_limit = explain_skip_limit
+        self.explain_cache_ttl = explain_cache_ttl
+        self.explain_cache_size = explain_cache_size
+        self._estimates: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[float, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            ALLOWED: 0, LIMIT_ADDED: 0, LIMIT_CLAMPED: 0, REJECTED: 0,
+            "explain_failures": 0, "explain_skipped": 0, "explain_cached": 0,
+        }
+
+    def limit(self, sql: str) -> Tuple[str, str]:
+        """
+        Add or clamp the top-level LIMIT of a row-returning query.
+
+        Queries that are not row-returning, hold several statements, lock
+        rows, use FETCH or take the limit from a parameter are returned
+        unchanged. A rewrite only appends or replaces the LIMIT in the
+        original text; comments and literals before it are kept as written.
+
+        Args:
+            sql: SQL statement
+
+        Returns:
+            tuple: (SQL to run, ALLOWED, LIMIT_ADDED or LIMIT_CLAMPED)
+        """
+        if self.max_rows <= 0:
+            return sql, ALLOWED
+        tokens = statement_tokens(sql)
+        if not tokens or tokens[0][0] != "word" or tokens[0][1].lower() not in _ROW_RETURNING_KEYWORDS:
+            return sql, ALLOWED
+
+        depth = 0
+        limit_index = None
+        for index, (kind, token, _, _) in enumerate(tokens):
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+            elif depth == 0 and token == ";":
+                return sql, ALLOWED
+            elif depth == 0 and kind == "word" and token.lower() in ("for", "fetch"):
+                return sql, ALLOWED
+            elif depth == 0 and kind == "word" and token.lower() == "limit":
+                limit_index = index
+
+        # Trailing semicolons and comments after the last token are dropped
+        text = sql[:tokens[-1][3]]
+        if limit_index is None:
+            return f"{text} LIMIT {self.max_rows}", LIMIT_ADDED
+        if limit_index + 1 >= len(tokens):
+            return sql, ALLOWED
+        kind, token, start, end = tokens[limit_index + 1]
+        if (kind == "number" and float(token) > self.max_rows) or (kind == "word" and token.lower() == "all"):
+            return f"{text[:start]}{self.max_rows}{text[end:]}", LIMIT_CLAMPED
+        return sql, ALLOWED
+
+    def is_cheap(self, sql: str) -> bool:
+        """
+        Whether a query is a simple single-table SELECT with a small LIMIT.
+
+        Such a query stops after its LIMIT rows, so the planner estimate is
+        always low and EXPLAIN would not reject it. Queries with joins,
+        several tables, aggregates, sorting, subqueries or function calls
+        are not cheap.
+
+        Args:
+            sql: SQL statement, normally after limit()
+
+        Returns:
+            bool: True if EXPLAIN can be skipped
+        """
+        if self.explain_skip_limit <= 0:
+            return False
+        tokens = statement_tokens(sql)
+        if not tokens or tokens[0][1].lower() != "select":
+            return False
+        words = [token.lower() for kind, token, _, _ in tokens if kind == "word"]
+        if "from" not in words or _COSTLY_KEYWORDS.intersection(words):
+            return False
+        from_index = next(index for index, token in enumerate(tokens) if token[1].lower() == "from")
+        if any(token in ("(", ";") for _, token, _, _ in tokens) or any(
+            token == "," for _, token, _, _ in tokens[from_index:]
+        ):
+            return False  # Subqueries, function calls, several statements or several tables
+        for index, (kind, token, _, _) in enumerate(tokens[:-1]):
+            if kind == "word" and token.lower() == "limit":
+                kind, value, _, _ = tokens[index + 1]
+                return kind == "number" and float(value) <= self.explain_skip_limit
+        return False
+
+    def _cached_estimate(self, key: Tuple[str, Tuple[str, ...]]) -> Optional[Tuple[float, int]]:
+        if self.explain_cache_ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._estimates.get(key)
+            if entry is None:
+                return None
+            cost, rows, checked_at = entry
+            if time.monotonic() - checked_at > self.explain_cache_ttl:
+                del self._estimates[key]
+                return None
+            self._estimates.move_to_end(key)
+            self._stats["explain_cached"] += 1
+            return cost, rows
+
+    def _store_estimate(self, key: Tuple[str, Tuple[str, ...]], estimate: Tuple[float, int]) -> None:
+        if self.explain_cache_ttl <= 0:
+            return
+        with self._lock:
+            self._estimates[key] = (estimate[0], estimate[1], time.monotonic())
+            self._estimates.move_to_end(key)
+            while len(self._estimates) > self.explain_cache_size:
+                self._estimates.popitem(last=False)
+
+    async def check(self, sql: str, explain: Optional[Explain] = None) -> GuardDecision:
+        """
+        Decide how a read-only query runs.
+
+        Args:
+            sql: SQL statement from the agent
+            explain: Coroutine function running a statement and returning its rows,
+                used for "EXPLAIN <sql>"; None skips the cost check
+
+        Returns:
+            GuardDecision: The SQL to run and the action taken, or a rejection with its reason
+        """
+        guarded_sql, action = self.limit(sql)
+        decision = GuardDecision(action, guarded_sql)
+        if explain is not None and self.max_cost > 0:
+            if self.is_cheap(guarded_sql):
+                with self._lock:
+                    self._stats["explain_skipped"] += 1
+            else:
+                decision = await self._check_cost(decision, explain)
+        self._record(decision)
+        return decision
+
+    async def _check_cost(self, decision: GuardDecision, explain: Explain) -> GuardDecision:
+        key = normalize_sql(decision.sql)
+        estimate = self._cached_estimate(key)
+        if estimate is None:
+            try:
+                estimate = plan_estimate(await explain(f"EXPLAIN {decision.sql}"))
+            except Exception as e:
+                # The guard must not make queries fail that the database would run
+                log_event(logger, logging.DEBUG, "query_guard.explain_failed", error=str(e))
+                estimate = None
+            if estimate is None:
+                with self._lock:
+                    self._stats["explain_failures"] += 1
+                return decision
+            self._store_estimate(key, estimate)
+
+        cost, rows = estimate
+        if cost <= self.max_cost:
+            return decision._replace(estimated_cost=cost, estimated_rows=rows)
+        reason = (
+            f"Query rejected by the query guard: the estimated cost {cost:,.0f} (about {rows:,} rows) exceeds the "
+            f"limit of {self.max_cost:,.0f}. Add filters on indexed columns, aggregate in SQL, join on keys "
+            "instead of producing a cross join, or select fewer rows."
+        )
+        return GuardDecision(REJECTED, decision.sql, reason, cost, rows)
+
+    def _record(self, decision: GuardDecision) -> None:
+        with self._lock:
+            self._stats[decision.action] += 1
+        # LIMIT rewrites happen on most queries and are sampled; rejections are always logged
+        if decision.action != ALLOWED:
+            log_event(
+                logger, logging.INFO, "query_guard.decision",
+                sample=1.0 if decision.action == REJECTED else DEFAULT_LOG_SAMPLE_RATE,
+                action=decision.action, sql=decision.sql, estimated_cost=decision.estimated_cost,
+            )
+        record_guard_decision(decision.action, decision.estimated_cost)
+
+    def limit_note(self, decision: GuardDecision, rows: int) -> Optional[str]:
+        """
+        Note telling the model that a result may be cut off by the guard's LIMIT.
+
+        Returns:
+            str: The note, or None if the result is complete
+        """
+        if decision.action in (LIMIT_ADDED, LIMIT_CLAMPED) and rows >= self.max_rows:
+            return f"Note: the query guard limited this result to {self.max_rows} rows; more rows may match."
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of guard decisions"""
+        with self._lock:
+            return dict(self._stats)
+
+
+query_guard = QueryGuard()
@@ -0,0 +1,287 @@
+"""
+Query Result Handling for DSQL Assistant
+
+This module keeps large read-only query results out of the model context.
+A result over the row or byte cap reaches the model as a compact summary
+(columns, row count, the first rows and per-column statistics) instead of
+the full rows. For a client that asks for them, the full rows are
+streamed in pages, as typed query_result frames on the request's response
+queue, so tables and charts are built without the rows passing through
+the model. A client asks by naming a result_format in its request; the
+frames arrive in the stream alongside the answer text.
+"""
+
+import itertools
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from .context import DSQLAssistantContext
+from .result_format import DEFAULT_RESULT_FORMAT, encode_page, infer_schema, resolve_result_format, value_type
+from .sql_utils import tool_result_text
+from .structured_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# Result limits (overridable through the environment)
+DEFAULT_MODEL_MAX_ROWS = int(os.environ.get("SQL_RESULT_MODEL_MAX_ROWS", "50"))
+DEFAULT_MODEL_MAX_BYTES = int(os.environ.get("SQL_RESULT_MODEL_MAX_BYTES", "8192"))
+DEFAULT_HEAD_ROWS = int(os.environ.get("SQL_RESULT_HEAD_ROWS", "10"))
+DEFAULT_PAGE_ROWS = int(os.environ.get("SQL_RESULT_PAGE_ROWS", "500"))
+DEFAULT_CLIENT_MAX_ROWS = int(os.environ.get("SQL_RESULT_CLIENT_MAX_ROWS", "100000"))
+
+# Send result pages, as columns, to clients that do not ask for a result format
+RESULT_PAGES_ENABLED = os.environ.get("SQL_RESULT_PAGES_ENABLED", "false").lower() == "true"
+
+QUERY_RESULT_FRAME = "query_result"
+
+_result_ids = itertools.count(1)
+
+
+# Column stats report integers and floats alike as numbers
+_STATS_TYPES = {"int64": "number", "float64": "number", "bool": "boolean", "string": "string", "null": "null"}
+
+
+def result_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    """Column names of a result in first-seen order"""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for name in row:
+            columns.setdefault(name, None)
+    return list(columns)
+
+
+def column_stats(rows: List[Dict[str, Any]], columns: List[str]) -> List[Dict[str, Any]]:
+    """
+    Summarize the values of each column.
+
+    Args:
+        rows: Result rows
+        columns: Column names
+
+    Returns:
+        list: Per column its name, type, null count and either min, max and
+        mean (numbers) or distinct count and min and max (other values)
+    """
+    stats = []
+    for name in columns:
+        values = [row.get(name) for row in rows]
+        present = [value for value in values if value is not None]
+        types = {_STATS_TYPES[value_type(value)] for value in present}
+        column: Dict[str, Any] = {
+            "name": name,
+            "type": types.pop() if len(types) == 1 else ("null" if not types else "mixed"),
+            "nulls": len(values) - len(present),
+        }
+        if column["type"] == "number":
+            column.update(min=min(present), max=max(present), mean=round(sum(present) / len(present), 4))
+        elif present:
+            texts = [str(value) for value in present]
+            column.update(distinct=len(set(texts)), min=min(texts), max=max(texts))
+        stats.append(column)
+    return stats
+
+
+def summarize_rows(
+    rows: List[Dict[str, Any]],
+    result_id: str,
+    head_rows: int = DEFAULT_HEAD_ROWS,
+    max_bytes: int = DEFAULT_MODEL_MAX_BYTES,
+    delivered: bool = True,
+) -> Dict[str, Any]:
+    """
+    Build the summary of a large result shown to the model.
+
+    Head rows are dropped from the end until the summary fits max_bytes.
+
+    Args:
+        rows: Result rows
+        result_id: Identifier of the result pages sent to the client
+        head_rows: Number of leading rows included
+        max_bytes: Size cap of the serialized summary
+        delivered: Whether the full rows were sent to the client
+
+    Returns:
+        dict: result_id, row_count, columns with statistics, head and a note for the model
+    """
+    columns = result_columns(rows)
+    if delivered:
+        note = (
+            f"The result has {len(rows)} rows, too many to show here. The full result was sent to the user "
+            f"as table {result_id}; describe it from this summary instead of listing rows."
+        )
+    else:
+        note = (
+            f"The result has {len(rows)} rows, too many to show here. Only this summary is available; "
+            "use aggregates or a LIMIT to look at specific rows."
+        )
+    summary = {
+        "result_id": result_id,
+        "row_count": len(rows),
+        "columns": column_stats(rows, columns),
+        "head": rows[:head_rows],
+        "note": note,
+    }
+    text = json.dumps(summary, default=str)
+    while summary["head"] and len(text.encode("utf-8")) > max_bytes:
+        summary["head"] = summary["head"][:-1]
+        text = json.dumps(summary, default=str)
+    return summary
+
+
+def result_pages(
+    result_id: str,
+    sql: str,
+    rows: List[Dict[str, Any]],
+    page_rows: int = DEFAULT_PAGE_ROWS,
+    max_rows: int = DEFAULT_CLIENT_MAX_ROWS,
+    result_format: str = "columns",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Split a result into query_result frames for the client.
+
+    Every frame carries the schema of the whole result, so all pages of a
+    result decode the same way.
+
+    Args:
+        result_id: Identifier shared by the frames of one result
+        sql: The query that produced the result
+        rows: Result rows
+        page_rows: Rows per frame
+        max_rows: Rows sent at most; the last frame is marked truncated if rows were cut
+        result_format: Page encoding, "rows", "columns" or "arrow" (see result_format)
+
+    Yields:
+        dict: type, result_id, sql, format, schema, row_count, page, pages,
+        last, truncated and the encoded rows
+    """
+    sent = rows[:max_rows]
+    schema = infer_schema(sent, result_columns(rows))
+    page_rows = max(1, page_rows)
+    pages = max(1, -(-len(sent) // page_rows))
+    for page in range(pages):
+        chunk = sent[page * page_rows:(page + 1) * page_rows]
+        last = page == pages - 1
+        frame = {
+            "type": QUERY_RESULT_FRAME,
+            "result_id": result_id,
+            "sql": sql,
+            "format": result_format,
+            "schema": schema,
+            "row_count": len(rows),
+            "page": page,
+            "pages": pages,
+            "last": last,
+            "truncated": last and len(sent) < len(rows),
+        }
+        frame.update(encode_page(chunk, schema, result_format))
+        yield frame
+
+
+class QueryResultHandler:
+    """Caps query results shown to the model and pages full results to the client"""
+
+    def __init__(
+        self,
+        model_max_rows: int = DEFAULT_MODEL_MAX_ROWS,
+        model_max_bytes: int = DEFAULT_MODEL_MAX_BYTES,
+        head_rows: int = DEFAULT_HEAD_ROWS,
+        page_rows: int = DEFAULT_PAGE_ROWS,
+        client_max_rows: int = DEFAULT_CLIENT_MAX_ROWS,
+        pages_enabled: bool = RESULT_PAGES_ENABLED,
+        result_format: str = DEFAULT_RESULT_FORMAT,
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            model_max_rows: Largest row count passed to the model as is
+            model_max_bytes: Largest result text passed to the model as is, and the summary size cap
+            head_rows: Leading rows included in a summary
+            page_rows: Rows per query_result frame
+            client_max_rows: Rows sent to the client at most per result
+            pages_enabled: Send result pages to clients that do not ask for a result format
+            result_format: Page encoding for those clients, "rows", "columns" or "arrow"
+
+        Raises:
+            ValueError: If result_format is unknown
+        """
+        self.model_max_rows = model_max_rows
+        self.model_max_bytes = model_max_bytes
+        self.head_rows = head_rows
+        self.page_rows = page_rows
+        self.client_max_rows = client_max_rows
+        self.pages_enabled = pages_enabled
+        self.result_format, reason = resolve_result_format(result_format)
+        if reason:
+            logger.warning(f"Sending {self.result_format} result pages instead of {result_format}: {reason}")
+
+    def _request_format(self) -> Optional[str]:
+        """
+        The page encoding for the current request.
+
+        Returns:
+            str: The format the client asked for (columns if it cannot be
+            used), the default format if pages are enabled for every
+            client, or None if no pages are sent
+        """
+        requested = DSQLAssistantContext.get_result_format_ctx()
+        if not requested:
+            return self.result_format if self.pages_enabled else None
+        try:
+            result_format, reason = resolve_result_format(requested)
+        except ValueError as e:
+            logger.warning(f"Sending columns result pages: {e}")
+            return "columns"
+        if reason:
+            log_event(logger, logging.DEBUG, "query_results.format_fallback", requested=requested, reason=reason)
+        return result_format
+
+    def fits_model(self, result: Dict[str, Any], rows: List[Dict[str, Any]]) -> bool:
+        """Check whether a result is small enough to pass to the model unchanged"""
+        return (
+            len(rows) <= self.model_max_rows
+            and len(tool_result_text(result).encode("utf-8")) <= self.model_max_bytes
+        )
+
+    async def handle(self, sql: str, result: Dict[str, Any], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Deliver a readonly_query result.
+
+        Rows are sent to the client in pages when the request has a response
+        queue and the client asked for a result format (or pages are enabled
+        for every client). The model gets the result unchanged if it fits
+        the caps, and a summary otherwise.
+
+        Args:
+            sql: The query that produced the result
+            result: MCP tool result
+            rows: Rows read from the result
+
+        Returns:
+            dict: The tool result to hand to the model
+        """
+        if not rows:
+            return result
+        result_id = f"r{next(_result_ids)}"
+        result_format = self._request_format()
+        queue = DSQLAssistantContext.get_response_queue_ctx() if result_format else None
+        if queue is not None:
+            for frame in result_pages(
+                result_id, sql, rows, self.page_rows, self.client_max_rows, result_format
+            ):
+                await queue.publish(frame)
+
+        if self.fits_model(result, rows):
+            return result
+        log_event(logger, logging.DEBUG, "query_results.summarized", rows=len(rows), result_id=result_id)
+        summary = summarize_rows(rows, result_id, self.head_rows, self.model_max_bytes, delivered=queue is not None)
+        return {
+            "toolUseId": result.get("toolUseId"),
+            "status": result.get("status", "success"),
+            "content": [{"text": json.dumps(summary, default=str)}],
+        }
+
+
+query_result_handler = QueryResultHandler()
@@ -0,0 +1,171 @@
+"""
+Result Formats for DSQL Assistant
+
+This module encodes query result rows for the client as typed columns.
+Each column gets one type (int64, float64, bool, string or null) for the
+whole result, so pages of one result share a schema and the client can
+build tables and charts without re-typing values. Three encodings are
+supported: row value lists, columnar JSON, and an Arrow IPC stream (with
+pyarrow installed), base64 encoded since frames travel as JSON.
+"""
+
+import base64
+import os
+from typing import Any, Dict, List, Tuple
+
+RESULT_FORMATS = ("rows", "columns", "arrow")
+
+# Encoding of result pages for clients that do not ask for one; a client
+# chooses per request with the result_format payload field
+DEFAULT_RESULT_FORMAT = "columns"
+
+# Buffer compression of Arrow pages: zstd, lz4 or none
+DEFAULT_ARROW_COMPRESSION = os.environ.get("SQL_RESULT_ARROW_COMPRESSION", "zstd")
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # Arrow frames are optional
+    pyarrow = None
+
+Schema = List[Dict[str, str]]
+
+# pyarrow type factory for each column type
+_ARROW_TYPE_FACTORIES = {"int64": "int64", "float64": "float64", "bool": "bool_", "string": "string", "null": "null"}
+
+
+def arrow_available() -> bool:
+    """Whether the arrow format can be used"""
+    return pyarrow is not None
+
+
+def value_type(value: Any) -> str:
+    """Column type of a single value: int64, float64, bool, string or null"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int64"
+    if isinstance(value, float):
+        return "float64"
+    return "string"
+
+
+def infer_schema(rows: List[Dict[str, Any]], columns: List[str]) -> Schema:
+    """
+    Infer one type per column.
+
+    Integers mixed with floats are float64; any other mix is string.
+
+    Args:
+        rows: Result rows
+        columns: Column names
+
+    Returns:
+        list: {"name", "type"} per column
+    """
+    schema = []
+    for name in columns:
+        types = {value_type(row.get(name)) for row in rows}
+        types.discard("null")
+        if not types:
+            column_type = "null"
+        elif len(types) == 1:
+            column_type = types.pop()
+        elif types == {"int64", "float64"}:
+            column_type = "float64"
+        else:
+            column_type = "string"
+        schema.append({"name": name, "type": column_type})
+    return schema
+
+
+def _cast(value: Any, column_type: str) -> Any:
+    if value is None:
+        return None
+    if column_type == "float64":
+        return float(value)
+    if column_type == "string" and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def to_columns(rows: List[Dict[str, Any]], schema: Schema) -> List[List[Any]]:
+    """Transpose rows into one list of values per column, cast to the column type"""
+    return [[_cast(row.get(column["name"]), column["type"]) for row in rows] for column in schema]
+
+
+def _arrow_write_options(compression: str) -> "pyarrow.ipc.IpcWriteOptions":
+    if compression == "none" or not pyarrow.Codec.is_available(compression):
+        return pyarrow.ipc.IpcWriteOptions()
+    return pyarrow.ipc.IpcWriteOptions(compression=compression)
+
+
+def to_arrow_ipc(
+    columns: List[List[Any]], schema: Schema, compression: str = DEFAULT_ARROW_COMPRESSION
+) -> "pyarrow.Buffer":
+    """
+    Serialize typed columns as an Arrow IPC stream.
+
+    Args:
+        columns: Values per column, as returned by to_columns
+        schema: Column names and types
+        compression: Buffer compression codec, "none" to disable; unavailable codecs are skipped
+
+    Returns:
+        pyarrow.Buffer: The IPC stream holding one record batch
+    """
+    arrow_schema = pyarrow.schema(
+        [(column["name"], getattr(pyarrow, _ARROW_TYPE_FACTORIES[column["type"]])()) for column in schema]
+    )
+    batch = pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(values, type=field.type) for values, field in zip(columns, arrow_schema)],
+        schema=arrow_schema,
+    )
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, arrow_schema, options=_arrow_write_options(compression)) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def encode_page(rows: List[Dict[str, Any]], schema: Schema, result_format: str) -> Dict[str, Any]:
+    """
+    Encode the rows of one page.
+
+    Args:
+        rows: Rows of the page
+        schema: Schema of the whole result
+        result_format: "rows", "columns" or "arrow"
+
+    Returns:
+        dict: "rows" (value lists in column order), "columns" (values per
+        column) or "arrow" (base64 Arrow IPC stream)
+    """
+    if result_format == "rows":
+        return {"rows": [[_cast(row.get(column["name"]), column["type"]) for column in schema] for row in rows]}
+    columns = to_columns(rows, schema)
+    if result_format == "arrow":
+        # The IPC buffer is base64 encoded directly, without an intermediate bytes copy
+        return {"arrow": base64.b64encode(to_arrow_ipc(columns, schema)).decode("ascii")}
+    return {"columns": columns}
+
+
+def resolve_result_format(result_format: str) -> Tuple[str, str]:
+    """
+    Check a configured result format.
+
+    Args:
+        result_format: Requested format
+
+    Returns:
+        tuple: (format to use, reason if it differs from the request)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result format {result_format!r}, expected one of {RESULT_FORMATS}")
+    if result_format == "arrow" and not arrow_available():
+        return "columns", "pyarrow is not installed"
+    return result_format, ""
@@ -0,0 +1,372 @@
+"""
+Schema Catalog for DSQL Assistant
+
+This module loads the DSQL schema (tables, columns, types, keys and
+row-count estimates) once, keeps it in a compact in-memory form and turns
+it into a size-bounded digest for the agent's system prompt, so questions
+no longer start with information_schema exploration.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .sql_utils import is_ddl, rows_from_tool_result
+
+logger = logging.getLogger(__name__)
+
+# Catalog settings (overridable through the environment)
+DEFAULT_SCHEMA_TTL_SECONDS = float(os.environ.get("SCHEMA_CATALOG_TTL_SECONDS", "900"))
+DEFAULT_DIGEST_MAX_CHARS = int(os.environ.get("SCHEMA_DIGEST_MAX_CHARS", "4000"))
+DEFAULT_SCHEMA_RETRY_SECONDS = float(os.environ.get("SCHEMA_CATALOG_RETRY_SECONDS", "30"))
+
+COLUMNS_SQL = """SELECT table_name, column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_schema = 'public'
+ORDER BY table_name, ordinal_position"""
+
+KEYS_SQL = """SELECT tc.table_name, kcu.column_name, tc.constraint_type,
+       ccu.table_name AS foreign_table, ccu.column_name AS foreign_column
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name AND tc.table_schema = kcu.table_schema
+LEFT JOIN information_schema.constraint_column_usage ccu
+  ON tc.constraint_type = 'FOREIGN KEY'
+ AND ccu.constraint_name = tc.constraint_name AND ccu.table_schema = tc.table_schema
+WHERE tc.table_schema = 'public' AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY')"""
+
+ROW_ESTIMATES_SQL = """SELECT c.relname AS table_name, c.reltuples::bigint AS row_estimate
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'public' AND c.relkind = 'r'"""
+
+_TYPE_ABBREVIATIONS = {
+    "character varying": "varchar",
+    "character": "char",
+    "timestamp without time zone": "timestamp",
+    "timestamp with time zone": "timestamptz",
+    "double precision": "float8",
+    "boolean": "bool",
+    "integer": "int",
+}
+
+
+class Column(NamedTuple):
+    name: str
+    data_type: str
+    nullable: bool
+
+
+class Table(NamedTuple):
+    name: str
+    columns: Tuple[Column, ...]
+    primary_key: Tuple[str, ...]
+    foreign_keys: Tuple[Tuple[str, str, str], ...]  # (column, foreign table, foreign column)
+    row_estimate: Optional[int]
+
+    def describe(self) -> str:
+        """One-line description of the table for the schema digest"""
+        foreign = {column: f"{table}.{target}" for column, table, target in self.foreign_keys}
+        parts = []
+        for column in self.columns:
+            part = f"{column.name} {_TYPE_ABBREVIATIONS.get(column.data_type, column.data_type)}"
+            if column.name in self.primary_key:
+                part += " PK"
+            if column.name in foreign:
+                part += f" -> {foreign[column.name]}"
+            if not column.nullable and column.name not in self.primary_key:
+                part += " NOT NULL"
+            parts.append(part)
+        return f"{self.name}({', '.join(parts)})"
+
+
+def build_tables(
+    column_rows: List[Dict],
+    key_rows: List[Dict],
+    estimate_rows: List[Dict],
+) -> Tuple[Table, ...]:
+    """
+    Assemble compact table descriptions from catalog query rows.
+
+    Args:
+        column_rows: Rows of COLUMNS_SQL
+        key_rows: Rows of KEYS_SQL
+        estimate_rows: Rows of ROW_ESTIMATES_SQL
+
+    Returns:
+        tuple: Tables sorted by name
+    """
+    columns: Dict[str, List[Column]] = {}
+    for row in column_rows:
+        columns.setdefault(row["table_name"], []).append(
+            Column(row["column_name"], row["data_type"], str(row.get("is_nullable", "YES")).upper() == "YES")
+        )
+
+    primary_keys: Dict[str, List[str]] = {}
+    foreign_keys: Dict[str, List[Tuple[str, str, str]]] = {}
+    for row in key_rows:
+        if row.get("constraint_type") == "PRIMARY KEY":
+            primary_keys.setdefault(row["table_name"], []).append(row["column_name"])
+        elif row.get("foreign_table"):
+            foreign_keys.setdefault(row["table_name"], []).append(
+                (row["column_name"], row["foreign_table"], row["foreign_column"])
+            )
+
+    estimates = {}
+    for row in estimate_rows:
+        try:
+            estimates[row["table_name"]] = int(row["row_estimate"])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    return tuple(
+        Table(
+            name=name,
+            columns=tuple(table_columns),
+            primary_key=tuple(primary_keys.get(name, ())),
+            foreign_keys=tuple(foreign_keys.get(name, ())),
+            row_estimate=estimates.get(name),
+        )
+        for name, table_columns in sorted(columns.items())
+    )
+
+
+class SchemaCatalog:
+    """
+    Cached description of the DSQL schema.
+
+    The catalog is loaded on first use, reloaded after its TTL (in the
+    background while the previous version is served) and marked stale as
+    soon as a DDL statement is seen going to the database. After a failed
+    load it is not queried again until retry_seconds have passed.
+    """
+
+    def __init__(
+        self,
+        query: Callable[[str], List[Dict]],
+        ttl_seconds: float = DEFAULT_SCHEMA_TTL_SECONDS,
+        digest_max_chars: int = DEFAULT_DIGEST_MAX_CHARS,
+        retry_seconds: float = DEFAULT_SCHEMA_RETRY_SECONDS,
+    ):
+        """
+        Initialize the schema catalog.
+
+        Args:
+            query: Callable running a read-only SQL query and returning its rows
+            ttl_seconds: Seconds a loaded catalog is used before it is reloaded
+            digest_max_chars: Maximum size of the schema digest given to the agent
+            retry_seconds: Seconds after a failed load before the catalog is queried again
+        """
+        self._query = query
+        self.ttl_seconds = ttl_seconds
+        self.digest_max_chars = digest_max_chars
+        self.retry_seconds = retry_seconds
+        self._tables: Optional[Tuple[Table, ...]] = None
+        self._digest = ""
+        self._row_estimates = ""
+        self._fingerprint = ""
+        self._loaded_at = 0.0
+        self._failed_at: Optional[float] = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # One synchronous load at a time
+        self._refreshing = False
+
+    def _optional_query(self, sql: str) -> List[Dict]:
+        try:
+            return self._query(sql)
+        except Exception as e:
+            logger.warning(f"Schema catalog query failed, continuing without it: {e}")
+            return []
+
+    def refresh(self) -> Tuple[Table, ...]:
+        """
+        Reload the catalog from the database.
+
+        Returns:
+            tuple: The loaded tables
+        """
+        started = time.perf_counter()
+        try:
+            tables = build_tables(
+                self._query(COLUMNS_SQL),
+                self._optional_query(KEYS_SQL),
+                self._optional_query(ROW_ESTIMATES_SQL),
+            )
+        except Exception:
+            self._failed_at = time.monotonic()
+            raise
+        digest = self._build_digest(tables)
+        row_estimates = ", ".join(
+            f"{table.name} ~{table.row_estimate}"
+            for table in tables
+            if table.row_estimate is not None and table.row_estimate >= 0
+        )
+        # Row estimates drift constantly, so only the structure feeds the fingerprint
+        structure = repr([(table.name, table.columns, table.primary_key, table.foreign_keys) for table in tables])
+        with self._lock:
+            self._tables = tables
+            self._digest = digest
+            self._row_estimates = row_estimates
+            self._fingerprint = hashlib.sha256(structure.encode("utf-8")).hexdigest()[:16]
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self._failed_at = None
+        logger.info(f"Loaded schema catalog: {len(tables)} tables in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return tables
+
+    def _build_digest(self, tables: Tuple[Table, ...]) -> str:
+        lines = []
+        size = 0
+        for index, table in enumerate(tables):
+            line = table.describe()
+            if size + len(line) + 1 > self.digest_max_chars:
+                lines.append(f"... and {len(tables) - index} more tables (use get_schema for details)")
+                break
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background schema refresh failed, keeping previous catalog: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="schema-catalog-refresh", daemon=True).start()
+
+    def _load(self) -> None:
+        with self._load_lock:
+            # Concurrent callers wait for the first load instead of repeating it
+            if self._tables is not None and not self._stale:
+                return
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_seconds:
+                return  # A load failed recently; serve what there is rather than query again per call
+            if self._tables is None:
+                self.refresh()
+                return
+            # The schema is known to have changed, so do not serve the old version
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Schema refresh after DDL failed, keeping previous catalog: {e}")
+
+    def _ensure_loaded(self) -> None:
+        if self._tables is None or self._stale:
+            self._load()
+        elif time.monotonic() - self._loaded_at > self.ttl_seconds:
+            self._refresh_in_background()
+
+    def tables(self) -> Tuple[Table, ...]:
+        """The cached tables, loading them on first use"""
+        self._ensure_loaded()
+        return self._tables or ()
+
+    def digest(self) -> str:
+        """
+        Compact, size-bounded schema description for the agent's prompt.
+
+        Returns:
+            str: One line per table, or an empty string if the schema cannot be loaded
+        """
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            logger.warning(f"Schema catalog unavailable: {e}")
+        return self._digest
+
+    def row_estimates(self) -> str:
+        """
+        Estimated row counts of the loaded tables, kept out of the digest
+        because they change on every refresh while the structure does not.
+
+        Returns:
+            str: "table ~rows" entries, or an empty string before the catalog is loaded
+        """
+        return self._row_estimates
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash of the table and column structure, changing when the schema does"""
+        return self._fingerprint
+
+    def invalidate(self) -> None:
+        """Mark the catalog stale so it is reloaded on next use"""
+        with self._lock:
+            self._stale = True
+
+    def note_statement(self, sql: str) -> None:
+        """Invalidate the catalog if a statement changes the schema"""
+        if is_ddl(sql):
+            logger.info("DDL detected, schema catalog marked stale")
+            self.invalidate()
+
+
+def schema_prompt(digest: str) -> str:
+    """
+    System prompt section presenting a schema digest to an agent.
+
+    Args:
+        digest: Schema digest from SchemaCatalog.digest()
+
+    Returns:
+        str: The prompt section, or an empty string if there is no digest
+    """
+    if not digest:
+        return ""
+    return f"""
+Database schema (public), format table(column type [PK] [-> referenced table.column]):
+{digest}
+
+Use this schema directly instead of querying information_schema. Call get_schema only for details not listed here.
+"""
+
+
+def row_estimates_prompt(row_estimates: str) -> str:
+    """
+    System prompt section presenting table row estimates to an agent.
+
+    Args:
+        row_estimates: Estimates from SchemaCatalog.row_estimates()
+
+    Returns:
+        str: The prompt section, or an empty string if there are no estimates
+    """
+    if not row_estimates:
+        return ""
+    return f"Estimated table sizes in rows: {row_estimates}"
+
+
+_catalog: Optional[SchemaCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def _query_through_pool(sql: str) -> List[Dict]:
+    from .dsql_pool import get_sql_backend
+
+    result = get_sql_backend().call_tool("readonly_query", {"sql": sql}, tool_use_id="schema-catalog")
+    if result.get("status") == "error":
+        raise RuntimeError(f"Catalog query failed: {result.get('content')}")
+    return rows_from_tool_result(result)
+
+
+def get_schema_catalog() -> SchemaCatalog:
+    """Get the process-wide schema catalog, reading through the MCP session pool"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = SchemaCatalog(_query_through_pool)
+    return _catalog
@@ -0,0 +1,172 @@
+"""
+SQL Result Cache for DSQL Assistant
+
+This module caches readonly_query results keyed by normalized SQL, so
+repeated read-only questions are answered from memory instead of a
+round trip to DSQL. Entries expire on a TTL, are evicted in LRU order
+within entry and byte limits, and are invalidated by table when writes
+to those tables are seen.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .sql_utils import is_cacheable, normalize_sql, referenced_tables, tool_result_text
+
+logger = logging.getLogger(__name__)
+
+# Cache limits (overridable through the environment)
+DEFAULT_RESULT_CACHE_TTL_SECONDS = float(os.environ.get("SQL_CACHE_TTL_SECONDS", "300"))
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("SQL_CACHE_MAX_ENTRIES", "512"))
+DEFAULT_RESULT_CACHE_MAX_BYTES = int(os.environ.get("SQL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+CacheKey = Tuple[str, Tuple[str, ...]]
+
+
+class _CacheEntry:
+    __slots__ = ("result", "tables", "size", "stored_at")
+
+    def __init__(self, result: Dict[str, Any], tables: Set[str], size: int):
+        self.result = result
+        self.tables = tables
+        self.size = size
+        self.stored_at = time.monotonic()
+
+
+class QueryResultCache:
+    """Thread-safe, size-bounded LRU cache of read-only query results"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_RESULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialize the result cache.
+
+        Args:
+            ttl_seconds: Seconds a cached result is served
+            max_entries: Maximum number of cached results
+            max_bytes: Approximate cap on the size of cached result text
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._by_table: Dict[str, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _remove(self, key: CacheKey) -> None:
+        """Drop an entry. Must be called with the lock held."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def get(self, sql: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached result of a query.
+
+        Args:
+            sql: SQL statement
+
+        Returns:
+            dict: A copy of the cached tool result, or None on a miss
+        """
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl_seconds:
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return copy.deepcopy(entry.result)
+
+    def put(self, sql: str, result: Dict[str, Any]) -> bool:
+        """
+        Cache a successful query result.
+
+        Args:
+            sql: SQL statement that produced the result
+            result: MCP tool result
+
+        Returns:
+            bool: True if the result was stored
+        """
+        if result.get("status") != "success" or not is_cacheable(sql):
+            return False
+        size = len(tool_result_text(result))
+        if size > self.max_bytes:
+            return False
+        key = normalize_sql(sql)
+        tables = referenced_tables(sql)
+        stored = {name: value for name, value in result.items() if name != "toolUseId"}
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(stored, tables, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+        return True
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Drop every cached result that read any of the given tables.
+
+        Returns:
+            int: Number of invalidated entries
+        """
+        removed = 0
+        with self._lock:
+            for table in tables:
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    removed += 1
+            self._stats["invalidations"] += removed
+        if removed:
+            logger.info(f"Invalidated {removed} cached query results")
+        return removed
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters, hit ratio and current occupancy"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                hit_ratio=self._stats["hits"] / lookups if lookups else 0.0,
+            )
+
+
+query_result_cache = QueryResultCache()
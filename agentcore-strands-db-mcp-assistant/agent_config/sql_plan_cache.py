@@ -0,0 +1,283 @@
+"""
+SQL Plan Cache for DSQL Assistant
+
+This module maps database questions to the read-only SQL that answered
+them, so a repeated or paraphrased question runs the known queries
+directly instead of having the SQL agent write them again. Questions are
+normalized before lookup; an exact match is tried first and, when
+enabled, the most similar cached question by word overlap. Entries are
+tied to the schema fingerprint and dropped when the schema changes. An
+answer that took many queries is not cached: the SQL agent was probing
+the data, and replaying its probes would cost more than they save.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from .sql_utils import is_catalog_query
+from .tools.batch_query import run_readonly_queries
+
+logger = logging.getLogger(__name__)
+
+# Plan cache settings (overridable through the environment)
+PLAN_CACHE_ENABLED = os.environ.get("SQL_PLAN_CACHE_ENABLED", "true").lower() == "true"
+DEFAULT_PLAN_CACHE_MAX_ENTRIES = int(os.environ.get("SQL_PLAN_CACHE_MAX_ENTRIES", "256"))
+# Most statements in a cached plan; answers that ran more are not cached
+DEFAULT_PLAN_CACHE_MAX_STATEMENTS = int(os.environ.get("SQL_PLAN_CACHE_MAX_STATEMENTS", "3"))
+# Minimum word overlap (Jaccard) for a similar question to reuse a plan, 0 for exact matches only
+DEFAULT_PLAN_CACHE_MIN_SIMILARITY = float(os.environ.get("SQL_PLAN_CACHE_MIN_SIMILARITY", "0"))
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+
+# Politeness and filler words that do not change what is asked
+_FILLER_WORDS = {
+    "a", "an", "the", "please", "me", "us", "i", "we", "you", "can", "could", "would",
+    "tell", "show", "give", "want", "to", "see", "our", "my", "kindly",
+}
+
+
+def normalize_question(question: str) -> Tuple[str, ...]:
+    """
+    Reduce a question to its significant words.
+
+    Words are lower-cased, filler words are dropped and a plural "s" is
+    removed, so "Show me the top customers" and "top customer" match.
+
+    Args:
+        question: The user's question
+
+    Returns:
+        tuple: The remaining words in order
+    """
+    words = []
+    for word in _WORD_RE.findall(question.lower()):
+        if word in _FILLER_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return tuple(words)
+
+
+def _similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _numbers(words: FrozenSet[str]) -> FrozenSet[str]:
+    return frozenset(word for word in words if word.isdigit())
+
+
+class _PlanEntry:
+    __slots__ = ("statements", "words")
+
+    def __init__(self, statements: Tuple[str, ...], words: FrozenSet[str]):
+        self.statements = statements
+        self.words = words
+
+
+class SQLPlanCache:
+    """Thread-safe LRU cache from normalized questions to read-only SQL"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_PLAN_CACHE_MAX_ENTRIES,
+        min_similarity: float = DEFAULT_PLAN_CACHE_MIN_SIMILARITY,
+        max_statements: int = DEFAULT_PLAN_CACHE_MAX_STATEMENTS,
+    ):
+        """
+        Initialize the plan cache.
+
+        Args:
+            max_entries: Maximum number of cached plans
+            min_similarity: Word overlap needed to reuse the plan of a different question, 0 disables
+            max_statements: Most statements in a cached plan
+        """
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self.max_statements = max_statements
+        self._entries: "OrderedDict[Tuple[str, ...], _PlanEntry]" = OrderedDict()
+        self._fingerprint = ""
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "similar_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0, "too_long": 0}
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        """Drop all plans written for another schema. Must be called with the lock held."""
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                logger.info(f"Schema changed, dropping {len(self._entries)} cached SQL plans")
+                self._stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, question: str, fingerprint: str) -> Optional[Tuple[str, ...]]:
+        """
+        Look up the SQL for a question.
+
+        Args:
+            question: The user's question
+            fingerprint: Current schema fingerprint
+
+        Returns:
+            tuple: The SQL statements of the plan, or None on a miss
+        """
+        key = normalize_question(question)
+        if not key or not fingerprint:
+            return None
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.statements
+            if self.min_similarity > 0:
+                match = self._most_similar(frozenset(key))
+                if match is not None:
+                    self._entries.move_to_end(match)
+                    self._stats["similar_hits"] += 1
+                    return self._entries[match].statements
+            self._stats["misses"] += 1
+            return None
+
+    def _most_similar(self, words: FrozenSet[str]) -> Optional[Tuple[str, ...]]:
+        """Key of the most similar question asking for the same numbers. Must be called with the lock held."""
+        best, best_score = None, self.min_similarity
+        numbers = _numbers(words)
+        for key, entry in self._entries.items():
+            if _numbers(entry.words) != numbers:
+                continue
+            score = _similarity(words, entry.words)
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def put(self, question: str, fingerprint: str, statements: List[str]) -> None:
+        """
+        Store the SQL that answered a question.
+
+        Plans of more than max_statements statements are not stored.
+
+        Args:
+            question: The user's question
+            fingerprint: Schema fingerprint the SQL was written against
+            statements: Read-only statements, in the order they ran
+        """
+        key = normalize_question(question)
+        if not key or not fingerprint or not statements:
+            return
+        if len(statements) > self.max_statements:
+            with self._lock:
+                self._stats["too_long"] += 1
+            logger.debug(f"Not caching a plan of {len(statements)} statements")
+            return
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._entries[key] = _PlanEntry(tuple(statements), frozenset(key))
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, statements: Tuple[str, ...]) -> None:
+        """Drop every question's entry for a plan, e.g. after the plan failed to run"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.statements == statements]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+
+    def clear(self) -> None:
+        """Drop all plans"""
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and current size of the cache"""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+class PlanRecorder:
+    """Collects the SQL run while one question is answered"""
+
+    __slots__ = ("statements", "replayable")
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.replayable = True
+
+
+_recorder: ContextVar[Optional[PlanRecorder]] = ContextVar("sql_plan_recorder", default=None)
+
+
+@contextmanager
+def record_plan() -> Iterator[PlanRecorder]:
+    """
+    Record the SQL run by the database tools within the block.
+
+    The recorder is found through a context variable, so tools of an agent
+    run in a worker thread with a copied context still report to it.
+    """
+    recorder = PlanRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def note_query(sql: str, succeeded: bool) -> None:
+    """Report a readonly_query call to the active recorder"""
+    recorder = _recorder.get()
+    # Failed queries and schema exploration are not part of the answer
+    if recorder is None or not succeeded or is_catalog_query(sql):
+        return
+    if sql not in recorder.statements:
+        recorder.statements.append(sql)
+
+
+def note_write() -> None:
+    """Report a write to the active recorder; plans with writes are not replayed"""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.replayable = False
+
+
+async def _execute_plan(statements: Tuple[str, ...], tool: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    results = await run_readonly_queries(tool, list(statements), tool_use_id="sql-plan")
+    for sql, result in results:
+        if result.get("status") == "error":
+            raise RuntimeError(f"Cached SQL failed: {sql}")
+    return results
+
+
+def execute_plan(statements: Tuple[str, ...], tool: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Run the statements of a cached plan concurrently. Blocking.
+
+    Args:
+        statements: Read-only SQL statements
+        tool: The readonly_query agent tool, normally wrapped by SQLToolProxy
+            so results go through the result cache and caps
+
+    Returns:
+        list: (sql, tool result) per statement, in plan order
+
+    Raises:
+        RuntimeError: If a statement fails
+    """
+    return asyncio.run(_execute_plan(statements, tool))
+
+
+sql_plan_cache = SQLPlanCache()
@@ -0,0 +1,249 @@
+"""
+SQL Utilities for DSQL Assistant
+
+This module provides lightweight helpers for inspecting SQL text sent to
+the Aurora DSQL MCP server and for reading rows out of MCP tool results.
+"""
+
+import ast
+import json
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+# Comments are lexed after quoted strings and identifiers, so -- and /* inside a literal stay literal
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<ident>"(?:[^"]|"")*")
+    |(?P<comment>--[^\n]*|/\*.*?(?:\*/|$))
+    |(?P<number>\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    |(?P<param>\$\d+)
+    |(?P<op>::|<>|!=|<=|>=|\|\||.)
+    """,
+    re.X | re.S,
+)
+
+DDL_KEYWORDS = {"CREATE", "ALTER", "DROP", "TRUNCATE", "RENAME", "COMMENT"}
+DML_WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "MERGE", "UPSERT", "COPY"}
+
+# Keywords after which a table name follows
+_TABLE_CONTEXT_KEYWORDS = {"from", "join", "update", "into", "table"}
+
+# Keywords ending a FROM list, after which commas no longer separate tables
+_FROM_LIST_END_KEYWORDS = {"where", "group", "order", "having", "limit", "union", "intersect", "except", "window"}
+
+# Functions whose results change between executions of the same SQL
+_VOLATILE_FUNCTIONS = {
+    "now", "random", "current_timestamp", "current_date", "current_time",
+    "localtimestamp", "localtime", "clock_timestamp", "nextval", "gen_random_uuid",
+}
+
+
+# Token kinds that carry no meaning
+_SKIPPED_TOKENS = ("ws", "comment")
+
+
+def statement_keyword(sql: str) -> str:
+    """
+    Get the leading keyword of a statement.
+
+    Args:
+        sql: SQL statement
+
+    Returns:
+        str: The first keyword in upper case, or an empty string
+    """
+    return next((text.upper() for kind, text in tokenize(sql) if kind == "word"), "")
+
+
+def is_ddl(sql: str) -> bool:
+    """Check whether a statement changes the schema"""
+    return statement_keyword(sql) in DDL_KEYWORDS
+
+
+def is_write(sql: str) -> bool:
+    """Check whether a statement changes data or schema"""
+    keyword = statement_keyword(sql)
+    return keyword in DML_WRITE_KEYWORDS or keyword in DDL_KEYWORDS
+
+
+def tokenize(sql: str) -> List[Tuple[str, str]]:
+    """
+    Split SQL into (kind, text) tokens, dropping comments and whitespace.
+
+    Kinds are string, ident (quoted identifier), number, word, param and op.
+    """
+    return [
+        (match.lastgroup, match.group())
+        for match in _TOKEN_RE.finditer(sql)
+        if match.lastgroup not in _SKIPPED_TOKENS
+    ]
+
+
+def token_spans(sql: str) -> List[Tuple[str, str, int, int]]:
+    """
+    Split SQL into (kind, text, start, end) tokens, as tokenize() does.
+
+    Comments are skipped; start and end are offsets into the original SQL,
+    so tokens can be replaced in place.
+    """
+    return [
+        (match.lastgroup, match.group(), match.start(), match.end())
+        for match in _TOKEN_RE.finditer(sql)
+        if match.lastgroup not in _SKIPPED_TOKENS
+    ]
+
+
+def normalize_sql(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Normalize SQL into a parameterized template and its literal values.
+
+    Whitespace and comments are collapsed, unquoted words are lower-cased,
+    and string and numeric literals are replaced by ? placeholders, so
+    queries differing only in formatting map to the same template.
+
+    Args:
+        sql: SQL statement
+
+    Returns:
+        tuple: (template, literal values in order)
+    """
+    parts = []
+    params = []
+    for kind, text in tokenize(sql):
+        if kind in ("string", "number"):
+            parts.append("?")
+            params.append(text)
+        elif kind == "word":
+            parts.append(text.lower())
+        else:
+            parts.append(text)
+    while parts and parts[-1] == ";":
+        parts.pop()
+    return " ".join(parts), tuple(params)
+
+
+def referenced_tables(sql: str) -> Set[str]:
+    """
+    Find the tables a statement reads or writes.
+
+    Args:
+        sql: SQL statement
+
+    Returns:
+        set: Lower-cased table names without schema qualifiers
+    """
+    tables = set()
+    tokens = tokenize(sql)
+    expect_table = False
+    depth = 0
+    from_depths: List[int] = []  # parenthesis depth of each open FROM list
+    index = 0
+    while index < len(tokens):
+        kind, text = tokens[index]
+        word = text.lower() if kind == "word" else None
+        if text == "(":
+            depth += 1
+            expect_table = False
+        elif text == ")":
+            depth -= 1
+            while from_depths and from_depths[-1] > depth:
+                from_depths.pop()
+        elif word in _TABLE_CONTEXT_KEYWORDS:
+            expect_table = True
+            if word == "from":
+                from_depths.append(depth)
+        elif expect_table and kind in ("word", "ident"):
+            name = text.strip('"') if kind == "ident" else word
+            # Follow schema.table qualifiers to the table name
+            while index + 2 < len(tokens) and tokens[index + 1][1] == "." and tokens[index + 2][0] in ("word", "ident"):
+                index += 2
+                qualified_kind, qualified = tokens[index]
+                name = qualified.strip('"') if qualified_kind == "ident" else qualified.lower()
+            tables.add(name)
+            expect_table = False
+        elif text == "," and from_depths and from_depths[-1] == depth:
+            expect_table = True
+        elif word in _FROM_LIST_END_KEYWORDS and from_depths and from_depths[-1] == depth:
+            from_depths.pop()
+        index += 1
+    return tables
+
+
+def is_cacheable(sql: str) -> bool:
+    """Check whether a read-only statement returns the same rows for the same data"""
+    tokens = tokenize(sql)
+    return not any(kind == "word" and text.lower() in _VOLATILE_FUNCTIONS for kind, text in tokens)
+
+
+def is_catalog_query(sql: str) -> bool:
+    """Check whether a statement reads the system catalog (information_schema or pg_*)"""
+    return any(
+        kind == "word" and (text.lower() in ("information_schema", "pg_catalog") or text.lower().startswith("pg_"))
+        for kind, text in tokenize(sql)
+    )
+
+
+def statements_from_input(tool_input: Dict[str, Any]) -> List[str]:
+    """
+    Get the SQL statements from an MCP database tool's input.
+
+    Args:
+        tool_input: Input of a readonly_query ("sql") or transact ("sql_list") call
+
+    Returns:
+        list: The SQL statements in the call
+    """
+    statements = []
+    sql = tool_input.get("sql")
+    if isinstance(sql, str):
+        statements.append(sql)
+    sql_list = tool_input.get("sql_list")
+    if isinstance(sql_list, list):
+        statements.extend(item for item in sql_list if isinstance(item, str))
+    return statements
+
+
+def tool_result_text(result: Dict[str, Any]) -> str:
+    """Join the text content blocks of a tool result"""
+    return "\n".join(
+        block["text"] for block in result.get("content", []) if isinstance(block, dict) and "text" in block
+    )
+
+
+def _parse_text(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def rows_from_tool_result(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Read result rows from an MCP readonly_query tool result.
+
+    The server returns rows as JSON, either as one text block holding a list
+    or as one text block per row.
+
+    Args:
+        result: MCP tool result
+
+    Returns:
+        list: Rows as dictionaries, empty if the result holds no rows
+    """
+    rows: List[Dict[str, Any]] = []
+    for block in result.get("content", []):
+        if not isinstance(block, dict) or "text" not in block:
+            continue
+        value = _parse_text(block["text"])
+        if isinstance(value, list):
+            rows.extend(item for item in value if isinstance(item, dict))
+        elif isinstance(value, dict):
+            rows.append(value)
+    return rows
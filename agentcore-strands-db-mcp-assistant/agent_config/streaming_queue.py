@@ -2,34 +2,198 @@
 Streaming Queue for DSQL Assistant
 
 This module provides a streaming queue for handling asynchronous
-response streaming in the DSQL assistant.
+response streaming in the DSQL assistant. The queue is bounded so a slow
+client applies backpressure to the producer, and adjacent text deltas
+are coalesced into larger frames before they are handed to the consumer.
+Producers on other event loops (tools of a nested agent run on their own
+loop in a worker thread) hand items over with publish().
 """
 
 import asyncio
-from typing import AsyncGenerator, Any
+import os
+import time
+from typing import AsyncGenerator, Any, Dict, List, Optional
+
+# Maximum number of frames held before producers wait for the consumer
+DEFAULT_MAX_SIZE = int(os.environ.get("STREAM_QUEUE_MAX_SIZE", "256"))
+
+# Pending text is flushed as one frame once it reaches this many bytes
+DEFAULT_MAX_FRAME_BYTES = int(os.environ.get("STREAM_FRAME_BYTES", "256"))
+
+# ... or once the oldest pending delta has waited this long
+DEFAULT_FLUSH_INTERVAL = float(os.environ.get("STREAM_FLUSH_INTERVAL_MS", "50")) / 1000
+
+_END = object()  # Sentinel value marking the end of the stream
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 
 class StreamingQueue:
-    """Async queue for streaming responses"""
-    
-    def __init__(self):
-        self._queue = asyncio.Queue()
+    """Bounded async queue for streaming responses with text coalescing"""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_SIZE,
+        max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize the streaming queue.
+
+        Args:
+            maxsize: Maximum number of queued frames, 0 for unbounded
+            max_frame_bytes: Size threshold for flushing coalesced text, 0 disables coalescing
+            flush_interval: Seconds pending text may wait before it is flushed
+        """
+        self._queue = asyncio.Queue(maxsize)
+        self._loop = _running_loop()
         self._finished = False
-    
+        self._closed = False
+        self.max_frame_bytes = max_frame_bytes
+        self.flush_interval = flush_interval
+
+        self._lock = asyncio.Lock()
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._flush_timer: Optional[asyncio.Task] = None
+
+        self._queued_bytes = 0
+        self._items_received = 0
+        self._frames_enqueued = 0
+        self._frames_emitted = 0
+        self._producer_waits = 0
+        self._first_frame_at: Optional[float] = None
+
     async def put(self, item: Any) -> None:
-        """Add an item to the queue"""
-        if not self._finished:
-            await self._queue.put(item)
-    
+        """Add an item to the queue, coalescing text with adjacent text"""
+        if self._finished or self._closed:
+            return
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        self._items_received += 1
+
+        if isinstance(item, str) and self.max_frame_bytes > 0:
+            self._pending.append(item)
+            self._pending_bytes += len(item.encode("utf-8"))
+            # The first frame goes out immediately to keep time-to-first-byte low
+            if self._pending_bytes >= self.max_frame_bytes or self._frames_enqueued == 0:
+                await self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.create_task(self._flush_later())
+            return
+
+        async with self._lock:
+            await self._flush_pending()
+            await self._enqueue(item, len(item.encode("utf-8")) if isinstance(item, str) else len(str(item)))
+
+    async def publish(self, item: Any) -> None:
+        """
+        Add an item from any event loop.
+
+        On the loop that owns the queue this is put(). From another loop the
+        item is handed to the owning loop, and this waits until the queue
+        accepted it, so backpressure still applies to the producer.
+        """
+        loop = self._loop
+        if loop is None or loop is _running_loop():
+            await self.put(item)
+            return
+        if self._finished or self._closed or loop.is_closed():
+            return
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.put(item), loop))
+
+    async def flush(self) -> None:
+        """Send any pending coalesced text as a single frame"""
+        async with self._lock:
+            await self._flush_pending()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def _flush_pending(self) -> None:
+        """Flush pending text. Must be called with the lock held."""
+        timer = self._flush_timer
+        self._flush_timer = None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        if not self._pending:
+            return
+        frame = "".join(self._pending)
+        size = self._pending_bytes
+        self._pending = []
+        self._pending_bytes = 0
+        await self._enqueue(frame, size)
+
+    async def _enqueue(self, item: Any, size: int) -> None:
+        if self._closed:
+            return
+        if self._queue.full():
+            self._producer_waits += 1
+        self._queued_bytes += size
+        await self._queue.put((item, size))
+        if item is not _END:
+            self._frames_enqueued += 1
+
     async def finish(self) -> None:
-        """Mark the queue as finished"""
-        self._finished = True
-        await self._queue.put(None)  # Sentinel value
-    
+        """Flush pending text and mark the queue as finished"""
+        if self._finished:
+            return
+        async with self._lock:
+            await self._flush_pending()
+            self._finished = True
+            await self._enqueue(_END, 0)
+
+    def close(self) -> None:
+        """
+        Stop accepting items and discard queued frames.
+
+        Called by the consumer when it stops reading, so producers blocked on
+        a full queue are released instead of waiting forever.
+        """
+        self._closed = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._pending = []
+        self._pending_bytes = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queued_bytes = 0
+
     async def stream(self) -> AsyncGenerator[Any, None]:
         """Stream items from the queue"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
         while True:
-            item = await self._queue.get()
-            if item is None:  # Sentinel value indicates end
+            item, size = await self._queue.get()
+            self._queued_bytes -= size
+            if item is _END:
                 break
-            yield item
\ No newline at end of file
+            if self._first_frame_at is None:
+                self._first_frame_at = time.monotonic()
+            self._frames_emitted += 1
+            yield item
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current queue metrics.
+
+        Returns:
+            dict: queue_depth, bytes_buffered, frames_emitted, items_received,
+            frames_per_second and producer_waits
+        """
+        elapsed = time.monotonic() - self._first_frame_at if self._first_frame_at else 0.0
+        return {
+            "queue_depth": self._queue.qsize(),
+            "bytes_buffered": self._queued_bytes + self._pending_bytes,
+            "frames_emitted": self._frames_emitted,
+            "items_received": self._items_received,
+            "frames_per_second": self._frames_emitted / elapsed if elapsed > 0 else 0.0,
+            "producer_waits": self._producer_waits,
+        }
@@ -0,0 +1,237 @@
+"""
+Structured Logging for DSQL Assistant
+
+This module configures the agent's logging for low overhead on the
+request path. Log calls only put the record on a queue; a listener thread
+formats and writes it, so formatting and I/O no longer run on the event
+loop thread. Events carry structured fields and are written as one JSON
+object per line. Long values are truncated and payload fields (questions,
+answers, SQL) are replaced by a hash unless configured otherwise. Only
+the agent's own loggers log at LOG_LEVEL; libraries such as botocore, mcp
+and strands stay at WARNING unless raised in LOG_LEVELS, and high-volume
+events are sampled.
+"""
+
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional, TextIO
+
+# Logging settings (overridable through the environment)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Output format: json (one object per line) or text
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+# Per-logger levels, e.g. "botocore=DEBUG,agent_config.query_guard=DEBUG"
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+# Payload fields are logged as a hash (hash) or as truncated text (truncate)
+LOG_PAYLOADS = os.environ.get("LOG_PAYLOADS", "hash")
+DEFAULT_LOG_MAX_FIELD_CHARS = int(os.environ.get("LOG_MAX_FIELD_CHARS", "256"))
+# Fraction of high-volume events that are logged
+DEFAULT_LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.1"))
+# Records waiting for the listener thread before new ones are dropped
+DEFAULT_LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+# Loggers of this application, logged at LOG_LEVEL; all others default to WARNING
+APPLICATION_LOGGERS = ("agent_config", "scripts", "app", "__main__")
+
+# Fields holding user or database content
+PAYLOAD_FIELDS = frozenset({"query", "response", "prompt", "sql"})
+
+# Standard LogRecord attributes, so anything else passed in extra is a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... ({len(text)} chars)"
+
+
+def payload_digest(text: str) -> str:
+    """Short stable hash of a payload, to correlate log lines without logging the content"""
+    return hashlib.sha256(text.encode("utf-8", "replace")).hexdigest()[:16]
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as JSON objects (or key=value text) with truncated and hashed fields"""
+
+    def __init__(
+        self,
+        fmt: str = LOG_FORMAT,
+        payloads: str = LOG_PAYLOADS,
+        max_field_chars: int = DEFAULT_LOG_MAX_FIELD_CHARS,
+    ):
+        """
+        Initialize the formatter.
+
+        Args:
+            fmt: "json" or "text"
+            payloads: "hash" or "truncate", how PAYLOAD_FIELDS are written
+            max_field_chars: Characters of a message or field value kept before truncation
+        """
+        super().__init__()
+        self.fmt = fmt
+        self.payloads = payloads
+        self.max_field_chars = max_field_chars
+
+    def _field(self, name: str, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if not isinstance(value, str):
+            try:
+                value = json.dumps(value, default=str)
+            except (TypeError, ValueError):
+                value = str(value)
+        if name in PAYLOAD_FIELDS and self.payloads == "hash":
+            return {"sha256": payload_digest(value), "chars": len(value)}
+        return _truncate(value, self.max_field_chars)
+
+    def fields(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """The record's structured fields, passed to log_event or in extra"""
+        return {
+            name: self._field(name, value)
+            for name, value in vars(record).items()
+            if name not in _RECORD_ATTRIBUTES
+        }
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": _truncate(record.getMessage(), self.max_field_chars * 4),
+        }
+        entry.update(self.fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if self.fmt == "json":
+            return json.dumps(entry, default=str)
+        text = " ".join(f"{name}={value}" for name, value in entry.items() if name not in ("exception",))
+        return text + ("\n" + entry["exception"] if "exception" in entry else "")
+
+
+class OffThreadQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The standard handler formats each record before queueing it; here the
+    record is queued as is, and records are dropped and counted when the
+    listener falls behind instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def log_event(logger: logging.Logger, level: int, event: str, sample: float = 1.0, **fields: Any) -> None:
+    """
+    Log an event with structured fields.
+
+    Nothing is built when the logger is disabled for the level, and a
+    sampled event is dropped before a record is created.
+
+    Args:
+        logger: Logger to log to
+        level: Logging level
+        event: Event name, e.g. "dsql_assistant.question"
+        sample: Fraction of these events to log; logged events carry sample_rate
+        fields: Structured fields; PAYLOAD_FIELDS are hashed or truncated when written
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sample < 1.0:
+        if random.random() >= sample:
+            return
+        fields["sample_rate"] = sample
+    logger.log(level, event, extra=fields, stacklevel=2)
+
+
+def _parse_levels(levels: str) -> Dict[str, str]:
+    parsed = {}
+    for item in levels.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            parsed[name.strip()] = level.strip().upper()
+    return parsed
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[OffThreadQueueHandler] = None
+_lock = threading.Lock()
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    fmt: str = LOG_FORMAT,
+    levels: str = LOG_LEVELS,
+    stream: Optional[TextIO] = None,
+    queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+) -> None:
+    """
+    Route all logging through the off-thread queue handler. Idempotent.
+
+    Args:
+        level: Level of the application's loggers
+        fmt: "json" or "text"
+        levels: Per-logger level overrides, "name=LEVEL,..."
+        stream: Where the listener writes, defaults to stderr
+        queue_size: Records buffered for the listener before new ones are dropped
+    """
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            return
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(StructuredFormatter(fmt))
+        _handler = OffThreadQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(logging.WARNING)
+    for name in APPLICATION_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+    for name, logger_level in _parse_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write the queued records and stop the listener thread"""
+    global _listener, _handler
+    with _lock:
+        listener, handler = _listener, _handler
+        _listener = _handler = None
+    if listener is None:
+        return
+    listener.stop()
+    logging.getLogger().removeHandler(handler)
+
+
+def logging_stats() -> Dict[str, int]:
+    """Records dropped because the listener fell behind, and records waiting"""
+    handler = _handler
+    if handler is None:
+        return {"dropped": 0, "queued": 0}
+    return {"dropped": handler.dropped, "queued": handler.queue.qsize()}
@@ -0,0 +1,243 @@
+"""
+Telemetry for DSQL Assistant
+
+This module provides the spans and metrics of the request pipeline: one
+span per stage (invoke, agent_task, agent stream, dsql_assistant, SSM
+lookup, MCP spawn and tool calls, memory load and save), histograms of
+stage duration, time to first token, tokens, SQL rows and query cost, and
+a count of query guard decisions. Data goes to the OpenTelemetry providers
+configured for the process (opentelemetry-instrument in the container);
+with telemetry disabled every call is a no-op.
+"""
+
+import logging
+import os
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Telemetry switch (overridable through the environment)
+TELEMETRY_ENABLED = os.environ.get("DSQL_TELEMETRY_ENABLED", "true").lower() == "true"
+
+INSTRUMENTATION_NAME = "dsql_assistant"
+
+T = TypeVar("T")
+
+try:
+    from opentelemetry import metrics, trace
+except ImportError:  # pragma: no cover - opentelemetry-api ships with strands-agents
+    metrics = trace = None
+
+_tracer = None
+_instruments: Dict[str, Any] = {}
+
+
+def enabled() -> bool:
+    """Whether spans and metrics are recorded"""
+    return TELEMETRY_ENABLED and trace is not None
+
+
+def _get_tracer():
+    global _tracer
+    if _tracer is None:
+        _tracer = trace.get_tracer(INSTRUMENTATION_NAME)
+    return _tracer
+
+
+def _instrument(name: str):
+    """Create the pipeline's metric instruments on first use"""
+    if not _instruments:
+        meter = metrics.get_meter(INSTRUMENTATION_NAME)
+        _instruments.update(
+            stage_duration=meter.create_histogram(
+                "dsql_assistant.stage.duration", unit="ms", description="Duration of a request pipeline stage"
+            ),
+            time_to_first_token=meter.create_histogram(
+                "dsql_assistant.time_to_first_token", unit="ms", description="Time from request to first streamed text"
+            ),
+            tokens=meter.create_histogram(
+                "dsql_assistant.tokens", unit="{token}", description="Model tokens used by one request"
+            ),
+            sql_rows=meter.create_histogram(
+                "dsql_assistant.sql.rows", unit="{row}", description="Rows returned by one SQL tool call"
+            ),
+            guard_decisions=meter.create_counter(
+                "dsql_assistant.sql.guard.decisions", unit="{query}", description="Query guard decisions by action"
+            ),
+            estimated_cost=meter.create_histogram(
+                "dsql_assistant.sql.estimated_cost", unit="1", description="Planner cost estimate of a checked query"
+            ),
+        )
+    return _instruments[name]
+
+
+class _NoopStage:
+    """Stand-in returned by stage() when telemetry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def activate(self) -> "_NoopStage":
+        return self
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _Stage:
+    """A span that also records its duration in the stage histogram"""
+
+    __slots__ = ("name", "metric_attributes", "_attributes", "_span_manager", "_span", "_started")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], metric_attributes: Dict[str, Any], current: bool = True):
+        self.name = name
+        self.metric_attributes = metric_attributes
+        self._attributes = attributes
+        self._span_manager = _get_tracer().start_as_current_span(name, attributes=attributes) if current else None
+        self._span = None
+        self._started = 0.0
+
+    def __enter__(self) -> "_Stage":
+        if self._span_manager is not None:
+            self._span = self._span_manager.__enter__()
+        else:
+            self._span = _get_tracer().start_span(self.name, attributes=self._attributes)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        try:
+            _instrument("stage_duration").record(
+                elapsed_ms, dict(self.metric_attributes, stage=self.name, error=exc_type is not None)
+            )
+        except Exception as e:
+            logger.debug(f"Failed to record stage duration: {e}")
+        if self._span_manager is not None:
+            return self._span_manager.__exit__(exc_type, exc, tb)
+        if isinstance(exc, Exception):
+            self._span.record_exception(exc)
+            self._span.set_status(trace.Status(trace.StatusCode.ERROR, f"{exc_type.__name__}: {exc}"))
+        self._span.end()
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Add an attribute to the span"""
+        if value is not None:
+            self._span.set_attribute(key, value)
+
+    def activate(self):
+        """Context manager making the span current for a block, without ending it"""
+        return trace.use_span(self._span, end_on_exit=False)
+
+
+def stage(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    metric_attributes: Optional[Dict[str, Any]] = None,
+    current: bool = True,
+):
+    """
+    Trace a pipeline stage.
+
+    Use as a context manager. The span becomes the current span, so stages
+    started inside it (including on the tool executor, which copies the
+    context) are nested under it.
+
+    In an async generator, pass current=False: a span made current across a
+    yield would parent the consumer's work and be detached in whatever
+    context closes the generator. Make it current only around the work the
+    generator does itself, with activate() or traced_iter().
+
+    Args:
+        name: Stage name, e.g. "dsql_assistant" or "mcp.call_tool"
+        attributes: Span attributes such as session.id; None values are dropped
+        metric_attributes: Low-cardinality attributes added to the duration histogram
+        current: Whether the span is the current span for the whole block
+
+    Returns:
+        A context manager whose value has set_attribute(key, value) and activate()
+    """
+    if not enabled():
+        return _NOOP_STAGE
+    return _Stage(
+        name,
+        {key: value for key, value in (attributes or {}).items() if value is not None},
+        metric_attributes or {},
+        current,
+    )
+
+
+async def traced_iter(current_stage: Any, iterable: AsyncIterable[T]) -> AsyncIterator[T]:
+    """
+    Iterate an async iterable with a stage's span current while each item is produced.
+
+    The span is not current while the caller handles an item, so work done
+    by the consumer between items is not nested under it.
+
+    Args:
+        current_stage: The value of a stage(..., current=False) block
+        iterable: Async iterable producing the items, e.g. an agent's event stream
+    """
+    iterator = iterable.__aiter__()
+    while True:
+        with current_stage.activate():
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+        yield item
+
+
+def _record(instrument: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+    if not enabled():
+        return
+    try:
+        metric = _instrument(instrument)
+        if hasattr(metric, "add"):
+            metric.add(value, attributes or {})
+        else:
+            metric.record(value, attributes or {})
+    except Exception as e:
+        logger.debug(f"Failed to record {instrument}: {e}")
+
+
+def record_time_to_first_token(elapsed_ms: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Record the time from the start of a request to its first streamed text"""
+    _record("time_to_first_token", elapsed_ms, attributes)
+
+
+def record_tokens(
+    input_tokens: int,
+    output_tokens: int,
+    attributes: Optional[Dict[str, Any]] = None,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> None:
+    """Record the model tokens used by one request; input tokens exclude those read from or written to the prompt cache"""
+    _record("tokens", input_tokens, dict(attributes or {}, direction="input"))
+    _record("tokens", output_tokens, dict(attributes or {}, direction="output"))
+    if cache_read_tokens or cache_write_tokens:
+        _record("tokens", cache_read_tokens, dict(attributes or {}, direction="cache_read"))
+        _record("tokens", cache_write_tokens, dict(attributes or {}, direction="cache_write"))
+
+
+def record_sql_rows(rows: int, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Record the number of rows returned by a SQL tool call"""
+    _record("sql_rows", rows, attributes)
+
+
+def record_guard_decision(action: str, estimated_cost: Optional[float] = None) -> None:
+    """Count a query guard decision and record the query's planner cost if it was checked"""
+    _record("guard_decisions", 1, {"action": action})
+    if estimated_cost is not None:
+        _record("estimated_cost", estimated_cost, {"action": action})
@@ -0,0 +1,85 @@
+"""
+Tool Executor for DSQL Assistant
+
+This module runs blocking tool work (SSM lookups, MCP calls, nested
+agent invocations) on a bounded thread pool. Strands already runs sync
+tools off the event loop with asyncio.to_thread, but on the loop's shared
+default executor, sized by CPU count; this pool caps the tool calls, and
+so the MCP sessions and database queries, running at once per container.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+# Maximum number of tool calls running at once per container
+DEFAULT_TOOL_MAX_WORKERS = int(os.environ.get("DSQL_TOOL_MAX_WORKERS", "8"))
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_counters = {"submitted": 0, "running": 0, "completed": 0}
+_counters_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Get the process-wide tool executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_TOOL_MAX_WORKERS,
+                    thread_name_prefix="dsql-tool",
+                )
+    return _executor
+
+
+def _tracked(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    with _counters_lock:
+        _counters["running"] += 1
+    try:
+        return func(*args, **kwargs)
+    finally:
+        with _counters_lock:
+            _counters["running"] -= 1
+            _counters["completed"] += 1
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, executor: Optional[ThreadPoolExecutor] = None, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the tool executor and await its result.
+
+    The caller's context variables are copied into the worker thread.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        executor: Executor to use, defaults to the process-wide tool executor
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    with _counters_lock:
+        _counters["submitted"] += 1
+    return await loop.run_in_executor(
+        executor or get_tool_executor(),
+        functools.partial(context.run, _tracked, func, *args, **kwargs),
+    )
+
+
+def executor_stats() -> Dict[str, int]:
+    """Counters of submitted, running, queued and completed tool calls"""
+    with _counters_lock:
+        stats = dict(_counters)
+    stats["queued"] = stats["submitted"] - stats["running"] - stats["completed"]
+    stats["max_workers"] = DEFAULT_TOOL_MAX_WORKERS
+    return stats
@@ -0,0 +1,159 @@
+"""
+Batch Read-Only Query Tool for DSQL Assistant
+
+This module provides the batch_readonly_query tool. It runs several
+independent read-only queries concurrently, each on its own pooled MCP
+session, and returns their results together, so a question that needs
+several queries waits for the slowest of them instead of all in turn.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+from agent_config.telemetry import stage
+
+logger = logging.getLogger(__name__)
+
+BATCH_QUERY_TOOL = "batch_readonly_query"
+
+# Batch limits (overridable through the environment)
+DEFAULT_BATCH_MAX_QUERIES = int(os.environ.get("SQL_BATCH_MAX_QUERIES", "10"))
+DEFAULT_BATCH_MAX_CONCURRENCY = int(os.environ.get("SQL_BATCH_MAX_CONCURRENCY", "4"))
+
+
+async def _run_one(
+    tool: AgentTool, tool_use_id: str, sql: str, invocation_state: Dict[str, Any], **kwargs: Any
+) -> Dict[str, Any]:
+    tool_use = {"toolUseId": tool_use_id, "name": tool.tool_name, "input": {"sql": sql}}
+    result = None
+    try:
+        async for event in tool.stream(tool_use, invocation_state, **kwargs):
+            result = event
+    except Exception as e:
+        logger.warning(f"Query in batch failed: {e}")
+        return {"toolUseId": tool_use_id, "status": "error", "content": [{"text": f"Query failed: {e}"}]}
+    if not isinstance(result, dict):
+        return {"toolUseId": tool_use_id, "status": "error", "content": [{"text": "Query returned no result"}]}
+    return result
+
+
+async def run_readonly_queries(
+    tool: AgentTool,
+    statements: List[str],
+    max_concurrency: int = DEFAULT_BATCH_MAX_CONCURRENCY,
+    tool_use_id: str = "batch",
+    invocation_state: Dict[str, Any] = None,
+    **kwargs: Any,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Run read-only queries concurrently through a readonly_query tool.
+
+    Args:
+        tool: The readonly_query agent tool, normally wrapped by SQLToolProxy
+        statements: SQL statements, independent of each other
+        max_concurrency: Queries running at once
+        tool_use_id: Prefix of the tool use ids of the individual queries
+        invocation_state: Invocation state passed to the tool
+
+    Returns:
+        list: (sql, tool result) per statement, in input order; failed queries have status "error"
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(index: int, sql: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _run_one(tool, f"{tool_use_id}-{index}", sql, invocation_state or {}, **kwargs)
+
+    results = await asyncio.gather(*(run(index, sql) for index, sql in enumerate(statements)))
+    return list(zip(statements, results))
+
+
+class BatchReadonlyQueryTool(AgentTool):
+    """Agent tool running several read-only queries concurrently"""
+
+    def __init__(
+        self,
+        readonly_query: AgentTool,
+        max_queries: int = DEFAULT_BATCH_MAX_QUERIES,
+        max_concurrency: int = DEFAULT_BATCH_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the batch tool.
+
+        Args:
+            readonly_query: The readonly_query tool each query runs through
+            max_queries: Maximum number of queries in one call
+            max_concurrency: Queries running at once
+        """
+        super().__init__()
+        self._readonly_query = readonly_query
+        self.max_queries = max_queries
+        self.max_concurrency = max_concurrency
+
+    @property
+    def tool_name(self) -> str:
+        return BATCH_QUERY_TOOL
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return {
+            "name": BATCH_QUERY_TOOL,
+            "description": (
+                "Run several independent read-only SQL queries at the same time and get all their results "
+                "in one response. Use it instead of consecutive readonly_query calls whenever the queries "
+                "do not depend on each other's results, e.g. counts of several tables or metrics compared "
+                f"across categories. At most {self.max_queries} queries per call."
+            ),
+            "inputSchema": {"json": {
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The SQL queries to run, each a single read-only statement",
+                    },
+                },
+                "required": ["queries"],
+            }},
+        }
+
+    @property
+    def tool_type(self) -> str:
+        return "python"
+
+    async def stream(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        """Run the queries and yield one result holding each query's output"""
+        queries = (tool_use.get("input") or {}).get("queries")
+        if not isinstance(queries, list) or not queries or not all(isinstance(sql, str) for sql in queries):
+            yield self._error(tool_use, "queries must be a non-empty list of SQL strings")
+            return
+        if len(queries) > self.max_queries:
+            yield self._error(
+                tool_use, f"{len(queries)} queries given, at most {self.max_queries} are allowed per call"
+            )
+            return
+
+        with stage("sql.batch_query", {"sql.batch_size": len(queries)}) as span:
+            results = await run_readonly_queries(
+                self._readonly_query, queries, self.max_concurrency, tool_use["toolUseId"], invocation_state, **kwargs
+            )
+            failed = sum(1 for _, result in results if result.get("status") == "error")
+            span.set_attribute("sql.batch_failed", failed)
+
+        content = []
+        for index, (sql, result) in enumerate(results, start=1):
+            content.append({"text": f"Query {index} ({result.get('status', 'success')}): {sql}"})
+            content.extend(block for block in result.get("content", []) if isinstance(block, dict) and "text" in block)
+        yield {
+            "toolUseId": tool_use["toolUseId"],
+            "status": "error" if failed == len(results) else "success",
+            "content": content,
+        }
+
+    @staticmethod
+    def _error(tool_use: ToolUse, message: str) -> Dict[str, Any]:
+        return {"toolUseId": tool_use["toolUseId"], "status": "error", "content": [{"text": message}]}
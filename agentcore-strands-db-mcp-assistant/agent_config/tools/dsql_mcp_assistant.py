@@ -1,16 +1,31 @@
-import os
 import logging
-from mcp import StdioServerParameters, stdio_client
+from typing import Optional
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands.tools.mcp import MCPClient
+from agent_config.dsql_pool import get_sql_backend
+from agent_config.model_clients import get_bedrock_model
+from agent_config.prompt_cache import cacheable_system_prompt, model_id_of
+from agent_config.schema_catalog import get_schema_catalog, row_estimates_prompt, schema_prompt
+from agent_config.sql_plan_cache import PLAN_CACHE_ENABLED, execute_plan, record_plan, sql_plan_cache
+from agent_config.sql_utils import tool_result_text
+from agent_config.structured_logging import DEFAULT_LOG_SAMPLE_RATE, log_event
+from agent_config.telemetry import record_tokens, stage
+from agent_config.tool_executor import run_blocking
+from agent_config.tools.sql_tool_proxy import READONLY_QUERY_TOOL, wrap_sql_tools
 
-# Set up logging for debugging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+SQL_AGENT_MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+DSQL_AGENT_SYSTEM_PROMPT = """You are a helpful SQL assistant that can execute SQL queries against a DSQL database.
+You can help users write and execute SQL queries to analyze their data.
+Use the available database tools to run SQL queries when needed.
+When a question needs several queries that do not depend on each other, run them together with batch_readonly_query.
+Provide clear explanations of query results and help users understand their data.
+
+"""
+
 @tool
-def dsql_assistant(query: str) -> str:
+async def dsql_assistant(query: str) -> str:
     """
     Process and respond to DSQL database queries.
     
@@ -20,99 +35,133 @@ def dsql_assistant(query: str) -> str:
     Returns:
         A helpful response addressing the user query
     """
-    # Use INFO level for key events to ensure they appear in AgentCore logs
-    logger.info(f"🔍 DSQL Assistant called with query: {query}")
+    # The blocking work runs on the bounded tool executor so other sessions
+    # streaming on this event loop keep making progress
+    with stage("dsql_assistant", {"tool.name": "dsql_assistant"}):
+        return await run_blocking(answer_dsql_question, query)
+
+
+def answer_dsql_question(query: str) -> str:
+    """
+    Answer a DSQL database question with a SQL sub-agent. Blocking.
+    
+    Args:
+        query: The user's SQL question
+        
+    Returns:
+        A helpful response addressing the user query
+    """
+    # The question is logged as a hash unless LOG_PAYLOADS=truncate
+    log_event(logger, logging.INFO, "dsql_assistant.question", query=query)
+
+    # A question answered before runs its known SQL without the SQL agent
+    if PLAN_CACHE_ENABLED:
+        plan_answer = answer_from_plan(query)
+        if plan_answer is not None:
+            return plan_answer
     
     try:
-        logger.info("🤖 Creating Bedrock model...")
-        bedrock_model = BedrockModel(model_id="us.amazon.nova-pro-v1:0")
-        logger.info("✅ Bedrock model created successfully")
+        # The model client is shared across questions, so its HTTPS connections stay warm
+        bedrock_model = get_bedrock_model(SQL_AGENT_MODEL_ID)
         response = str()
     except Exception as e:
-        logger.error(f"❌ Failed to create Bedrock model: {e}")
+        logger.exception("dsql_assistant.model_failed")
         return f"Error creating Bedrock model: {str(e)}"
     
     try:
-        # Import SSM utils inside the function to avoid loading at import time
-        logger.info("📦 Importing SSM utils...")
-        import sys
-        import os
-        # Add project root to Python path
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        sys.path.insert(0, project_root)
-        logger.info(f"📁 Added to Python path: {project_root}")
-        
-        from scripts.utils import get_ssm_parameter
-        logger.info("✅ SSM utils imported successfully")
-        
-        # Get DSQL configuration when the function is called, not at import time
-        logger.info("🔐 Retrieving DSQL configuration from SSM...")
-        dsql_cluster_id = get_ssm_parameter("/agentcore-db-mcp-assistant/DSQL_CLUSTER_ID")
-        logger.info(f"🆔 DSQL_CLUSTER_ID: {dsql_cluster_id}")
-        
-        aws_region = get_ssm_parameter("/agentcore-db-mcp-assistant/AWS_REGION")
-        logger.info(f"🌍 AWS_REGION: {aws_region}")
-        
-        # Construct the cluster endpoint
-        cluster_endpoint = f"{dsql_cluster_id}.dsql.{aws_region}.on.aws"
-        logger.info(f"🔗 Cluster endpoint: {cluster_endpoint}")
-        
-        # Create MCP client with debug logging
-        logger.info("🔌 Creating MCP client...")
-        command_args = [
-            "awslabs.aurora-dsql-mcp-server@latest",
-            "--cluster_endpoint", cluster_endpoint,
-            "--database_user", "admin",
-            "--region", aws_region
-        ]
-        logger.info(f"⚡ MCP command: uvx {' '.join(command_args)}")
-        
-        dsql_mcp_server = MCPClient(
-            lambda: stdio_client(
-                StdioServerParameters(
-                    command="uvx",
-                    args=command_args,
-                )
+        # Borrow warm MCP sessions (or direct database connections) from the
+        # process-wide pool instead of spawning a new MCP server for every question
+        pool = get_sql_backend()
+        with stage("mcp.tools"):
+            tools = wrap_sql_tools(pool.tools())
+        log_event(logger, logging.DEBUG, "dsql_assistant.tools", tools=len(tools))
+
+        # Give the agent the cached schema so it can skip information_schema exploration;
+        # instructions and schema form a static prefix that is served from the prompt cache,
+        # and the row estimates, which change on every refresh, follow the cache point
+        with stage("schema.digest"):
+            catalog = get_schema_catalog()
+            system_prompt = cacheable_system_prompt(
+                [DSQL_AGENT_SYSTEM_PROMPT, schema_prompt(catalog.digest())],
+                model_id_of(bedrock_model),
+                uncached=[row_estimates_prompt(catalog.row_estimates())],
             )
-        )
-        logger.info("✅ MCP client created successfully")
-        
-        logger.info("🔗 Connecting to MCP server...")
-        with dsql_mcp_server:
-            logger.info("✅ MCP server connection established")
-            
-            logger.info("🛠️ Listing available tools...")
-            tools = dsql_mcp_server.list_tools_sync()
-            logger.info(f"✅ Retrieved {len(tools)} tools")
-            
-            # Create the DSQL agent with specific capabilities
-            logger.info("🤖 Creating DSQL agent...")
-            dsql_agent = Agent(
-                model=bedrock_model,
-                system_prompt="""You are a helpful SQL assistant that can execute SQL queries against a DSQL database.
-You can help users write and execute SQL queries to analyze their data.
-Use the available database tools to run SQL queries when needed.
-Provide clear explanations of query results and help users understand their data.
+            fingerprint = catalog.fingerprint
 
-""",
-                tools=tools,
+        # Create the DSQL agent with specific capabilities
+        dsql_agent = Agent(
+            model=bedrock_model,
+            system_prompt=system_prompt,
+            tools=tools,
+        )
+        with stage("sql_agent") as span, record_plan() as plan:
+            result = dsql_agent(query)
+            usage = result.metrics.accumulated_usage
+            span.set_attribute("gen_ai.usage.input_tokens", usage.get("inputTokens", 0))
+            span.set_attribute("gen_ai.usage.output_tokens", usage.get("outputTokens", 0))
+            span.set_attribute("gen_ai.usage.cache_read_input_tokens", usage.get("cacheReadInputTokens", 0))
+            record_tokens(
+                usage.get("inputTokens", 0), usage.get("outputTokens", 0), {"agent": "sql"},
+                cache_read_tokens=usage.get("cacheReadInputTokens", 0),
+                cache_write_tokens=usage.get("cacheWriteInputTokens", 0),
             )
-            logger.info("✅ DSQL agent created successfully")
-            
-            logger.info("⚡ Processing query with agent...")
-            response = str(dsql_agent(query))
-            logger.info(f"✅ Agent response received (length: {len(response)})")
-            
-            if len(response) > 0:
-                logger.info("🎉 Returning successful response")
-                return response
-            
-            logger.warning("⚠️ Empty response from agent")
-            return "I apologize, but I couldn't properly analyze your question. Could you please rephrase or provide more context?"
-            
+        response = str(result)
+        log_event(
+            logger, logging.INFO, "dsql_assistant.answer", sample=DEFAULT_LOG_SAMPLE_RATE,
+            response_chars=len(response), input_tokens=usage.get("inputTokens", 0),
+            output_tokens=usage.get("outputTokens", 0), cache_read_tokens=usage.get("cacheReadInputTokens", 0),
+            statements=len(plan.statements),
+        )
+        
+        if len(response) > 0:
+            if PLAN_CACHE_ENABLED and plan.replayable:
+                sql_plan_cache.put(query, fingerprint, plan.statements)
+            return response
+        
+        log_event(logger, logging.WARNING, "dsql_assistant.empty_response", query=query)
+        return "I apologize, but I couldn't properly analyze your question. Could you please rephrase or provide more context?"
+        
     except Exception as e:
-        logger.error(f"❌ Error in dsql_assistant: {str(e)}")
-        import traceback
-        logger.error(f"📋 Traceback: {traceback.format_exc()}")
+        # The traceback is formatted on the logging thread
+        logger.exception("dsql_assistant.failed")
         return f"Error processing your query: {str(e)}"
 
+
+
+def answer_from_plan(query: str) -> Optional[str]:
+    """
+    Answer a question by running the SQL cached for it. Blocking.
+
+    The statements run through the SQL proxy, so results come from the
+    result cache when possible and are capped and paged like any other.
+    The calling agent explains the results, so no SQL agent is created.
+
+    Args:
+        query: The user's SQL question
+
+    Returns:
+        The query results for the calling agent, or None if no plan is cached or it failed
+    """
+    with stage("sql_plan_cache") as span:
+        catalog = get_schema_catalog()
+        catalog.digest()  # Make sure the fingerprint reflects the current schema
+        statements = sql_plan_cache.get(query, catalog.fingerprint)
+        span.set_attribute("sql_plan_cache.hit", statements is not None)
+        if statements is None:
+            return None
+
+        log_event(logger, logging.INFO, "sql_plan_cache.replay", sample=DEFAULT_LOG_SAMPLE_RATE, statements=len(statements))
+        try:
+            tools = wrap_sql_tools(get_sql_backend().tools())
+            readonly_query = next(tool for tool in tools if tool.tool_name == READONLY_QUERY_TOOL)
+            results = execute_plan(statements, readonly_query)
+        except Exception as e:
+            log_event(logger, logging.WARNING, "sql_plan_cache.replay_failed", error=str(e))
+            sql_plan_cache.invalidate(statements)
+            return None
+
+    sections = [f"SQL: {sql}\nResult: {tool_result_text(result)}" for sql, result in results]
+    return (
+        "This question was answered before; its SQL was run again on the current data.\n\n"
+        + "\n\n".join(sections)
+    )
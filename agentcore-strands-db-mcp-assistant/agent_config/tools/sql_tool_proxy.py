@@ -0,0 +1,181 @@
+"""
+SQL Tool Proxy for DSQL Assistant
+
+This module wraps the MCP database tools handed to an agent so that SQL
+traffic passes through local processing before and after it reaches the
+Aurora DSQL MCP server: read-only queries are bounded by the query guard,
+their results are served from the result cache and capped before they
+reach the model, the SQL that answers a question is reported to the plan
+cache, and writes invalidate cached results and schema.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+from agent_config.query_guard import GUARD_ENABLED, REJECTED, QueryGuard, query_guard
+from agent_config.query_results import QueryResultHandler, query_result_handler
+from agent_config.schema_catalog import SchemaCatalog, get_schema_catalog
+from agent_config.sql_cache import QueryResultCache, query_result_cache
+from agent_config.sql_plan_cache import note_query, note_write
+from agent_config.sql_utils import (
+    is_ddl,
+    is_write,
+    referenced_tables,
+    rows_from_tool_result,
+    statements_from_input,
+    tool_result_text,
+)
+from agent_config.telemetry import record_sql_rows, stage, traced_iter
+from agent_config.tools.batch_query import BatchReadonlyQueryTool
+
+logger = logging.getLogger(__name__)
+
+# MCP tool names of the Aurora DSQL MCP server
+READONLY_QUERY_TOOL = "readonly_query"
+TRANSACT_TOOL = "transact"
+
+
+class SQLToolProxy(AgentTool):
+    """Agent tool delegating to an MCP database tool and observing its SQL"""
+
+    def __init__(
+        self,
+        tool: AgentTool,
+        catalog: Optional[SchemaCatalog] = None,
+        result_cache: Optional[QueryResultCache] = None,
+        result_handler: Optional[QueryResultHandler] = None,
+        guard: Optional[QueryGuard] = None,
+    ):
+        """
+        Initialize the proxy.
+
+        Args:
+            tool: The MCP tool to delegate to
+            catalog: Schema catalog notified of DDL, defaults to the process-wide catalog
+            result_cache: Cache for readonly_query results, defaults to the process-wide cache
+            result_handler: Caps readonly_query results for the model and pages them to the client
+            guard: Bounds the rows and cost of readonly_query calls, defaults to the
+                process-wide guard unless SQL_GUARD_ENABLED is false
+        """
+        super().__init__()
+        self._tool = tool
+        self._catalog = catalog or get_schema_catalog()
+        self._result_cache = result_cache or query_result_cache
+        self._result_handler = result_handler or query_result_handler
+        self._guard = guard or (query_guard if GUARD_ENABLED else None)
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool.tool_type
+
+    async def _delegate(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        async for event in self._tool.stream(tool_use, invocation_state, **kwargs):
+            yield event
+
+    async def stream(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        """Run the wrapped tool through the result cache, query guard, result caps and write tracking"""
+        tool_input = tool_use.get("input") or {}
+        if self.tool_name == READONLY_QUERY_TOOL and isinstance(tool_input.get("sql"), str):
+            async for event in self._readonly_query(tool_use, invocation_state, **kwargs):
+                yield event
+            return
+
+        statements = statements_from_input(tool_input)
+        if self.tool_name == TRANSACT_TOOL or any(is_write(sql) for sql in statements):
+            note_write()
+        async for event in self._delegate(tool_use, invocation_state, **kwargs):
+            yield event
+        self._note_writes(statements)
+
+    async def _explain(
+        self, tool_use: ToolUse, invocation_state: Dict[str, Any], sql: str, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Run a statement for the query guard through the wrapped tool and return its rows"""
+        explain_use = {"toolUseId": f"{tool_use['toolUseId']}-guard", "name": self.tool_name, "input": {"sql": sql}}
+        result = None
+        async for event in self._delegate(explain_use, invocation_state, **kwargs):
+            result = event
+        if not isinstance(result, dict) or result.get("status") == "error":
+            raise RuntimeError(tool_result_text(result) if isinstance(result, dict) else "no result")
+        return rows_from_tool_result(result)
+
+    async def _readonly_query(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        sql = tool_use["input"]["sql"]
+        attributes = {"tool.name": READONLY_QUERY_TOOL}
+        # Not current across yields: the span is made current only while this tool awaits work
+        with stage("sql.readonly_query", attributes, attributes, current=False) as span:
+            rows = None
+            cached = self._result_cache.get(sql)
+            span.set_attribute("sql.cache_hit", cached is not None)
+            if cached is not None:
+                logger.debug("Serving readonly_query from the result cache")
+                cached["toolUseId"] = tool_use["toolUseId"]
+                result = cached
+            else:
+                decision = None
+                if self._guard is not None:
+                    with span.activate():
+                        decision = await self._guard.check(
+                            sql, lambda statement: self._explain(tool_use, invocation_state, statement, **kwargs)
+                        )
+                    span.set_attribute("sql.guard", decision.action)
+                    if decision.sql != sql:
+                        tool_use = dict(tool_use, input=dict(tool_use["input"], sql=decision.sql))
+
+                if decision is not None and decision.action == REJECTED:
+                    result = {"toolUseId": tool_use["toolUseId"], "status": "error", "content": [{"text": decision.reason}]}
+                else:
+                    # Pass stream events through and hold back the final tool result
+                    result = None
+                    async for event in traced_iter(span, self._delegate(tool_use, invocation_state, **kwargs)):
+                        if result is not None:
+                            yield result
+                        result = event
+                    if isinstance(result, dict) and result.get("status") != "error":
+                        rows = rows_from_tool_result(result)
+                        note = self._guard.limit_note(decision, len(rows)) if decision is not None else None
+                        if note:
+                            result = dict(result, content=result.get("content", []) + [{"text": note}])
+                        self._result_cache.put(sql, result)
+            succeeded = isinstance(result, dict) and result.get("status") != "error"
+            note_query(sql, succeeded)
+            if succeeded:
+                if rows is None:
+                    rows = rows_from_tool_result(result)
+                span.set_attribute("db.rows", len(rows))
+                record_sql_rows(len(rows), attributes)
+                with span.activate():
+                    result = await self._result_handler.handle(tool_use["input"]["sql"], result, rows)
+            if result is not None:
+                yield result
+
+    def _note_writes(self, statements: List[str]) -> None:
+        """Invalidate cached results and schema affected by write statements"""
+        for sql in statements:
+            self._catalog.note_statement(sql)
+            if not is_write(sql):
+                continue
+            tables = referenced_tables(sql)
+            if is_ddl(sql) or not tables:
+                self._result_cache.clear()
+            else:
+                self._result_cache.invalidate_tables(tables)
+
+
+def wrap_sql_tools(tools: List[AgentTool]) -> List[AgentTool]:
+    """Wrap MCP database tools with SQLToolProxy and add batch_readonly_query"""
+    wrapped = [SQLToolProxy(tool) for tool in tools]
+    readonly_query = next((tool for tool in wrapped if tool.tool_name == READONLY_QUERY_TOOL), None)
+    if readonly_query is not None:
+        wrapped.append(BatchReadonlyQueryTool(readonly_query))
+    return wrapped
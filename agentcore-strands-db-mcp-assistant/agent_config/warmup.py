@@ -0,0 +1,160 @@
+"""
+Startup Warm-up for DSQL Assistant
+
+This module prepares the runtime container before its first invocation:
+the agent modules are imported, configuration is preloaded, model and
+memory clients are built, the SQL backend (MCP server sessions or direct
+database connections) is started, and the schema catalog is loaded. The
+stages run on a background thread, are timed individually, and the
+container reports itself busy until they finish.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Warm-up settings (overridable through the environment)
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "true").lower() == "true"
+DEFAULT_WARMUP_MAX_SECONDS = float(os.environ.get("WARMUP_MAX_SECONDS", "120"))
+
+WarmupStage = Tuple[str, Callable[[], Any]]
+
+
+class Warmup:
+    """
+    Ordered warm-up stages run once on a background thread.
+
+    A failing stage is logged and skipped; the work it would have done
+    happens lazily on the first request instead. Readiness is reported
+    once every stage has run, or after max_seconds so a hung stage cannot
+    keep the container out of service.
+    """
+
+    def __init__(self, stages: List[WarmupStage], max_seconds: float = DEFAULT_WARMUP_MAX_SECONDS):
+        """
+        Initialize the warm-up.
+
+        Args:
+            stages: (name, callable) pairs run in order
+            max_seconds: Seconds after start at which the container is reported ready regardless
+        """
+        self.stages = list(stages)
+        self.max_seconds = max_seconds
+        self._done = threading.Event()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._timings: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Run the stages on a background thread; later calls do nothing"""
+        with self._lock:
+            if self._started_at is not None:
+                return
+            self._started_at = time.monotonic()
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the stages on the calling thread.
+
+        Returns:
+            dict: The warm-up report
+        """
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+        self._run()
+        return self.report()
+
+    def _run(self) -> None:
+        try:
+            for name, stage in self.stages:
+                started = time.perf_counter()
+                try:
+                    stage()
+                except Exception as e:
+                    logger.warning(f"Warm-up stage {name} failed, continuing: {e}")
+                    self._errors[name] = str(e)
+                self._timings[name] = (time.perf_counter() - started) * 1000
+                logger.info(f"Warm-up stage {name} took {self._timings[name]:.0f} ms")
+        finally:
+            self._finished_at = time.monotonic()
+            self._done.set()
+        report = self.report()
+        logger.info(f"Warm-up finished in {report['total_ms']:.0f} ms: {report['stages']}")
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished, timed out or was never started"""
+        if self._started_at is None or self._done.is_set():
+            return True
+        return time.monotonic() - self._started_at > self.max_seconds
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes; returns False on timeout"""
+        return self._done.wait(timeout)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-stage timings in milliseconds, errors and overall state"""
+        end = self._finished_at or time.monotonic()
+        return {
+            "ready": self.ready,
+            "finished": self._done.is_set(),
+            "total_ms": (end - self._started_at) * 1000 if self._started_at is not None else 0.0,
+            "stages": {name: round(ms, 1) for name, ms in self._timings.items()},
+            "errors": dict(self._errors),
+        }
+
+
+def _import_agent_modules() -> None:
+    # app.py imports the agent (strands, the tools, the MCP client) on first use
+    import agent_config.agent_task  # noqa: F401
+
+
+def _preload_config() -> None:
+    from scripts.utils import get_parameter_cache
+
+    get_parameter_cache().refresh()
+
+
+def _build_model_clients() -> None:
+    from agent_config.agent import DEFAULT_MODEL_ID
+    from agent_config.agent_task import get_memory_client
+    from agent_config.model_clients import get_bedrock_model
+    from agent_config.tools.dsql_mcp_assistant import SQL_AGENT_MODEL_ID
+
+    # Build the shared clients the first requests will use
+    get_bedrock_model(DEFAULT_MODEL_ID)
+    get_bedrock_model(SQL_AGENT_MODEL_ID)
+    get_memory_client()
+
+
+def _start_sql_backend() -> None:
+    from agent_config.dsql_pool import get_sql_backend
+
+    backend = get_sql_backend()
+    backend.warm()
+    backend.tool_specs()
+
+
+def _load_schema() -> None:
+    from agent_config.schema_catalog import get_schema_catalog
+
+    get_schema_catalog().refresh()
+
+
+def default_warmup_stages() -> List[WarmupStage]:
+    """The container's warm-up stages, in dependency order"""
+    return [
+        ("imports", _import_agent_modules),
+        ("config", _preload_config),
+        ("model_clients", _build_model_clients),
+        ("sql_backend", _start_sql_backend),
+        ("schema", _load_schema),
+    ]
@@ -1,8 +1,10 @@
 from agent_config.context import DSQLAssistantContext
-from agent_config.agent_task import agent_task
 from agent_config.streaming_queue import StreamingQueue
+from agent_config.structured_logging import DEFAULT_LOG_SAMPLE_RATE, configure_logging, log_event
+from agent_config.telemetry import stage
+from agent_config.warmup import WARMUP_ENABLED, Warmup, default_warmup_stages
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from scripts.utils import get_ssm_parameter
+from bedrock_agentcore.runtime.models import PingStatus
 import asyncio
 import logging
 import os
@@ -11,17 +13,50 @@ import os
 os.environ["STRANDS_OTEL_ENABLE_CONSOLE_EXPORT"] = "true"
 os.environ["STRANDS_TOOL_CONSOLE_MODE"] = "enabled"
 
-# Logging setup
-logging.basicConfig(level=logging.INFO)
+# Logging setup: records are formatted and written on a background thread
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Bedrock app and global agent instance
 app = BedrockAgentCoreApp()
 
+# Startup warm-up (agent modules, config, model clients, SQL backend, schema)
+warmup = Warmup(default_warmup_stages())
+
+def load_agent_task():
+    """
+    Import the agent task on first use.
+
+    The agent modules (strands, the tools, the MCP client) take seconds to
+    import, so the runtime server starts without them; the warm-up imports
+    them in the background before the first request needs them.
+    """
+    from agent_config.agent_task import agent_task
+
+    return agent_task
+
+@app.ping
+def ping():
+    """Report busy until warm-up finishes, then defer to the automatic status"""
+    if not warmup.ready:
+        return PingStatus.HEALTHY_BUSY
+    return None
+
 @app.entrypoint
 async def invoke(payload, context):
-    if not DSQLAssistantContext.get_response_queue_ctx():
-        DSQLAssistantContext.set_response_queue_ctx(StreamingQueue())
+    """
+    Stream the agent response to the runtime while it is being generated.
+
+    The agent task runs concurrently with this generator; every chunk it puts
+    on the response queue is yielded immediately, and the queue's end marker
+    (sent by agent_task on completion or error) ends the stream.
+    """
+    # A fresh queue per invocation, so a finished queue from an earlier
+    # request in the same context is never reused
+    response_queue = StreamingQueue()
+    DSQLAssistantContext.set_response_queue_ctx(response_queue)
+    # Query result frames are only sent to clients that ask for them
+    DSQLAssistantContext.set_result_format_ctx(payload.get("result_format"))
     
     user_message = payload["prompt"]
     actor_id = payload.get("actor_id", "guest")
@@ -30,22 +65,48 @@ async def invoke(payload, context):
     if not session_id:
         raise Exception("Context session_id is not set")
     
-    task = asyncio.create_task(
-        agent_task(
-            user_message=user_message,
-            session_id=session_id,
-            actor_id=actor_id,
-        )
-    )
-    
-    response_queue = DSQLAssistantContext.get_response_queue_ctx()
-    
-    async def stream_output():
-        async for item in response_queue.stream():
-            yield item
-    
-    await task  # Ensure task completion
-    return stream_output()
+    # Not current across yields; the agent task copies the context with the span current
+    with stage("invoke", {"session.id": session_id, "actor.id": actor_id}, current=False) as span:
+        agent_task = load_agent_task()
+        with span.activate():
+            task = asyncio.create_task(
+                agent_task(
+                    user_message=user_message,
+                    session_id=session_id,
+                    actor_id=actor_id,
+                )
+            )
+
+        try:
+            async for item in response_queue.stream():
+                yield item
+            await task  # Surface failures that escaped agent_task's own handling
+        finally:
+            if not task.done():
+                # The client went away before the response completed
+                log_event(logger, logging.INFO, "invoke.cancelled", session_id=session_id)
+                response_queue.close()
+                task.cancel()
+                span.set_attribute("stream.cancelled", True)
+            stream_metrics = response_queue.metrics()
+            span.set_attribute("stream.frames", stream_metrics["frames_emitted"])
+            log_event(logger, logging.INFO, "invoke.stream", sample=DEFAULT_LOG_SAMPLE_RATE, **stream_metrics)
+
+def check_sql_backend():
+    """
+    Fail at startup, rather than on the first question, if the configured
+    SQL backend cannot run. The direct backend's module is imported only
+    when that backend is configured.
+    """
+    if os.environ.get("SQL_BACKEND", "mcp").lower() != "direct":
+        return
+    from agent_config.dsql_pool import DIRECT_BACKEND_UNAVAILABLE, asyncpg_available
+
+    if not asyncpg_available():
+        raise RuntimeError(DIRECT_BACKEND_UNAVAILABLE)
 
 if __name__ == "__main__":
+    check_sql_backend()
+    if WARMUP_ENABLED:
+        warmup.start()
     app.run()
\ No newline at end of file
@@ -2,11 +2,18 @@
 Utility functions for DSQL Assistant
 
 This module provides utility functions including SSM parameter retrieval.
+Parameters under the project prefix are loaded with a single
+GetParametersByPath call and cached process-wide with a TTL.
 """
 
-import boto3
+import logging
 import os
-from botocore.exceptions import ClientError
+import threading
+import time
+from botocore.exceptions import BotoCoreError, ClientError
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Project ID for SSM parameter path prefix
 PROJECT_ID = "agentcore-db-mcp-assistant"
@@ -14,50 +21,251 @@ PROJECT_ID = "agentcore-db-mcp-assistant"
 # Default AWS region
 DEFAULT_REGION = "us-east-1"
 
+# Seconds a cached parameter is considered fresh
+SSM_CACHE_TTL_SECONDS = float(os.environ.get("SSM_CACHE_TTL_SECONDS", "300"))
+
+# Seconds past expiry during which a stale value is still served while refreshing
+SSM_CACHE_MAX_STALE_SECONDS = float(os.environ.get("SSM_CACHE_MAX_STALE_SECONDS", "3600"))
+
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException", "RequestLimitExceeded"}
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
 def get_ssm_client(region_name=None):
     """
-    Creates and returns an SSM client.
-    
+    Returns the shared SSM client for a region, creating it on first use.
+
     Args:
         region_name: AWS region where the SSM parameters are stored
-        
+
     Returns:
         boto3.client: SSM client
     """
     if not region_name:
         region_name = os.environ.get("AWS_REGION", DEFAULT_REGION)
-        
-    session = boto3.session.Session()
-    return session.client(service_name="ssm", region_name=region_name)
+
+    client = _clients.get(region_name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(region_name)
+            if client is None:
+                import boto3  # Loaded on first use, boto3 is slow to import
+
+                session = boto3.session.Session()
+                client = session.client(service_name="ssm", region_name=region_name)
+                _clients[region_name] = client
+    return client
+
+
+class SSMParameterCache:
+    """
+    Process-wide cache of SSM parameters.
+
+    All parameters below ``path`` are fetched together with GetParametersByPath.
+    Expired entries are served while a background refresh runs, and stale
+    values are kept if SSM throttles or fails the refresh. Synchronous loads
+    are single-flight, and parameters that do not exist are remembered for
+    the TTL so repeated lookups do not reload the path.
+    """
+
+    def __init__(
+        self,
+        path: str = f"/{PROJECT_ID}/",
+        region_name: Optional[str] = None,
+        ttl_seconds: float = SSM_CACHE_TTL_SECONDS,
+        max_stale_seconds: float = SSM_CACHE_MAX_STALE_SECONDS,
+        client=None,
+    ):
+        """
+        Initialize the parameter cache.
+
+        Args:
+            path: Parameter path prefix loaded in one batch
+            region_name: AWS region where the parameters are stored
+            ttl_seconds: Seconds a loaded value is considered fresh
+            max_stale_seconds: Seconds past expiry a value may still be served
+            client: Optional SSM client, defaults to the shared client for the region
+        """
+        self.path = path if path.endswith("/") else f"{path}/"
+        self.region_name = region_name
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._client = client
+        self._values: Dict[str, Tuple[str, float]] = {}
+        self._missing: Dict[str, Tuple[ClientError, float]] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # One synchronous load at a time
+        self._refreshing = False
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_ssm_client(self.region_name)
+        return self._client
+
+    def _fetch_path(self) -> Dict[str, str]:
+        """Fetch every parameter under the path, following pagination"""
+        paginator = self.client.get_paginator("get_parameters_by_path")
+        values = {}
+        for page in paginator.paginate(Path=self.path, Recursive=True, WithDecryption=True):
+            for parameter in page.get("Parameters", []):
+                values[parameter["Name"]] = parameter["Value"]
+        return values
+
+    def _fetch_one(self, name: str) -> str:
+        response = self.client.get_parameter(Name=name, WithDecryption=True)
+        return response["Parameter"]["Value"]
+
+    def refresh(self) -> Dict[str, str]:
+        """
+        Reload all parameters under the path.
+
+        Returns:
+            dict: The freshly loaded parameter values by full name
+        """
+        values = self._fetch_path()
+        now = time.monotonic()
+        with self._lock:
+            for name, value in values.items():
+                self._values[name] = (value, now)
+        logger.info(f"Loaded {len(values)} SSM parameters under {self.path}")
+        return values
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except (ClientError, BotoCoreError) as e:
+                logger.warning(f"Background SSM refresh failed, keeping cached values: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="ssm-parameter-refresh", daemon=True).start()
+
+    def _load(self, name: str) -> str:
+        with self._load_lock:
+            # Concurrent callers wait for the first load instead of repeating it
+            with self._lock:
+                cached = self._values.get(name)
+                missing = self._missing.get(name)
+            if cached is not None and time.monotonic() - cached[1] < self.ttl_seconds:
+                return cached[0]
+            if missing is not None and time.monotonic() - missing[1] < self.ttl_seconds:
+                raise missing[0]
+
+            if name.startswith(self.path):
+                self.refresh()
+                with self._lock:
+                    if name in self._values:
+                        return self._values[name][0]
+            try:
+                value = self._fetch_one(name)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ParameterNotFound":
+                    with self._lock:
+                        self._missing[name] = (e, time.monotonic())
+                raise
+            with self._lock:
+                self._values[name] = (value, time.monotonic())
+                self._missing.pop(name, None)
+            return value
+
+    def get(self, name: str) -> str:
+        """
+        Get a parameter value, loading or refreshing the cache as needed.
+
+        Args:
+            name: Full parameter name
+
+        Returns:
+            str: The parameter value
+
+        Raises:
+            ClientError: If the parameter cannot be loaded and no cached value exists
+        """
+        with self._lock:
+            cached = self._values.get(name)
+            missing = self._missing.get(name)
+
+        if cached is None and missing is not None and time.monotonic() - missing[1] < self.ttl_seconds:
+            raise missing[0]
+        if cached is not None:
+            value, fetched_at = cached
+            age = time.monotonic() - fetched_at
+            if age < self.ttl_seconds:
+                return value
+            if age < self.ttl_seconds + self.max_stale_seconds:
+                if name.startswith(self.path):
+                    self._refresh_in_background()
+                    return value
+
+        try:
+            return self._load(name)
+        except (ClientError, BotoCoreError) as e:
+            if cached is not None:
+                code = e.response.get("Error", {}).get("Code") if isinstance(e, ClientError) else None
+                reason = "throttled" if code in THROTTLING_ERROR_CODES else "failed"
+                logger.warning(f"SSM {reason} while loading {name}, serving cached value: {e}")
+                return cached[0]
+            raise
+
+    def invalidate(self) -> None:
+        """Drop all cached values and remembered misses"""
+        with self._lock:
+            self._values.clear()
+            self._missing.clear()
+
+
+_caches: Dict[str, SSMParameterCache] = {}
+
+def get_parameter_cache(region_name=None) -> SSMParameterCache:
+    """
+    Returns the process-wide parameter cache for a region.
+
+    Args:
+        region_name: AWS region where the SSM parameters are stored
+
+    Returns:
+        SSMParameterCache: The shared cache
+    """
+    if not region_name:
+        region_name = os.environ.get("AWS_REGION", DEFAULT_REGION)
+
+    cache = _caches.get(region_name)
+    if cache is None:
+        with _clients_lock:
+            cache = _caches.setdefault(region_name, SSMParameterCache(region_name=region_name))
+    return cache
 
 def get_ssm_parameter(param_name, region_name=None):
     """
     Retrieves a parameter from AWS Systems Manager Parameter Store.
-    
+
     Args:
         param_name: Full parameter name (with or without leading slash)
         region_name: AWS region where the parameter is stored
-        
+
     Returns:
         str: The parameter value
-        
+
     Raises:
         ClientError: If there's an error retrieving the parameter
     """
-    client = get_ssm_client(region_name)
-    
     # Handle both full paths and short names
     if param_name.startswith('/'):
         full_param_name = param_name
     else:
         full_param_name = f"/{PROJECT_ID}/{param_name}"
-    
+
     try:
-        response = client.get_parameter(
-            Name=full_param_name,
-            WithDecryption=True
-        )
-        return response['Parameter']['Value']
+        return get_parameter_cache(region_name).get(full_param_name)
     except ClientError as e:
-        print(f"Error retrieving SSM parameter {full_param_name}: {e}")
-        raise
\ No newline at end of file
+        logger.error(f"Error retrieving SSM parameter {full_param_name}: {e}")
+        raise
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch_readonly_query against consecutive readonly_query calls
+
+Runs a set of independent read-only queries (per-table counts, as in
+testing-data/useful_queries.sql, and revenue and review scores per
+category) once as consecutive readonly_query calls, the way the agent
+loop issues them, and once as a single batch_readonly_query call, over
+pooled sessions of the stdio MCP server stand-in with --latency-ms added
+to every call. The result and plan caches are bypassed, so every query
+reaches the server.
+
+Usage:
+    python3 benchmarks/bench_batch_query.py --latency-ms 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.mcp_session_pool import MCPSessionPool
+from agent_config.sql_cache import QueryResultCache
+from agent_config.tools.batch_query import BATCH_QUERY_TOOL, BatchReadonlyQueryTool
+from agent_config.tools.sql_tool_proxy import READONLY_QUERY_TOOL, SQLToolProxy, wrap_sql_tools
+from fakes import stdio_mcp_client
+
+QUERIES = [
+    "SELECT COUNT(*) AS record_count FROM customers",
+    "SELECT COUNT(*) AS record_count FROM categories",
+    "SELECT COUNT(*) AS record_count FROM products",
+    "SELECT COUNT(*) AS record_count FROM orders",
+    "SELECT COUNT(*) AS record_count FROM order_items",
+    "SELECT COUNT(*) AS record_count FROM reviews",
+    "SELECT c.category_name, SUM(oi.total_price) AS revenue FROM order_items oi "
+    "JOIN products p ON p.product_id = oi.product_id JOIN categories c ON c.category_id = p.category_id "
+    "GROUP BY c.category_name",
+    "SELECT c.category_name, AVG(r.rating) AS avg_rating FROM reviews r "
+    "JOIN products p ON p.product_id = r.product_id JOIN categories c ON c.category_id = p.category_id "
+    "GROUP BY c.category_name",
+]
+
+
+class _NoCache(QueryResultCache):
+    def get(self, sql):
+        return None
+
+    def put(self, sql, result):
+        return False
+
+
+async def consecutive(readonly_query):
+    for index, sql in enumerate(QUERIES):
+        async for _ in readonly_query.stream({"toolUseId": f"q{index}", "name": READONLY_QUERY_TOOL, "input": {"sql": sql}}, {}):
+            pass
+
+
+async def batched(batch_query):
+    result = None
+    async for event in batch_query.stream({"toolUseId": "batch", "name": BATCH_QUERY_TOOL, "input": {"queries": QUERIES}}, {}):
+        result = event
+    if result["status"] != "success":
+        raise RuntimeError(f"Batch failed: {result['content']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency the MCP server adds to every call")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed runs of each variant")
+    parser.add_argument("--pool-size", type=int, default=4, help="MCP sessions in the pool")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    pool = MCPSessionPool(lambda: stdio_mcp_client(args.latency_ms), max_size=args.pool_size, min_size=args.pool_size)
+    started = time.perf_counter()
+    pool.warm()
+    setup_ms = (time.perf_counter() - started) * 1000
+
+    tools = {tool.tool_name: tool for tool in wrap_sql_tools(pool.tools())}
+    readonly_query = SQLToolProxy(tools[READONLY_QUERY_TOOL]._tool, result_cache=_NoCache())
+    batch_query = BatchReadonlyQueryTool(readonly_query, max_concurrency=args.pool_size)
+
+    timings = {"consecutive": [], "batch": []}
+    for _ in range(args.rounds):
+        for name, run in (("consecutive", consecutive(readonly_query)), ("batch", batched(batch_query))):
+            started = time.perf_counter()
+            asyncio.run(run)
+            timings[name].append(time.perf_counter() - started)
+    pool.close()
+
+    print(f"{len(QUERIES)} queries, MCP latency {args.latency_ms:.0f} ms, {args.pool_size} pooled sessions "
+          f"(warmed in {setup_ms:.0f} ms)")
+    for name, values in timings.items():
+        print(f"{name:<12} median {statistics.median(values) * 1000:>7.0f} ms   min {min(values) * 1000:>7.0f} ms")
+    print(f"batch speedup: {statistics.median(timings['consecutive']) / statistics.median(timings['batch']):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
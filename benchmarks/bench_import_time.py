@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark import time and cold start of the runtime entrypoint
+
+Imports app.py in fresh interpreters under `python -X importtime` and
+reports the median import time, the heaviest modules it imports and the
+self time per top-level package. The cold start adds what the warm-up's
+imports stage loads before the first request (agent_config.agent_task:
+strands, the agent and its tools), and the wall time of the whole process
+including interpreter startup.
+
+Usage:
+    python3 benchmarks/bench_import_time.py --runs 5 --top 15
+"""
+
+import argparse
+import collections
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+
+
+def import_times(statement):
+    """
+    Run a statement in a fresh interpreter under -X importtime.
+
+    Returns:
+        tuple: (process wall seconds, [(depth, module, self us, cumulative us)])
+    """
+    env = dict(os.environ, AWS_EC2_METADATA_DISABLED="true")
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=agentcore_path, env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return wall, modules
+
+
+def summarize(runs, root):
+    totals = [sum(self_us for _, _, self_us, _ in modules) / 1000 for _, modules in runs]
+    walls = [wall * 1000 for wall, _ in runs]
+    cumulative = collections.defaultdict(list)
+    packages = collections.defaultdict(list)
+    for _, modules in runs:
+        per_package = collections.Counter()
+        children = []  # importtime lists a module's imports before the module itself
+        for depth, name, self_us, cumulative_us in modules:
+            if depth == 1:
+                children.append((name, cumulative_us))
+            elif depth == 0:
+                if name == root:
+                    for child, child_us in children:
+                        cumulative[child].append(child_us / 1000)
+                children = []
+            per_package[name.split(".")[0]] += self_us / 1000
+        for package, ms in per_package.items():
+            packages[package].append(ms)
+    return statistics.median(totals), statistics.median(walls), cumulative, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Modules and packages to list")
+    args = parser.parse_args()
+
+    app_runs = [import_times("import app") for _ in range(args.runs)]
+    cold_runs = [import_times("import app, agent_config.agent_task") for _ in range(args.runs)]
+
+    app_ms, app_wall, cumulative, packages = summarize(app_runs, "app")
+    cold_ms, cold_wall, _, _ = summarize(cold_runs, "app")
+
+    print(f"import app: {app_ms:.0f} ms imports, {app_wall:.0f} ms process wall time (median of {args.runs})")
+    print(f"cold start (app + agent modules): {cold_ms:.0f} ms imports, {cold_wall:.0f} ms process wall time")
+    print("\nHeaviest modules imported directly by app (cumulative ms):")
+    ranked = sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in ranked[:args.top]:
+        print(f"  {statistics.median(values):>8.1f}  {name}")
+    print("\nSelf time per top-level package (ms):")
+    ranked = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in ranked[:args.top]:
+        print(f"  {statistics.median(values):>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the logging cost on the request path
+
+Replays the log calls one answered question makes, several threads at a
+time as under load, once the way the agent logged before structured
+logging (logging.basicConfig at DEBUG, f-string messages with the full
+question and response, formatted and written on the calling thread) and
+once through configure_logging (queue handler, structured fields, payload
+hashing, sampled high-volume events, library loggers at WARNING). Reports
+the CPU time the calling threads spend in logging per question and the
+bytes written. Output goes to a temporary file.
+
+Usage:
+    python3 benchmarks/bench_logging.py --questions 2000 --threads 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.structured_logging import DEFAULT_LOG_SAMPLE_RATE, configure_logging, log_event, stop_logging
+
+QUESTION = "Which customers placed more than five orders last quarter, and what was their total spend per region? " * 3
+RESPONSE = "| customer | region | orders | total |\n" + "| Acme Corp | us-east | 12 | 48,210.00 |\n" * 200
+SQL = "SELECT c.name, c.region, count(*), sum(o.total) FROM customers c JOIN orders o ON o.customer_id = c.id GROUP BY 1, 2 LIMIT 10000"
+
+assistant = logging.getLogger("agent_config.tools.dsql_mcp_assistant")
+guard = logging.getLogger("agent_config.query_guard")
+library = logging.getLogger("botocore.endpoint")
+
+
+def unstructured_question():
+    """The log calls of one question before structured logging"""
+    assistant.info(f"🔍 DSQL Assistant called with query: {QUESTION}")
+    assistant.info("🔌 Getting pooled database tools...")
+    assistant.info(f"✅ Retrieved 4 tools (pool: {{'sessions': 2, 'idle': 1, 'borrowed': 17}})")
+    assistant.info("🤖 Creating DSQL agent...")
+    assistant.info("✅ DSQL agent created successfully")
+    assistant.info("⚡ Processing query with agent...")
+    guard.info(f"Query guard limit_added: {SQL[:200]}")
+    for _ in range(6):  # Library debug output while the root logger was at DEBUG
+        library.debug(f"Sending http request: <AWSPreparedRequest stream_output=True, method=POST, body={QUESTION}>")
+    assistant.info(f"✅ Agent response received (length: {len(RESPONSE)})")
+    assistant.info("🎉 Returning successful response")
+    assistant.info(f"Stream metrics: {{'frames_emitted': 48, 'frames_coalesced': 310, 'bytes': {len(RESPONSE)}}}")
+
+
+def structured_question():
+    """The log calls of one question with structured logging"""
+    log_event(assistant, logging.INFO, "dsql_assistant.question", query=QUESTION)
+    log_event(assistant, logging.DEBUG, "dsql_assistant.tools", tools=4)
+    log_event(guard, logging.INFO, "query_guard.decision", sample=DEFAULT_LOG_SAMPLE_RATE, action="limit_added", sql=SQL)
+    for _ in range(6):
+        library.debug(f"Sending http request: <AWSPreparedRequest stream_output=True, method=POST, body={QUESTION}>")
+    log_event(assistant, logging.INFO, "dsql_assistant.answer", sample=DEFAULT_LOG_SAMPLE_RATE, response_chars=len(RESPONSE))
+    log_event(assistant, logging.INFO, "invoke.stream", sample=DEFAULT_LOG_SAMPLE_RATE, frames_emitted=48, bytes=len(RESPONSE))
+
+
+def run(question, questions, threads):
+    """CPU seconds the calling threads spend logging"""
+    cpu = []
+    lock = threading.Lock()
+
+    def worker():
+        started = time.thread_time()
+        for _ in range(questions // threads):
+            question()
+        with lock:
+            cpu.append(time.thread_time() - started)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(cpu)
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=2000, help="Questions to replay the log calls of")
+    parser.add_argument("--threads", type=int, default=8, help="Threads logging at once")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "before.log")
+        logging.basicConfig(level=logging.DEBUG, filename=path)
+        cpu = run(unstructured_question, args.questions, args.threads)
+        results["f-strings, sync"] = (cpu, os.path.getsize(path))
+        reset_root()
+
+        path = os.path.join(directory, "after.log")
+        with open(path, "w") as output:
+            configure_logging(level="INFO", stream=output)
+            cpu = run(structured_question, args.questions, args.threads)
+            stop_logging()  # Waits for the listener to write everything
+        results["structured, queue"] = (cpu, os.path.getsize(path))
+
+    print(f"{args.questions} questions on {args.threads} threads")
+    for name, (cpu, size) in results.items():
+        print(f"{name:<18} caller CPU {cpu / args.questions * 1e6:>8.1f} us/question   written {size / 1024:>9.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
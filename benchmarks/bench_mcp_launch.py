@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark launching the Aurora DSQL MCP server
+
+Spawns the MCP server the way the session pool does (the pinned, locally
+installed release resolved by dsql_mcp_server_command), completes the MCP
+handshake and lists the tools, then stops it. Every spawn runs with
+package-index access cut off (HTTPS proxied to a closed port, uv and pip
+forced offline), so a launch that tried to resolve or download a package
+would fail or stall. Reports spawn time percentiles and exits non-zero if
+any spawn fails or exceeds --max-seconds.
+
+No AWS credentials are needed: the server only connects to the cluster
+when a database tool is called.
+
+Usage:
+    python3 benchmarks/bench_mcp_launch.py --spawns 5 --max-seconds 15
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from mcp import StdioServerParameters, stdio_client
+from strands.tools.mcp import MCPClient
+
+from agent_config.mcp_session_pool import DSQL_MCP_SERVER_VERSION, dsql_mcp_server_command
+
+# Environment that makes any package index or download attempt fail fast.
+# Only HTTPS is proxied: package indexes are HTTPS-only, while plain HTTP
+# is left alone for the instance metadata credential lookup.
+OFFLINE_ENV = {
+    "HTTPS_PROXY": "https://127.0.0.1:9",
+    "https_proxy": "https://127.0.0.1:9",
+    "UV_OFFLINE": "1",
+    "PIP_NO_INDEX": "1",
+}
+
+
+def spawn_once(command, args, env, timeout):
+    client = MCPClient(
+        lambda: stdio_client(StdioServerParameters(command=command, args=args, env=env)),
+        startup_timeout=int(timeout),
+    )
+    started = time.perf_counter()
+    client.start()
+    try:
+        tools = client.list_tools_sync()
+        elapsed = time.perf_counter() - started
+    finally:
+        client.stop(None, None, None)
+    return elapsed, [tool.tool_name for tool in tools]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spawns", type=int, default=5, help="Number of sequential server launches")
+    parser.add_argument("--max-seconds", type=float, default=15, help="Upper bound for a single launch")
+    parser.add_argument("--cluster-endpoint", default="example.dsql.us-east-1.on.aws")
+    parser.add_argument("--region", default="us-east-1")
+    args = parser.parse_args()
+
+    command, command_args = dsql_mcp_server_command()
+    command_args = command_args + [
+        "--cluster_endpoint", args.cluster_endpoint,
+        "--database_user", "admin",
+        "--region", args.region,
+    ]
+    env = dict(os.environ, **OFFLINE_ENV)
+    print(f"Pinned release {DSQL_MCP_SERVER_VERSION}, launching: {command} {' '.join(command_args)}")
+
+    timings = []
+    failures = 0
+    tool_names = []
+    for index in range(args.spawns):
+        try:
+            elapsed, tool_names = spawn_once(command, command_args, env, args.max_seconds)
+            timings.append(elapsed)
+            print(f"  spawn {index + 1}: {elapsed * 1000:.0f} ms")
+        except Exception as e:
+            failures += 1
+            print(f"  spawn {index + 1}: FAILED ({type(e).__name__}: {e})")
+
+    if timings:
+        print(f"tools: {', '.join(tool_names)}")
+        print(f"spawn ms: min {min(timings) * 1000:.0f}, median {statistics.median(timings) * 1000:.0f}, "
+              f"max {max(timings) * 1000:.0f} (bound {args.max_seconds * 1000:.0f})")
+    over = [t for t in timings if t > args.max_seconds]
+    if failures or over or not timings:
+        print(f"FAIL: {failures} failed, {len(over)} over the bound")
+        sys.exit(1)
+    print("OK: every launch completed offline within the bound")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark shared Bedrock model clients against per-question construction
+
+Builds the models one question needs (the assistant's and the SQL
+agent's) the way the agents did before the model client registry, a new
+BedrockModel per question, and through the registry. Reports the time per
+question and how many bedrock-runtime clients, each with its own HTTPS
+connection pool (and TLS handshakes on first use), were created. No
+request is sent; clients are created with placeholder credentials.
+
+Usage:
+    python3 benchmarks/bench_model_clients.py --questions 50
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+# Boto3 clients must not probe the instance metadata service or need real credentials
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+
+from strands.models import BedrockModel
+
+from agent_config.agent import DEFAULT_MODEL_ID
+from agent_config.model_clients import ModelClientRegistry
+from agent_config.tools.dsql_mcp_assistant import SQL_AGENT_MODEL_ID
+
+
+def time_questions(get_model, questions):
+    latencies = []
+    clients = set()
+    for _ in range(questions):
+        started = time.perf_counter()
+        models = [get_model(DEFAULT_MODEL_ID), get_model(SQL_AGENT_MODEL_ID)]
+        latencies.append(time.perf_counter() - started)
+        clients.update(id(model.client) for model in models)
+    return latencies, len(clients)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=50, help="Questions to build models for")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    kept = []  # Keep per-question models alive so their clients are counted separately
+
+    def per_question(model_id):
+        kept.append(BedrockModel(model_id=model_id))
+        return kept[-1]
+
+    registry = ModelClientRegistry()
+    results = {
+        "per question": time_questions(per_question, args.questions),
+        "registry": time_questions(registry.get, args.questions),
+    }
+
+    print(f"{args.questions} questions, 2 models each")
+    for name, (latencies, clients) in results.items():
+        print(f"{name:<13} mean {statistics.mean(latencies) * 1000:>8.2f} ms   "
+              f"first {latencies[0] * 1000:>8.2f} ms   clients created {clients}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the request pipeline
+
+Runs each layer of the request path against deterministic local fakes
+(scripted model, stdio MCP server over testing-data, in-memory memory
+client) and reports, per stage:
+
+- latency: p50 / p95 / max of sequential requests
+- throughput: requests per second with --concurrency requests in flight
+- allocations: tracemalloc peak and retained memory per request
+
+Stages, innermost first:
+    memory_hook       MemoryHook history load, prompt injection and message save
+    dsql_assistant    the dsql_assistant tool (SQL sub-agent over pooled MCP sessions)
+    assistant_stream  DSQLAssistant.stream for a new agent
+    agent_task        agent_task feeding the response StreamingQueue
+    app_invoke        app.invoke, the runtime entrypoint
+
+No AWS credentials or network access are needed. As in production,
+repeated questions are answered from the SQL plan and result caches after
+the first request of a stage.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py --requests 20 --concurrency 8
+    python3 benchmarks/bench_pipeline.py --stages memory_hook app_invoke --token-ms 0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+# Boto3 clients built at import time must not probe the instance metadata service
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+
+import app
+from agent_config.agent import DSQLAssistant
+from agent_config.agent_task import agent_task
+from agent_config.context import DSQLAssistantContext
+from agent_config.history_cache import SessionHistoryCache
+from agent_config.mcp_session_pool import get_mcp_session_pool
+from agent_config.memory_hook_provider import MemoryHook
+from agent_config.memory_writer import get_memory_writer
+from agent_config.schema_catalog import get_schema_catalog
+from agent_config.streaming_queue import StreamingQueue
+from agent_config.tools.dsql_mcp_assistant import dsql_assistant
+from fakes import DEFAULT_QUESTIONS, InMemoryMemoryClient, ModelLedger, ScriptedModel, install_fakes, stdio_mcp_client
+
+STAGES = ["memory_hook", "dsql_assistant", "assistant_stream", "agent_task", "app_invoke"]
+
+MEMORY_ID = "bench-memory"
+ACTOR_ID = "bench-user"
+
+
+class Pipeline:
+    """One request per stage, each on a session of its own"""
+
+    def __init__(self, memory_client, history_turns):
+        self.memory_client = memory_client
+        self.history_turns = history_turns
+        self._sessions = itertools.count()
+
+    def _new_session(self, stage):
+        session_id = f"{stage}-{next(self._sessions)}"
+        for turn in range(self.history_turns):
+            self.memory_client.save_conversation(
+                MEMORY_ID, ACTOR_ID, session_id,
+                [(f"Earlier question {turn} about orders", "USER"), (f"Earlier answer {turn}: 5 orders", "ASSISTANT")],
+            )
+        return session_id
+
+    @staticmethod
+    def _question(index):
+        return DEFAULT_QUESTIONS[index % len(DEFAULT_QUESTIONS)]
+
+    async def memory_hook(self, index):
+        hook = MemoryHook(
+            self.memory_client, MEMORY_ID, ACTOR_ID, self._new_session("memory_hook"), cache=SessionHistoryCache()
+        )
+        agent = SimpleNamespace(system_prompt="You are a DSQL Database Assistant.", messages=[])
+        hook.on_agent_initialized(SimpleNamespace(agent=agent))
+        for role, text in (("user", self._question(index)), ("assistant", "There are 5 orders.")):
+            agent.messages.append({"role": role, "content": [{"text": text}]})
+            hook.on_message_added(SimpleNamespace(agent=agent))
+
+    async def dsql_assistant(self, index):
+        await dsql_assistant(self._question(index))
+
+    async def assistant_stream(self, index):
+        hook = MemoryHook(self.memory_client, MEMORY_ID, ACTOR_ID, self._new_session("assistant_stream"))
+        assistant = DSQLAssistant(hook)
+        async for _ in assistant.stream(self._question(index)):
+            pass
+
+    async def agent_task(self, index):
+        queue = StreamingQueue()
+        DSQLAssistantContext.set_response_queue_ctx(queue)
+        task = asyncio.create_task(agent_task(self._question(index), self._new_session("agent_task"), ACTOR_ID))
+        async for _ in queue.stream():
+            pass
+        await task
+
+    async def app_invoke(self, index):
+        context = SimpleNamespace(session_id=self._new_session("app_invoke"))
+        async for _ in app.invoke({"prompt": self._question(index), "actor_id": ACTOR_ID}, context):
+            pass
+
+
+async def measure_latency(run, requests):
+    latencies = []
+    for index in range(requests):
+        started = time.perf_counter()
+        await run(index)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def measure_throughput(run, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with semaphore:
+            await run(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def measure_allocations(run, requests):
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for index in range(requests):
+            await run(index)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - baseline) / 1024, (current - baseline) / 1024 / requests
+
+
+async def run_stage(pipeline, stage, args, ledger):
+    run = getattr(pipeline, stage)
+    await run(0)  # warm caches and pooled sessions before measuring
+    before = ledger.snapshot()
+    latencies = await measure_latency(run, args.requests)
+    after = ledger.snapshot()
+    throughput = await measure_throughput(run, args.requests, args.concurrency)
+    peak_kib, retained_kib = await measure_allocations(run, args.alloc_requests)
+    latencies.sort()
+    return {
+        "stage": stage,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "rps": throughput,
+        "peak_kib": peak_kib,
+        "retained_kib": retained_kib,
+        "tokens": (after["total_tokens"] - before["total_tokens"]) / args.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per stage for latency and throughput")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight for the throughput run")
+    parser.add_argument("--alloc-requests", type=int, default=3, help="Requests traced for allocations")
+    parser.add_argument("--history-turns", type=int, default=5, help="Stored turns per session")
+    parser.add_argument("--first-token-ms", type=float, default=50, help="Model time to first token")
+    parser.add_argument("--token-ms", type=float, default=2, help="Model time per output token")
+    parser.add_argument("--mcp-latency-ms", type=float, default=5, help="Latency added to every MCP tool call")
+    args = parser.parse_args()
+
+    ledger = ModelLedger()
+
+    def scripted_model(*_, **__):
+        return ScriptedModel(
+            ledger,
+            first_token_latency=args.first_token_ms / 1000,
+            prefill_latency_per_1k_tokens=0.0,
+            token_latency=args.token_ms / 1000,
+        )
+
+    memory_client = InMemoryMemoryClient()
+    install_fakes(scripted_model, lambda: stdio_mcp_client(args.mcp_latency_ms), memory_client)
+
+    # Keep the agents' console echo and info logging out of the report
+    logging.getLogger().setLevel(logging.WARNING)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_mcp_session_pool().warm()
+        get_schema_catalog().refresh()
+    setup_ms = (time.perf_counter() - started) * 1000
+
+    pipeline = Pipeline(memory_client, args.history_turns)
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for stage in args.stages:
+            results.append(asyncio.run(run_stage(pipeline, stage, args, ledger)))
+    get_memory_writer(memory_client).flush(timeout=10)
+
+    print(f"setup (MCP spawn + schema load): {setup_ms:.0f} ms; first token {args.first_token_ms:.0f} ms, "
+          f"{args.token_ms:.0f} ms/token, MCP call {args.mcp_latency_ms:.0f} ms")
+    print(f"{'stage':<17} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'req/s':>8} {'peak KiB':>9} {'kept KiB/req':>13} {'tok/req':>8}")
+    for r in results:
+        print(f"{r['stage']:<17} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['max_ms']:>8.1f} {r['rps']:>8.1f} "
+              f"{r['peak_kib']:>9.0f} {r['retained_kib']:>13.1f} {r['tokens']:>8.0f}")
+    print(f"MCP pool: {get_mcp_session_pool().stats()}")
+    get_mcp_session_pool().close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the question to SQL plan cache
+
+Asks the dsql_assistant tool each sample question cold (the SQL agent
+writes the SQL), then again as asked and as a paraphrase. Repeats are
+answered from the plan cache, paraphrases too when
+--min-similarity is set. Reports latency and model calls per question
+for each pass. The SQL result cache is cleared between passes so only
+SQL generation is saved.
+
+Usage:
+    python3 benchmarks/bench_plan_cache.py --first-token-ms 300 --min-similarity 0.6
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+# Boto3 clients built at import time must not probe the instance metadata service
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+
+from agent_config.sql_cache import query_result_cache
+from agent_config.sql_plan_cache import sql_plan_cache
+from agent_config.tools.dsql_mcp_assistant import dsql_assistant
+from fakes import DEFAULT_QUESTIONS, FakeMCPClient, InMemoryMemoryClient, ModelLedger, SampleDatabase, ScriptedModel, install_fakes
+
+PARAPHRASES = [
+    "Please tell me how many orders there are",
+    "Show me the top products by their revenue",
+    "Can you list all of our customers?",
+    "Which customers have left 5-star reviews?",
+    "Break down all orders by their order status",
+]
+
+
+async def run_pass(name, questions, ledger):
+    query_result_cache.clear()
+    before = ledger.snapshot()
+    latencies = []
+    for question in questions:
+        started = time.perf_counter()
+        await dsql_assistant(question)
+        latencies.append(time.perf_counter() - started)
+    after = ledger.snapshot()
+    return {
+        "pass": name,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "model_calls": (after["calls"] - before["calls"]) / len(questions),
+        "tokens": (after["total_tokens"] - before["total_tokens"]) / len(questions),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token-ms", type=float, default=200, help="Model time to first token")
+    parser.add_argument("--token-ms", type=float, default=10, help="Model time per output token")
+    parser.add_argument("--mcp-call-ms", type=float, default=20, help="Latency of one MCP tool call")
+    parser.add_argument("--min-similarity", type=float, default=0.6, help="Word overlap for paraphrase matches, 0 for exact only")
+    args = parser.parse_args()
+
+    ledger = ModelLedger()
+
+    def scripted_model(*_, **__):
+        return ScriptedModel(ledger, first_token_latency=args.first_token_ms / 1000, token_latency=args.token_ms / 1000)
+
+    database = SampleDatabase()
+    install_fakes(scripted_model, lambda: FakeMCPClient(database, call_latency=args.mcp_call_ms / 1000), InMemoryMemoryClient())
+    sql_plan_cache.min_similarity = args.min_similarity
+
+    logging.getLogger().setLevel(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(dsql_assistant("warm up the MCP pool and schema catalog"))
+        sql_plan_cache.clear()
+        results = [
+            asyncio.run(run_pass("cold", DEFAULT_QUESTIONS, ledger)),
+            asyncio.run(run_pass("repeat", DEFAULT_QUESTIONS, ledger)),
+            asyncio.run(run_pass("paraphrase", PARAPHRASES, ledger)),
+        ]
+
+    print(f"{len(DEFAULT_QUESTIONS)} questions, first token {args.first_token_ms:.0f} ms, {args.token_ms:.0f} ms/token, "
+          f"MCP call {args.mcp_call_ms:.0f} ms, min similarity {args.min_similarity}")
+    print(f"{'pass':<11} {'mean ms':>9} {'calls/q':>8} {'tok/q':>8}")
+    for r in results:
+        print(f"{r['pass']:<11} {r['mean_ms']:>9.0f} {r['model_calls']:>8.1f} {r['tokens']:>8.0f}")
+    print(f"plan cache: {sql_plan_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
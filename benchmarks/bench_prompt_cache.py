@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark prompt caching of the agents' static prompt prefix
+
+Starts sessions that have earlier conversation in memory and asks a few
+questions in each, once without cache points (the prompts the agents sent
+before, which Bedrock could not cache) and once with the cacheable layout:
+the instructions, tools and schema digest as a system prompt ending in a
+cache point, and the history as messages with a cache point after it. The
+scripted model from fakes.py honors cache points like Bedrock: a prefix it
+has seen is read from the cache and skips prefill. Reports latency, time
+to first chunk, prompt tokens per question and the share read from the
+cache.
+
+Usage:
+    python3 benchmarks/bench_prompt_cache.py --sessions 6 --questions 3 --prefill-ms-per-1k 100
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+# Boto3 clients built at import time must not probe the instance metadata service
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+
+import agent_config.prompt_cache as prompt_cache
+import agent_config.tools.dsql_mcp_assistant as dsql_mcp_assistant
+from agent_config.agent import DSQLAssistant
+from agent_config.memory_hook_provider import MemoryHook
+from agent_config.memory_writer import MemoryWriteBehind
+from agent_config.model_clients import model_client_registry
+from agent_config.sql_cache import query_result_cache
+from fakes import (
+    DEFAULT_QUESTIONS,
+    FakeMCPClient,
+    InMemoryMemoryClient,
+    ModelLedger,
+    SampleDatabase,
+    ScriptedModel,
+    install_fakes,
+)
+
+EARLIER_TURNS = [
+    ("Which tables are in the database?", "The database has customers, products, orders, order_items and reviews."),
+    ("How are orders linked to customers?", "orders.customer_id references customers.customer_id."),
+]
+
+
+async def ask(assistant, question):
+    started = time.perf_counter()
+    first_chunk = None
+    async for _ in assistant.stream(question):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+    return time.perf_counter() - started, first_chunk or 0.0
+
+
+async def run_layout(name, args, ledger, memory_client, writer):
+    query_result_cache.clear()
+    model_client_registry.clear()  # A fresh model starts with an empty prompt cache
+    latencies, first_chunks = [], []
+    before = ledger.snapshot()
+    for session in range(args.sessions):
+        session_id = f"{name}-{session}"
+        for question, answer in EARLIER_TURNS:
+            memory_client.save_conversation("bench-memory", "bench-user", session_id, [(question, "USER"), (answer, "ASSISTANT")])
+        assistant = DSQLAssistant(MemoryHook(memory_client, "bench-memory", "bench-user", session_id, writer=writer))
+        for index in range(args.questions):
+            question = DEFAULT_QUESTIONS[(session + index) % len(DEFAULT_QUESTIONS)]
+            latency, first_chunk = await ask(assistant, question)
+            latencies.append(latency)
+            first_chunks.append(first_chunk)
+    after = ledger.snapshot()
+    questions = len(latencies)
+    prompt_tokens = after["input_tokens"] - before["input_tokens"]
+    cache_read = after["cache_read_tokens"] - before["cache_read_tokens"]
+    return {
+        "layout": name,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "first_chunk_ms": statistics.mean(first_chunks) * 1000,
+        "prompt_tokens": prompt_tokens / questions,
+        "cache_read_tokens": cache_read / questions,
+        "hit_ratio": cache_read / prompt_tokens if prompt_tokens else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=6, help="Sessions started per layout")
+    parser.add_argument("--questions", type=int, default=3, help="Questions asked per session")
+    parser.add_argument("--first-token-ms", type=float, default=200, help="Model time to first token")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=100, help="Model prefill time per 1k uncached input tokens")
+    parser.add_argument("--token-ms", type=float, default=10, help="Model time per output token")
+    args = parser.parse_args()
+
+    ledger = ModelLedger()
+
+    def scripted_model(model_id, **_):
+        # Keep the Bedrock model id, so the agents place cache points as they would for it
+        return ScriptedModel(
+            ledger,
+            first_token_latency=args.first_token_ms / 1000,
+            prefill_latency_per_1k_tokens=args.prefill_ms_per_1k / 1000,
+            token_latency=args.token_ms / 1000,
+            model_id=model_id,
+        )
+
+    database = SampleDatabase()
+    memory_client = InMemoryMemoryClient()
+    install_fakes(scripted_model, lambda: FakeMCPClient(database), memory_client)
+    # Repeated questions would skip the nested SQL agent; measure the agents' prompts only
+    dsql_mcp_assistant.PLAN_CACHE_ENABLED = False
+    writer = MemoryWriteBehind(memory_client)
+
+    # Keep the agents' console echo and debug logging out of the report
+    logging.getLogger().setLevel(logging.WARNING)
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, enabled in (("no cache points", False), ("cacheable", True)):
+            prompt_cache.PROMPT_CACHE_ENABLED = enabled
+            results.append(asyncio.run(run_layout(name, args, ledger, memory_client, writer)))
+    writer.close()
+
+    print(f"{args.sessions} sessions x {args.questions} questions, first token {args.first_token_ms:.0f} ms, "
+          f"prefill {args.prefill_ms_per_1k:.0f} ms per 1k tokens")
+    print(f"{'layout':<16} {'mean ms':>9} {'1st chunk':>10} {'prompt tok/q':>13} {'cached tok/q':>13} {'hit ratio':>10}")
+    for r in results:
+        print(f"{r['layout']:<16} {r['mean_ms']:>9.0f} {r['first_chunk_ms']:>10.0f} {r['prompt_tokens']:>13.0f} "
+              f"{r['cache_read_tokens']:>13.0f} {r['hit_ratio']:>10.0%}")
+    uncached, cached = results
+    print(f"cacheable vs no cache points: {uncached['mean_ms'] - cached['mean_ms']:.0f} ms "
+          f"({1 - cached['mean_ms'] / uncached['mean_ms']:.0%}) faster per question")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent sessions calling a blocking database tool
+
+Several sessions share one event loop, as they do in one AgentCore
+container. Each session streams model tokens, calls a tool that blocks
+for --work-ms (the SSM / MCP / nested agent work done by dsql_assistant),
+then streams again. The tool is called through Strands either as a plain
+sync @tool, which Strands runs with asyncio.to_thread on the loop's
+default executor, or as an async @tool awaiting
+agent_config.tool_executor.run_blocking on a pool of --workers threads.
+The benchmark reports wall time, the longest gap between chunks of any
+session, the worst event-loop lag and the most tool calls running at once.
+
+Neither mode blocks the event loop; run_blocking bounds how many tool
+calls run at once (and so how many MCP sessions and database queries
+they hold) and copies the caller's context into the worker thread.
+
+Usage:
+    python3 benchmarks/bench_tool_concurrency.py --sessions 32 --workers 8 --work-ms 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from strands import tool
+
+from agent_config.tool_executor import run_blocking
+
+_running = {"now": 0, "peak": 0}
+_running_lock = threading.Lock()
+_bounded_executor = None
+
+
+def blocking_work(work_seconds: float) -> str:
+    """Stand-in for the blocking body of dsql_assistant"""
+    with _running_lock:
+        _running["now"] += 1
+        _running["peak"] = max(_running["peak"], _running["now"])
+    try:
+        time.sleep(work_seconds)
+        return "ok"
+    finally:
+        with _running_lock:
+            _running["now"] -= 1
+
+
+@tool
+def sync_tool(work_seconds: float) -> str:
+    """Blocking tool Strands runs with asyncio.to_thread"""
+    return blocking_work(work_seconds)
+
+
+@tool
+async def bounded_tool(work_seconds: float) -> str:
+    """Blocking tool offloaded to the bounded tool executor"""
+    return await run_blocking(blocking_work, work_seconds, executor=_bounded_executor)
+
+
+MODES = {"to_thread": sync_tool, "run_blocking": bounded_tool}
+
+
+async def call_tool(mode, work_seconds):
+    tool_use = {"toolUseId": "bench", "name": MODES[mode].tool_name, "input": {"work_seconds": work_seconds}}
+    async for _ in MODES[mode].stream(tool_use, {}):
+        pass
+
+
+async def session(mode, work_seconds, tokens, token_delay, gaps):
+    last = time.perf_counter()
+
+    async def emit():
+        nonlocal last
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+    for _ in range(tokens):
+        await asyncio.sleep(token_delay)
+        await emit()
+    await call_tool(mode, work_seconds)
+    await emit()
+    for _ in range(tokens):
+        await asyncio.sleep(token_delay)
+        await emit()
+
+
+async def heartbeat(interval, lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_mode(mode, sessions, workers, work_seconds, tokens, token_delay):
+    global _bounded_executor
+    _bounded_executor = ThreadPoolExecutor(max_workers=workers)
+    _running["peak"] = 0
+    gaps, lags = [], []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(0.005, lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        session(mode, work_seconds, tokens, token_delay, gaps) for _ in range(sessions)
+    ])
+    wall = time.perf_counter() - started
+    stop.set()
+    await monitor
+    _bounded_executor.shutdown()
+    return {
+        "mode": mode,
+        "wall_s": wall,
+        "max_gap_ms": max(gaps) * 1000,
+        "p50_gap_ms": statistics.median(gaps) * 1000,
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+        "peak_running": _running["peak"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--work-ms", type=float, default=500)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--token-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions, {args.workers} workers, {args.work_ms:.0f} ms blocking tool, "
+          f"{args.tokens} tokens every {args.token_ms:.0f} ms before and after the call\n")
+    print(f"{'mode':<13} {'wall (s)':>9} {'max gap (ms)':>13} {'p50 gap (ms)':>13} {'max loop lag (ms)':>18} "
+          f"{'peak running':>13}")
+    for mode in MODES:
+        result = asyncio.run(run_mode(
+            mode, args.sessions, args.workers, args.work_ms / 1000, args.tokens, args.token_ms / 1000
+        ))
+        print(f"{mode:<13} {result['wall_s']:>9.2f} {result['max_gap_ms']:>13.1f} "
+              f"{result['p50_gap_ms']:>13.1f} {result['max_loop_lag_ms']:>18.1f} {result['peak_running']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark nested versus flat database tool modes
+
+In nested mode (DSQL_TOOL_MODE=nested) the top-level DSQLAssistant hands
+database questions to the dsql_assistant tool, which runs a second agent
+with the MCP tools. In flat mode the pooled MCP tools are registered on
+the top-level agent directly. The benchmark answers the same questions
+in both modes with a scripted model and an in-memory copy of
+testing-data, and reports end-to-end latency, time to first chunk,
+model calls and tokens per question.
+
+Usage:
+    python3 benchmarks/bench_tool_modes.py --rounds 3 --first-token-ms 300
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(os.path.dirname(current_dir), 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+# Boto3 clients built at import time must not probe the instance metadata service
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+
+import agent_config.tools.dsql_mcp_assistant as dsql_mcp_assistant
+from agent_config.agent import DSQLAssistant
+from agent_config.memory_hook_provider import MemoryHook
+from agent_config.memory_writer import MemoryWriteBehind
+from agent_config.sql_cache import query_result_cache
+from fakes import (
+    DEFAULT_QUESTIONS,
+    FakeMCPClient,
+    InMemoryMemoryClient,
+    ModelLedger,
+    SampleDatabase,
+    ScriptedModel,
+    install_fakes,
+)
+
+
+async def ask(assistant, question):
+    started = time.perf_counter()
+    first_chunk = None
+    async for _ in assistant.stream(question):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+    return time.perf_counter() - started, first_chunk or 0.0
+
+
+async def run_mode(mode, args, ledger, memory_client, writer):
+    query_result_cache.clear()
+    latencies, first_chunks = [], []
+    before = ledger.snapshot()
+    for round_index in range(args.rounds):
+        for question_index, question in enumerate(DEFAULT_QUESTIONS):
+            hook = MemoryHook(
+                memory_client, "bench-memory", "bench-user", f"{mode}-{round_index}-{question_index}", writer=writer
+            )
+            assistant = DSQLAssistant(hook, tool_mode=mode)
+            latency, first_chunk = await ask(assistant, question)
+            latencies.append(latency)
+            first_chunks.append(first_chunk)
+    after = ledger.snapshot()
+    questions = len(latencies)
+    return {
+        "mode": mode,
+        "questions": questions,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(0.95 * (questions - 1))] * 1000,
+        "first_chunk_ms": statistics.mean(first_chunks) * 1000,
+        "model_calls": (after["calls"] - before["calls"]) / questions,
+        "input_tokens": (after["input_tokens"] - before["input_tokens"]) / questions,
+        "output_tokens": (after["output_tokens"] - before["output_tokens"]) / questions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2, help="Times each question is asked per mode")
+    parser.add_argument("--first-token-ms", type=float, default=200, help="Model time to first token")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=50, help="Model prefill time per 1k input tokens")
+    parser.add_argument("--token-ms", type=float, default=10, help="Model time per output token")
+    parser.add_argument("--mcp-call-ms", type=float, default=20, help="Latency of one MCP tool call")
+    args = parser.parse_args()
+
+    ledger = ModelLedger()
+
+    def scripted_model(*_, **__):
+        return ScriptedModel(
+            ledger,
+            first_token_latency=args.first_token_ms / 1000,
+            prefill_latency_per_1k_tokens=args.prefill_ms_per_1k / 1000,
+            token_latency=args.token_ms / 1000,
+        )
+
+    database = SampleDatabase()
+    memory_client = InMemoryMemoryClient()
+    install_fakes(scripted_model, lambda: FakeMCPClient(database, call_latency=args.mcp_call_ms / 1000), memory_client)
+    # Repeated questions would skip the nested SQL agent; compare the modes' agent loops only
+    dsql_mcp_assistant.PLAN_CACHE_ENABLED = False
+    writer = MemoryWriteBehind(memory_client)
+
+    # Keep the agents' console echo and debug logging out of the report
+    logging.getLogger().setLevel(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [asyncio.run(run_mode(mode, args, ledger, memory_client, writer)) for mode in ("nested", "flat")]
+    writer.close()
+
+    print(f"{len(DEFAULT_QUESTIONS)} questions x {args.rounds} rounds, "
+          f"first token {args.first_token_ms:.0f} ms, {args.token_ms:.0f} ms/token, MCP call {args.mcp_call_ms:.0f} ms")
+    print(f"{'mode':<8} {'mean ms':>9} {'p95 ms':>9} {'1st chunk':>10} {'calls/q':>8} {'in tok/q':>9} {'out tok/q':>10}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['mean_ms']:>9.0f} {r['p95_ms']:>9.0f} {r['first_chunk_ms']:>10.0f} "
+              f"{r['model_calls']:>8.1f} {r['input_tokens']:>9.0f} {r['output_tokens']:>10.0f}")
+    nested, flat = results
+    print(f"flat vs nested: {nested['mean_ms'] / flat['mean_ms']:.2f}x faster, "
+          f"{1 - (flat['input_tokens'] + flat['output_tokens']) / (nested['input_tokens'] + nested['output_tokens']):.0%} fewer tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""
+Offline Fakes for Benchmarks
+
+This module provides stand-ins for the external services the agent talks
+to, so benchmarks exercise the real agent code without AWS credentials:
+a scripted Strands model with configurable latency and token accounting,
+MCP clients backed by an in-memory SQLite copy of testing-data (in process
+or over stdio through fake_mcp_server.py), and an in-memory AgentCore
+Memory client. install_fakes() wires them into the agent modules.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import importlib
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Tuple
+
+from strands.models import Model
+
+# Testing data shipped with the repository
+TESTING_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testing-data")
+
+# Stdio MCP server stand-in
+FAKE_MCP_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_mcp_server.py")
+
+# PostgreSQL casts (value::type), which SQLite does not understand
+_CAST_RE = re.compile(r"::\s*[A-Za-z_][A-Za-z0-9_]*")
+_EXPLAIN_RE = re.compile(r"\s*EXPLAIN\s+(.*)", re.I | re.S)
+
+CHARS_PER_TOKEN = 4
+
+# Questions with the SQL a well-behaved model would write for them
+SCRIPTED_SQL = {
+    "how many orders": "SELECT COUNT(*) AS order_count FROM orders",
+    "top products": (
+        "SELECT p.product_name, SUM(oi.total_price) AS revenue FROM order_items oi "
+        "JOIN products p ON p.product_id = oi.product_id GROUP BY p.product_name ORDER BY revenue DESC LIMIT 5"
+    ),
+    "customers": "SELECT first_name, last_name, email FROM customers ORDER BY customer_id",
+    "reviews": (
+        "SELECT c.first_name, p.product_name, r.rating FROM reviews r "
+        "JOIN customers c ON c.customer_id = r.customer_id JOIN products p ON p.product_id = r.product_id "
+        "WHERE r.rating = 5"
+    ),
+    "order status": "SELECT status, COUNT(*) AS orders FROM orders GROUP BY status ORDER BY status",
+}
+
+DEFAULT_QUESTIONS = [
+    "How many orders are there?",
+    "What are the top products by revenue?",
+    "List all customers",
+    "Which customers left 5-star reviews?",
+    "Break down orders by order status",
+]
+
+
+def estimate_tokens(value: Any) -> int:
+    """Approximate token count of text or JSON-serializable data"""
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def scripted_sql(question: str) -> str:
+    """Pick the SQL for a benchmark question by keyword"""
+    lowered = question.lower()
+    for keyword, sql in SCRIPTED_SQL.items():
+        if keyword in lowered:
+            return sql
+    return SCRIPTED_SQL["how many orders"]
+
+
+class ModelLedger:
+    """Thread-safe totals of model calls and tokens, shared by scripted models"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+
+    def record(self, input_tokens: int, output_tokens: int, cache_read_tokens: int = 0) -> None:
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.cache_read_tokens += cache_read_tokens
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens,
+            }
+
+
+class ScriptedModel(Model):
+    """
+    Deterministic Strands model for benchmarks.
+
+    On a user turn it calls the first available tool it knows
+    (dsql_assistant with the question, or readonly_query with scripted
+    SQL); after a tool result, or when no known tool is available, it
+    answers in text. Latency is a fixed time to first token, a prefill
+    cost per input token and a delay per output token.
+
+    Cache points in the system prompt and messages are honored like
+    Bedrock prompt caching: the prompt prefix up to a cache point seen
+    before is read from the cache, skips prefill and is reported as
+    cacheReadInputTokens.
+    """
+
+    def __init__(
+        self,
+        ledger: Optional[ModelLedger] = None,
+        first_token_latency: float = 0.2,
+        prefill_latency_per_1k_tokens: float = 0.05,
+        token_latency: float = 0.01,
+        sql_for: Callable[[str], str] = scripted_sql,
+        model_id: str = "scripted",
+    ):
+        self.ledger = ledger or ModelLedger()
+        self.first_token_latency = first_token_latency
+        self.prefill_latency_per_1k_tokens = prefill_latency_per_1k_tokens
+        self.token_latency = token_latency
+        self.sql_for = sql_for
+        self.config: Dict[str, Any] = {"model_id": model_id}
+        self._ids = itertools.count(1)
+        self._cache_lock = threading.Lock()
+        self._cached_prefixes: set = set()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("ScriptedModel does not support structured output")
+        yield  # pragma: no cover
+
+    def _plan(self, messages: List[Dict[str, Any]], tool_names: List[str]) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Decide the next turn: (tool use or None, text)"""
+        last = messages[-1] if messages else {"content": []}
+        results = [block["toolResult"] for block in last.get("content", []) if "toolResult" in block]
+        if results:
+            text = " ".join(
+                item.get("text", "") for result in results for item in result.get("content", []) if "text" in item
+            )
+            return None, f"Here is what the database returned: {text[:400]}"
+
+        question = " ".join(block.get("text", "") for block in last.get("content", []) if "text" in block)
+        if "dsql_assistant" in tool_names:
+            return {"name": "dsql_assistant", "input": {"query": question}}, ""
+        if "readonly_query" in tool_names:
+            return {"name": "readonly_query", "input": {"sql": self.sql_for(question)}}, ""
+        return None, "I can only help with database questions."
+
+    def _prompt_cache(self, tool_specs, system_blocks, messages) -> Tuple[int, int]:
+        """Prompt tokens (read from, written to) the cache for the request's cache points"""
+        digest = hashlib.sha256(json.dumps(tool_specs or [], sort_keys=True, default=str).encode())
+        tokens = estimate_tokens(tool_specs) if tool_specs else 0
+        checkpoints = []  # (prefix hash, prefix tokens) at each cache point
+        blocks = list(system_blocks or []) + [
+            dict(block, role=message["role"]) for message in messages for block in message.get("content", [])
+        ]
+        for block in blocks:
+            if "cachePoint" in block:
+                checkpoints.append((digest.hexdigest(), tokens))
+                continue
+            digest.update(json.dumps(block, sort_keys=True, default=str).encode())
+            tokens += estimate_tokens(block.get("text") or block)
+        with self._cache_lock:
+            read = max((size for key, size in checkpoints if key in self._cached_prefixes), default=0)
+            written = max((size for key, size in checkpoints if key not in self._cached_prefixes), default=0)
+            self._cached_prefixes.update(key for key, _ in checkpoints)
+        return read, max(0, written - read)
+
+    async def stream(
+        self,
+        messages,
+        tool_specs=None,
+        system_prompt=None,
+        **kwargs: Any,
+    ) -> AsyncIterable[Dict[str, Any]]:
+        started = time.perf_counter()
+        prompt_tokens = estimate_tokens(messages) + estimate_tokens(system_prompt or "") + estimate_tokens(tool_specs or [])
+        cache_read, cache_write = self._prompt_cache(tool_specs, kwargs.get("system_prompt_content"), messages)
+        cache_read = min(cache_read, prompt_tokens)
+        input_tokens = max(0, prompt_tokens - cache_read - cache_write)  # Bedrock counts cached tokens separately
+        tool_use, text = self._plan(messages, [spec["name"] for spec in tool_specs or []])
+
+        prefilled = prompt_tokens - cache_read
+        await asyncio.sleep(self.first_token_latency + prefilled / 1000 * self.prefill_latency_per_1k_tokens)
+        yield {"messageStart": {"role": "assistant"}}
+        if tool_use:
+            arguments = json.dumps(tool_use["input"])
+            output_tokens = estimate_tokens(arguments)
+            tool_use_id = f"tooluse_{next(self._ids)}"
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use_id, "name": tool_use["name"]}}}}
+            await asyncio.sleep(output_tokens * self.token_latency)
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": arguments}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "tool_use"
+        else:
+            words = re.findall(r"\S+\s*", text)
+            output_tokens = estimate_tokens(text)
+            yield {"contentBlockStart": {"start": {}}}
+            for word in words:
+                await asyncio.sleep(max(1, len(word) // CHARS_PER_TOKEN) * self.token_latency)
+                yield {"contentBlockDelta": {"delta": {"text": word}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "end_turn"
+        yield {"messageStop": {"stopReason": stop_reason}}
+
+        self.ledger.record(prompt_tokens, output_tokens, cache_read)
+        usage = {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": prompt_tokens + output_tokens}
+        if cache_read or cache_write:
+            usage.update(cacheReadInputTokens=cache_read, cacheWriteInputTokens=cache_write)
+        yield {
+            "metadata": {
+                "usage": usage,
+                "metrics": {"latencyMs": int((time.perf_counter() - started) * 1000)},
+            }
+        }
+
+
+class SampleDatabase:
+    """
+    In-memory SQLite copy of testing-data with a PostgreSQL-like catalog.
+
+    The information_schema tables read by the schema catalog are filled
+    from SQLite's own metadata, so catalog queries work unchanged.
+    """
+
+    def __init__(self, data_dir: str = TESTING_DATA_DIR):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        for name in ("database_schema.sql", "sample_data.sql"):
+            with open(os.path.join(data_dir, name)) as f:
+                self._connection.executescript(f.read())
+        self._build_information_schema()
+        self._build_pg_catalog()
+
+    def _build_information_schema(self) -> None:
+        db = self._connection
+        db.execute("ATTACH DATABASE ':memory:' AS information_schema")
+        db.executescript(
+            """
+            CREATE TABLE information_schema.columns (
+                table_schema TEXT, table_name TEXT, column_name TEXT,
+                data_type TEXT, is_nullable TEXT, ordinal_position INTEGER);
+            CREATE TABLE information_schema.table_constraints (
+                table_schema TEXT, table_name TEXT, constraint_name TEXT, constraint_type TEXT);
+            CREATE TABLE information_schema.key_column_usage (
+                table_schema TEXT, table_name TEXT, constraint_name TEXT, column_name TEXT);
+            CREATE TABLE information_schema.constraint_column_usage (
+                table_schema TEXT, table_name TEXT, constraint_name TEXT, column_name TEXT);
+            """
+        )
+        tables = [row[0] for row in db.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            for cid, name, data_type, notnull, _default, pk in db.execute(f"PRAGMA main.table_info({table})"):
+                db.execute(
+                    "INSERT INTO information_schema.columns VALUES ('public', ?, ?, ?, ?, ?)",
+                    (table, name, data_type.lower(), "NO" if notnull or pk else "YES", cid + 1),
+                )
+                if pk:
+                    constraint = f"{table}_pkey"
+                    db.execute(
+                        "INSERT INTO information_schema.table_constraints VALUES ('public', ?, ?, 'PRIMARY KEY')",
+                        (table, constraint),
+                    )
+                    db.execute(
+                        "INSERT INTO information_schema.key_column_usage VALUES ('public', ?, ?, ?)",
+                        (table, constraint, name),
+                    )
+            for row in db.execute(f"PRAGMA main.foreign_key_list({table})"):
+                constraint = f"{table}_{row['from']}_fkey"
+                db.execute(
+                    "INSERT INTO information_schema.table_constraints VALUES ('public', ?, ?, 'FOREIGN KEY')",
+                    (table, constraint),
+                )
+                db.execute(
+                    "INSERT INTO information_schema.key_column_usage VALUES ('public', ?, ?, ?)",
+                    (table, constraint, row["from"]),
+                )
+                db.execute(
+                    "INSERT INTO information_schema.constraint_column_usage VALUES ('public', ?, ?, ?)",
+                    (row["table"], constraint, row["to"]),
+                )
+        db.commit()
+
+    def _build_pg_catalog(self) -> None:
+        """Minimal pg_class and pg_namespace with exact row counts as estimates"""
+        db = self._connection
+        tables = [row[0] for row in db.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")]
+        db.executescript(
+            """
+            CREATE TABLE pg_namespace (oid INTEGER, nspname TEXT);
+            CREATE TABLE pg_class (oid INTEGER, relname TEXT, relnamespace INTEGER, relkind TEXT, reltuples REAL);
+            INSERT INTO pg_namespace VALUES (2200, 'public');
+            """
+        )
+        for oid, table in enumerate(tables, start=16384):
+            count = db.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+            db.execute("INSERT INTO pg_class VALUES (?, ?, 2200, 'r', ?)", (oid, table, count))
+        db.commit()
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Run one statement and return its rows as dictionaries"""
+        sql = _CAST_RE.sub("", sql)
+        explained = _EXPLAIN_RE.match(sql)
+        if explained:
+            return self._explain(explained.group(1), params)
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(sql, params)]
+
+    def _explain(self, sql: str, params: Tuple) -> List[Dict[str, Any]]:
+        """PostgreSQL-style EXPLAIN with the actual row count as the estimate and one cost unit per row"""
+        with self._lock:
+            (rows,) = self._connection.execute(f"SELECT COUNT(*) FROM ({sql.rstrip().rstrip(';')})", params).fetchone()
+        return [{"QUERY PLAN": f"Result  (cost=0.00..{rows * 1.0:.2f} rows={rows} width=32)"}]
+
+    def transact(self, statements: List[str]) -> None:
+        """Run statements in one transaction"""
+        with self._lock:
+            try:
+                for sql in statements:
+                    self._connection.execute(_CAST_RE.sub("", sql))
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+
+
+MCP_TOOL_SPECS = [
+    {
+        "name": "readonly_query",
+        "description": "Run a read-only SQL query against the database and return the rows",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"sql": {"type": "string", "description": "The SQL query to run"}},
+            "required": ["sql"],
+        }},
+    },
+    {
+        "name": "transact",
+        "description": "Run a list of SQL statements in one write transaction",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"sql_list": {"type": "array", "items": {"type": "string"}}},
+            "required": ["sql_list"],
+        }},
+    },
+    {
+        "name": "get_schema",
+        "description": "Get the columns and types of a table",
+        "inputSchema": {"json": {
+            "type": "object",
+            "properties": {"table_name": {"type": "string"}},
+            "required": ["table_name"],
+        }},
+    },
+]
+
+
+class _ListedTool:
+    def __init__(self, tool_spec: Dict[str, Any]):
+        self.tool_spec = tool_spec
+
+
+class FakeMCPClient:
+    """
+    In-process stand-in for an MCPClient connected to the Aurora DSQL MCP server.
+
+    It implements the subset of the MCPClient interface used by the session
+    pool, with a configurable start-up cost and per-call latency.
+    """
+
+    def __init__(self, database: SampleDatabase, start_latency: float = 0.0, call_latency: float = 0.005):
+        self.database = database
+        self.start_latency = start_latency
+        self.call_latency = call_latency
+        self.calls = 0
+
+    def start(self) -> "FakeMCPClient":
+        time.sleep(self.start_latency)
+        return self
+
+    def stop(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def list_tools_sync(self) -> List[_ListedTool]:
+        return [_ListedTool(spec) for spec in MCP_TOOL_SPECS]
+
+    def _execute(self, name: str, arguments: Dict[str, Any]) -> Any:
+        if name == "readonly_query":
+            return self.database.query(arguments["sql"])
+        if name == "transact":
+            self.database.transact(arguments["sql_list"])
+            return {"status": "committed"}
+        if name == "get_schema":
+            return self.database.query(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = ? ORDER BY ordinal_position",
+                (arguments["table_name"],),
+            )
+        raise ValueError(f"Unknown tool {name}")
+
+    def call_tool_sync(self, tool_use_id: str, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        time.sleep(self.call_latency)
+        self.calls += 1
+        try:
+            value = self._execute(name, arguments or {})
+        except Exception as e:
+            return {"status": "error", "toolUseId": tool_use_id, "content": [{"text": f"Error: {e}"}]}
+        return {"status": "success", "toolUseId": tool_use_id, "content": [{"text": json.dumps(value, default=str)}]}
+
+    async def call_tool_async(self, tool_use_id: str, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        return await asyncio.to_thread(self.call_tool_sync, tool_use_id, name, arguments)
+
+
+class InMemoryMemoryClient:
+    """AgentCore MemoryClient stand-in keeping conversations in process memory"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._events: Dict[Tuple[str, str, str], List[List[Tuple[str, str]]]] = {}
+
+    def save_conversation(self, memory_id: str, actor_id: str, session_id: str, messages, **kwargs: Any) -> Dict:
+        time.sleep(self.latency)
+        with self._lock:
+            self._events.setdefault((memory_id, actor_id, session_id), []).append(list(messages))
+        return {"eventId": f"event-{len(self._events)}"}
+
+    def get_last_k_turns(self, memory_id: str, actor_id: str, session_id: str, k: int = 5, **kwargs: Any):
+        time.sleep(self.latency)
+        with self._lock:
+            events = list(self._events.get((memory_id, actor_id, session_id), []))
+        turns = [
+            [{"role": role, "content": {"text": text}} for text, role in messages]
+            for messages in events
+        ]
+        return turns[-k:]
+
+
+def stdio_mcp_client(latency_ms: float = 0.0, dsn: Optional[str] = None):
+    """
+    MCPClient for the stdio MCP server stand-in, spawned like the real server.
+
+    Args:
+        latency_ms: Artificial latency the server adds to every tool call
+        dsn: PostgreSQL database the server runs its tools on instead of the SQLite copy
+
+    Returns:
+        MCPClient: Client that spawns fake_mcp_server.py when started
+    """
+    from mcp import StdioServerParameters, stdio_client
+    from strands.tools.mcp import MCPClient
+
+    args = [FAKE_MCP_SERVER, "--latency-ms", str(latency_ms)] + (["--dsn", dsn] if dsn else [])
+    return MCPClient(lambda: stdio_client(StdioServerParameters(command=sys.executable, args=args)))
+
+
+def install_fakes(
+    model_factory: Callable[..., Model],
+    mcp_client_factory: Callable[[], Any],
+    memory_client: InMemoryMemoryClient,
+    parameters: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Point the agent modules at the fakes.
+
+    The agents get their models from a model client registry over
+    model_factory, the MCP session pool singleton is replaced by one over
+    mcp_client_factory, agent_task uses the in-memory memory client, and
+    SSM parameter lookups in agent_task are answered from parameters.
+
+    Args:
+        model_factory: Called in place of BedrockModel(model_id=..., region_name=..., boto_client_config=...)
+        mcp_client_factory: Returns a new, not yet started MCP client
+        memory_client: Memory client used by agent_task
+        parameters: SSM parameter values by name
+    """
+    from agent_config.mcp_session_pool import MCPSessionPool
+    from agent_config.model_clients import ModelClientRegistry
+
+    parameters = dict(parameters or {})
+    agent_task_module = importlib.import_module("agent_config.agent_task")
+    model_clients_module = importlib.import_module("agent_config.model_clients")
+    pool_module = importlib.import_module("agent_config.mcp_session_pool")
+
+    model_clients_module.model_client_registry = ModelClientRegistry(model_factory)
+    pool_module._pool = MCPSessionPool(mcp_client_factory)
+    agent_task_module.memory_client = memory_client
+    agent_task_module.get_ssm_parameter = lambda name: parameters.get(name, "bench-" + name.rsplit("/", 1)[-1].lower())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the session-keyed agent pool
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.agent_pool import AgentPool
+from agent_config.history_cache import SessionHistoryCache
+from agent_config.memory_hook_provider import MemoryHook
+from strands.models.model import Model
+
+
+class FailingModel(Model):
+    """A model whose every call fails, like a throttled or unreachable endpoint"""
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {"model_id": "failing-model"}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise RuntimeError("model unavailable")
+        yield
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        raise RuntimeError("model unavailable")
+        yield
+
+
+class FakeAgent:
+    def __init__(self, key):
+        self.key = key
+        self.messages = []
+
+
+def test_agents_reused_per_session():
+    """The same (actor, session) gets the same agent; other sessions get their own"""
+    async def run():
+        pool = AgentPool()
+        async with pool.lease("alice", "s1", lambda: FakeAgent("alice/s1")) as first:
+            pass
+        async with pool.lease("alice", "s1", lambda: FakeAgent("other")) as second:
+            pass
+        async with pool.lease("bob", "s1", lambda: FakeAgent("bob/s1")) as third:
+            pass
+        return first, second, third, pool.stats()
+
+    first, second, third, stats = asyncio.run(run())
+    assert first is second
+    assert third.key == "bob/s1"
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_lru_eviction_respects_max_agents():
+    """The least recently used session is evicted first"""
+    async def run():
+        pool = AgentPool(max_agents=2)
+        for session_id in ["s1", "s2", "s1", "s3"]:
+            async with pool.lease("actor", session_id, lambda: FakeAgent(session_id)):
+                pass
+        return pool
+
+    pool = asyncio.run(run())
+    assert len(pool) == 2
+    assert ("actor", "s2") not in pool._entries
+
+
+def test_memory_cap_evicts_large_conversations():
+    """Agents are evicted once their estimated size exceeds the cap"""
+    async def run():
+        pool = AgentPool(max_total_bytes=100, size_estimator=lambda agent: 60)
+        for session_id in ["s1", "s2"]:
+            async with pool.lease("actor", session_id, lambda: FakeAgent(session_id)):
+                pass
+        return pool
+
+    assert len(asyncio.run(run())) == 1
+
+
+def test_turns_for_one_session_are_serialized():
+    """A second turn waits until the first turn releases the session"""
+    async def run():
+        pool = AgentPool()
+        order = []
+
+        async def turn(name):
+            async with pool.lease("actor", "s1", lambda: FakeAgent("s1")):
+                order.append(f"{name}-start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name}-end")
+
+        await asyncio.gather(turn("a"), turn("b"))
+        return order
+
+    assert asyncio.run(run()) == ["a-start", "a-end", "b-start", "b-end"]
+
+
+def test_cancelled_turn_drops_the_agent():
+    """A cancelled turn (client disconnect) does not leave its agent for the next turn"""
+    async def run():
+        pool = AgentPool()
+        started = asyncio.Event()
+
+        async def turn():
+            async with pool.lease("actor", "s1", lambda: FakeAgent("first")):
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(turn())
+        await started.wait()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        dropped = len(pool)
+        async with pool.lease("actor", "s1", lambda: FakeAgent("second")) as agent:
+            pass
+        return dropped, agent
+
+    dropped, agent = asyncio.run(run())
+    assert dropped == 0
+    assert agent.key == "second"
+
+
+def test_failed_turn_inside_the_stream_drops_the_agent(monkeypatch):
+    """A turn whose model raises ends normally with an error message, but its agent is not reused"""
+    import agent_config.agent as agent_module
+
+    monkeypatch.setattr(agent_module, "get_bedrock_model", lambda model_id: FailingModel())
+    memory_client = SimpleNamespace(get_last_k_turns=lambda **_: [])
+    writer = SimpleNamespace(enqueue=lambda *args, **kwargs: None)
+
+    def create_agent():
+        hook = MemoryHook(memory_client, "memory", "actor", "s1", writer=writer, cache=SessionHistoryCache())
+        return agent_module.DSQLAssistant(hook)
+
+    async def run():
+        pool = AgentPool()
+        async with pool.lease("actor", "s1", create_agent) as first:
+            chunks = [chunk async for chunk in first.stream(user_query="How many orders?")]
+        async with pool.lease("actor", "s1", create_agent) as second:
+            pass
+        return first, second, chunks
+
+    first, second, chunks = asyncio.run(run())
+    assert "unable to process your request" in "".join(chunks)
+    assert first.healthy is False
+    assert second is not first and second.healthy is True
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test that batch_readonly_query runs queries concurrently and keeps their order
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from strands.types.tools import AgentTool
+
+from agent_config.tools.batch_query import BatchReadonlyQueryTool
+
+
+class SlowQueryTool(AgentTool):
+    """readonly_query stand-in that sleeps and records how many queries overlap"""
+
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def tool_name(self):
+        return "readonly_query"
+
+    @property
+    def tool_spec(self):
+        return {"name": "readonly_query", "description": "", "inputSchema": {"json": {}}}
+
+    @property
+    def tool_type(self):
+        return "python"
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        sql = tool_use["input"]["sql"]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        # Later queries finish first, so the output order shows the input order is kept
+        await asyncio.sleep(0.05 / len(sql))
+        self.running -= 1
+        if "missing" in sql:
+            raise RuntimeError("relation does not exist")
+        yield {"toolUseId": tool_use["toolUseId"], "status": "success", "content": [{"text": f"rows of {sql}"}]}
+
+
+def run_batch(tool, queries):
+    async def collect():
+        return [event async for event in tool.stream({"toolUseId": "t1", "input": {"queries": queries}}, {})]
+
+    return asyncio.run(collect())[-1]
+
+
+def test_queries_run_concurrently_in_order():
+    readonly_query = SlowQueryTool()
+    queries = [f"SELECT {'x' * n}" for n in range(1, 7)]
+
+    result = run_batch(BatchReadonlyQueryTool(readonly_query, max_concurrency=3), queries)
+
+    assert result["status"] == "success"
+    texts = [block["text"] for block in result["content"]]
+    assert texts[0::2] == [f"Query {i} (success): {sql}" for i, sql in enumerate(queries, start=1)]
+    assert texts[1::2] == [f"rows of {sql}" for sql in queries]
+    assert readonly_query.peak == 3
+
+
+def test_failed_query_does_not_fail_the_batch():
+    result = run_batch(BatchReadonlyQueryTool(SlowQueryTool()), ["SELECT 1", "SELECT * FROM missing"])
+
+    assert result["status"] == "success"
+    assert result["content"][2]["text"] == "Query 2 (error): SELECT * FROM missing"
+    assert "relation does not exist" in result["content"][3]["text"]
+
+
+def test_batch_input_is_validated():
+    tool = BatchReadonlyQueryTool(SlowQueryTool(), max_queries=2)
+
+    assert run_batch(tool, [])["status"] == "error"
+    too_many = run_batch(tool, ["SELECT 1", "SELECT 2", "SELECT 3"])
+    assert too_many["status"] == "error" and "at most 2" in too_many["content"][0]["text"]
@@ -5,6 +5,7 @@ Test the actual DSQL assistant function
 
 import sys
 import os
+import asyncio
 
 # Add the agentcore path to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,7 +26,7 @@ def test_dsql_assistant():
     print("Processing...")
     
     try:
-        result = dsql_assistant(test_query)
+        result = asyncio.run(dsql_assistant(test_query))
         print(f"\n✓ Success! Response:")
         print("-" * 50)
         print(result)
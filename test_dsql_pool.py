@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the direct SQL backend's auth token cache and backend selection
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config import dsql_pool, mcp_session_pool
+from agent_config.dsql_pool import DSQLAuthTokenCache
+
+
+class FakeDSQLClient:
+    def __init__(self):
+        self.calls = []
+
+    def generate_db_connect_admin_auth_token(self, hostname, region, expires_in):
+        self.calls.append(("admin", hostname, region, expires_in))
+        return f"admin-token-{len(self.calls)}"
+
+    def generate_db_connect_auth_token(self, hostname, region, expires_in):
+        self.calls.append(("user", hostname, region, expires_in))
+        return f"user-token-{len(self.calls)}"
+
+
+def test_token_is_reused_until_shortly_before_expiry():
+    client = FakeDSQLClient()
+    now = [1000.0]
+    tokens = DSQLAuthTokenCache(
+        "abc.dsql.us-east-1.on.aws", "us-east-1", expires_in=900, refresh_margin=60, client=client, clock=lambda: now[0]
+    )
+
+    assert tokens.token() == "admin-token-1"
+    now[0] += 839
+    assert tokens.token() == "admin-token-1"
+    now[0] += 1
+    assert tokens.token() == "admin-token-2"
+    assert client.calls[0] == ("admin", "abc.dsql.us-east-1.on.aws", "us-east-1", 900)
+    assert tokens.stats() == {"generated": 2, "reused": 1}
+
+
+def test_non_admin_users_get_user_tokens():
+    client = FakeDSQLClient()
+    tokens = DSQLAuthTokenCache("abc.dsql.us-east-1.on.aws", "us-east-1", user="reader", client=client)
+
+    assert tokens.token() == "user-token-1"
+
+
+def test_direct_backend_without_asyncpg_is_an_error(monkeypatch):
+    monkeypatch.setattr(dsql_pool, "SQL_BACKEND", "direct")
+    monkeypatch.setattr(dsql_pool, "asyncpg", None)
+    monkeypatch.setattr(mcp_session_pool, "_pool", object())
+
+    with pytest.raises(RuntimeError, match="requires asyncpg"):
+        dsql_pool.get_sql_backend()
+
+    monkeypatch.setattr(dsql_pool, "SQL_BACKEND", "mcp")
+    assert dsql_pool.get_sql_backend() is mcp_session_pool._pool
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the conversation history cache: selection and truncation within the
+token budget, and the per-session cache's hits, expiry, LRU bound and
+appends from the memory hook
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+import agent_config.history_cache as history_cache_module
+from agent_config.history_cache import SessionHistoryCache, estimate_tokens, select_history, truncate_text
+from agent_config.memory_hook_provider import MemoryHook
+
+KEY = ("memory", "actor", "session")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_select_history_keeps_the_most_recent_messages_within_the_budget():
+    messages = [("USER", "a" * 40), ("ASSISTANT", "b" * 40), ("USER", "c" * 40), ("ASSISTANT", "d" * 40)]
+    # Each message costs 10 tokens plus 1 for its role
+    assert select_history(messages, token_budget=22, message_token_limit=100) == messages[-2:]
+    assert select_history(messages, token_budget=21, message_token_limit=100) == messages[-1:]
+    assert select_history(messages, token_budget=1000, message_token_limit=100) == messages
+    assert select_history(messages, token_budget=5, message_token_limit=100) == []
+
+
+def test_oversized_messages_are_truncated_before_budgeting():
+    result = "row\n" * 1000
+    messages = [("USER", "Show every order"), ("ASSISTANT", result), ("USER", "Thanks")]
+
+    selected = select_history(messages, token_budget=200, message_token_limit=50)
+
+    assert [role for role, _ in selected] == ["USER", "ASSISTANT", "USER"]
+    truncated = selected[1][1]
+    assert truncated.startswith("row\n") and truncated.endswith("row\n")
+    assert "characters omitted" in truncated and estimate_tokens(truncated) < 60
+    assert truncate_text("short", 50) == "short"
+
+
+def test_cache_hits_return_copies_until_the_ttl_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(history_cache_module, "time", clock)
+    cache = SessionHistoryCache(ttl_seconds=60)
+    assert cache.get(KEY) is None
+
+    cache.put(KEY, [("USER", "Hello")])
+    window = cache.get(KEY)
+    assert window == [("USER", "Hello")]
+    window.append(("USER", "Not cached"))
+    assert cache.get(KEY) == [("USER", "Hello")]
+
+    clock.now += 61
+    assert cache.get(KEY) is None
+    cache.invalidate(KEY)  # Forgetting a missing session is harmless
+
+
+def test_least_recently_used_sessions_are_dropped():
+    cache = SessionHistoryCache(max_sessions=2, max_messages=2)
+    cache.put(("m", "a", "1"), [("USER", "one"), ("USER", "two"), ("USER", "three")])
+    cache.put(("m", "a", "2"), [("USER", "two")])
+    cache.get(("m", "a", "1"))  # Now the most recently used
+    cache.put(("m", "a", "3"), [("USER", "three")])
+
+    assert cache.get(("m", "a", "2")) is None
+    assert cache.get(("m", "a", "1")) == [("USER", "two"), ("USER", "three")]  # Bounded to max_messages
+    assert cache.get(("m", "a", "3")) == [("USER", "three")]
+
+
+def test_memory_hook_serves_history_from_the_cache_and_appends_new_messages():
+    turns = [[{"role": "USER", "content": {"text": "How many orders?"}},
+              {"role": "ASSISTANT", "content": {"text": "There are 42 orders."}}]]
+    fetches = []
+    memory_client = SimpleNamespace(get_last_k_turns=lambda **kwargs: fetches.append(kwargs) or turns)
+    queued = []
+    writer = SimpleNamespace(enqueue=lambda **kwargs: queued.append(kwargs))
+    cache = SessionHistoryCache()
+    hook = MemoryHook(memory_client, *KEY, writer=writer, cache=cache)
+
+    assert hook.load_history() == [("USER", "How many orders?"), ("ASSISTANT", "There are 42 orders.")]
+    assert hook.load_history() == cache.get(KEY) and len(fetches) == 1
+
+    agent = SimpleNamespace(messages=[{"role": "user", "content": [{"text": "And last week?"}]}])
+    hook.on_message_added(SimpleNamespace(agent=agent))
+
+    assert queued[0]["role"] == "user" and queued[0]["text"] == "And last week?"
+    # Cached with the upper-case role AgentCore Memory returns, as a fetch would
+    assert cache.get(KEY)[-1] == ("USER", "And last week?")
+    cache.append(("m", "a", "uncached"), "USER", "ignored")
+    assert cache.get(("m", "a", "uncached")) is None
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the runtime entrypoint's import-time budget
+
+app.py must import without the agent modules, which the warm-up loads in
+the background, and within APP_IMPORT_BUDGET_MS. Each check runs in a
+fresh interpreter so earlier imports in the test session do not hide cost.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+
+# Generous against the ~600 ms measured by benchmarks/bench_import_time.py, to absorb slow machines
+APP_IMPORT_BUDGET_MS = float(os.environ.get("APP_IMPORT_BUDGET_MS", "1500"))
+
+# Loaded on first use or by the warm-up, never by importing app
+LAZY_MODULES = [
+    "strands",
+    "strands_tools",
+    "mcp",
+    "agent_config.agent_task",
+    "agent_config.tools.dsql_mcp_assistant",
+    "bedrock_agentcore.memory",
+]
+
+
+def run_python(code):
+    env = dict(os.environ, AWS_EC2_METADATA_DISABLED="true")
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=agentcore_path, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def cumulative_ms(stderr, module):
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        # Top-level modules are indented by a single space
+        if line.startswith("import time:") and fields[2] == f" {module}":
+            return int(fields[1]) / 1000
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_app_imports_without_the_agent_modules():
+    result = run_python(
+        "import sys, app; print(' '.join(m for m in %r if m in sys.modules))" % LAZY_MODULES
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_app_import_time_is_within_budget():
+    # Best of two runs, so a single scheduling hiccup does not fail the suite
+    elapsed = min(cumulative_ms(run_python("import app").stderr, "app") for _ in range(2))
+    assert elapsed <= APP_IMPORT_BUDGET_MS, f"import app took {elapsed:.0f} ms, budget {APP_IMPORT_BUDGET_MS:.0f} ms"
+
+
+def test_agent_modules_load_without_mcp_or_debug_logging():
+    result = run_python(
+        "import logging, sys, agent_config.agent_task; print('mcp' in sys.modules, logging.getLogger().level)"
+    )
+    loaded_mcp, root_level = result.stdout.split()
+    assert loaded_mcp == "False"  # The MCP SDK loads when the first session is spawned
+    assert int(root_level) != logging.DEBUG  # No module switches the root logger to DEBUG
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test the MCP session pool: session reuse, the size cap and acquire
+timeout, replacement of dead and aged sessions, release after errors and
+cleanup of sessions that fail to spawn
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add the agentcore and benchmark fakes paths to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+sys.path.insert(0, os.path.join(current_dir, 'benchmarks'))
+
+from agent_config.mcp_session_pool import MCPSessionPool, PoolExhaustedError
+from fakes import FakeMCPClient, SampleDatabase
+
+
+@pytest.fixture(scope="module")
+def database():
+    return SampleDatabase()
+
+
+def make_pool(database, **kwargs):
+    clients = []
+
+    def factory():
+        clients.append(FakeMCPClient(database, call_latency=0))
+        return clients[-1]
+
+    return MCPSessionPool(factory, **kwargs), clients
+
+
+def dead_thread():
+    thread = threading.Thread(target=lambda: None)
+    thread.start()
+    thread.join()
+    return thread
+
+
+def test_one_session_serves_consecutive_calls(database):
+    pool, clients = make_pool(database, max_size=2)
+    for _ in range(3):
+        result = pool.call_tool("readonly_query", {"sql": "SELECT COUNT(*) AS n FROM orders"})
+        assert result["status"] == "success"
+    assert len(clients) == 1 and clients[0].calls == 3
+    assert pool.stats()["spawned"] == 1 and pool.stats()["acquired"] == 3
+
+
+def test_acquire_waits_at_max_size_then_times_out(database):
+    pool, _ = make_pool(database, max_size=1)
+    session = pool.acquire()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire(timeout=0.05)
+
+    releaser = threading.Timer(0.05, pool.release, args=(session,))
+    releaser.start()
+    started = time.monotonic()
+    assert pool.acquire(timeout=5) is session  # Handed over once released
+    assert time.monotonic() - started >= 0.04
+    assert pool.stats()["waits"] >= 1
+
+
+def test_dead_and_aged_sessions_are_replaced(database):
+    pool, clients = make_pool(database, max_size=1, max_session_age=60)
+
+    session = pool.acquire()
+    session.client._background_thread = dead_thread()  # The transport thread exited
+    pool.release(session)
+    replacement = pool.acquire()
+    assert replacement is not session and len(clients) == 2
+
+    replacement.created_at -= 120  # Older than max_session_age
+    pool.release(replacement)
+    assert pool.acquire() is not replacement and len(clients) == 3
+    assert pool.stats()["respawned"] == 2 and pool.stats()["size"] == 1
+
+
+def test_sessions_are_released_after_tool_errors(database):
+    pool, clients = make_pool(database, max_size=1)
+
+    def failing_call(**kwargs):
+        raise RuntimeError("tool failed")
+
+    session = pool.acquire()
+    pool.release(session)
+    session.client.call_tool_sync = failing_call
+    with pytest.raises(RuntimeError):
+        pool.call_tool("readonly_query", {"sql": "SELECT 1"})
+    # The transport is alive, so the session goes back to the pool for the next caller
+    assert pool.stats()["idle"] == 1 and pool.acquire(timeout=0.1) is session
+
+    pool.release(session)
+    with pytest.raises(RuntimeError):
+        with pool.session(timeout=0.1) as borrowed:
+            borrowed.client._background_thread = dead_thread()
+            raise RuntimeError("transport failed")
+    # A failure on a dead transport closes the session and frees its slot
+    assert pool.stats()["size"] == 0 and pool.stats()["discarded"] >= 1
+
+
+def test_failed_spawn_stops_the_client(database):
+    stopped = []
+
+    class BrokenClient(FakeMCPClient):
+        def list_tools_sync(self):
+            raise RuntimeError("server exited")
+
+        def stop(self, exc_type, exc_val, exc_tb):
+            stopped.append(self)
+
+    pool = MCPSessionPool(lambda: BrokenClient(database, call_latency=0), max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=0.1)
+    # The started client is stopped and its slot freed for the next attempt
+    assert len(stopped) == 1 and pool.stats()["size"] == 0
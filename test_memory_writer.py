@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the memory write-behind writer: batching by session, retries that do
+not hold up other sessions, drain on close and a worker that survives
+unexpected errors
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+import agent_config.memory_writer as memory_writer
+from agent_config.memory_writer import MemoryWriteBehind
+
+
+class RecordingMemoryClient:
+    """Records save_conversation calls; sessions in fail_sessions fail their first failures_per_session saves"""
+
+    def __init__(self, fail_sessions=(), failures_per_session=1):
+        self.saves = []
+        self.failures = {session_id: failures_per_session for session_id in fail_sessions}
+        self.lock = threading.Lock()
+
+    def save_conversation(self, memory_id, actor_id, session_id, messages):
+        with self.lock:
+            if self.failures.get(session_id, 0) > 0:
+                self.failures[session_id] -= 1
+                raise ConnectionError("memory unavailable")
+            self.saves.append((session_id, list(messages), time.monotonic()))
+
+    def saved(self, session_id):
+        return [text for saved_id, messages, _ in self.saves if saved_id == session_id for text, _ in messages]
+
+
+def test_messages_are_batched_per_session():
+    client = RecordingMemoryClient()
+    writer = MemoryWriteBehind(client, batch_window=0.05)
+    try:
+        for index in range(3):
+            writer.enqueue("memory", "actor", "a", f"a{index}", "user")
+        for index in range(2):
+            writer.enqueue("memory", "actor", "b", f"b{index}", "user")
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert client.saved("a") == ["a0", "a1", "a2"] and client.saved("b") == ["b0", "b1"]
+    assert len(client.saves) == 2  # One call per run of messages from a session
+    metrics = writer.metrics()
+    assert metrics["saved"] == 5 and metrics["batches"] == 1 and metrics["backlog"] == 0
+
+
+def test_failed_saves_are_retried_without_holding_up_other_sessions():
+    client = RecordingMemoryClient(fail_sessions=("slow",), failures_per_session=2)
+    writer = MemoryWriteBehind(client, batch_window=0.01, backoff_base=0.2)
+    try:
+        started = time.monotonic()
+        writer.enqueue("memory", "actor", "slow", "first", "user")
+        writer.enqueue("memory", "actor", "fast", "other session", "user")
+        time.sleep(0.05)
+        writer.enqueue("memory", "actor", "slow", "second", "assistant")
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    fast_saved_at = next(at for session_id, _, at in client.saves if session_id == "fast")
+    assert fast_saved_at - started < 0.15  # Saved while "slow" waited for its backoff
+    assert client.saved("slow") == ["first", "second"]  # The session's order is kept
+    metrics = writer.metrics()
+    assert metrics["retries"] == 2 and metrics["saved"] == 3 and metrics["failed"] == 0
+
+
+def test_messages_are_dropped_once_retries_are_used_up():
+    client = RecordingMemoryClient(fail_sessions=("broken",), failures_per_session=10)
+    writer = MemoryWriteBehind(client, batch_window=0.01, max_retries=2, backoff_base=0.01)
+    try:
+        writer.enqueue("memory", "actor", "broken", "lost", "user")
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    metrics = writer.metrics()
+    assert metrics["retries"] == 2 and metrics["failed"] == 1 and metrics["backlog"] == 0
+
+
+def test_close_drains_the_backlog():
+    client = RecordingMemoryClient()
+    writer = MemoryWriteBehind(client, batch_window=0.05, max_batch_size=4)
+    for index in range(10):
+        writer.enqueue("memory", "actor", "a", f"m{index}", "user")
+
+    assert writer.close(timeout=5)
+    assert client.saved("a") == [f"m{index}" for index in range(10)]
+    assert not writer._worker.is_alive()
+    assert not writer.enqueue("memory", "actor", "a", "late", "user")
+
+
+def test_worker_survives_unexpected_errors(monkeypatch):
+    client = RecordingMemoryClient()
+    writer = MemoryWriteBehind(client, batch_window=0.01)
+    original_log_event = memory_writer.log_event
+    calls = []
+
+    def failing_log_event(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+        return original_log_event(*args, **kwargs)
+
+    monkeypatch.setattr(memory_writer, "log_event", failing_log_event)
+    try:
+        writer.enqueue("memory", "actor", "a", "before", "user")
+        assert writer.flush(timeout=2)  # The failed pass still accounts for its messages
+        writer.enqueue("memory", "actor", "a", "after", "user")
+        assert writer.flush(timeout=2)
+    finally:
+        writer.close()
+
+    assert writer._worker is not None and client.saved("a") == ["before", "after"]
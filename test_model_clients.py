@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test that the model client registry shares one model per model id, region and configuration
+"""
+
+import os
+import sys
+import threading
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.model_clients import ModelClientRegistry, bedrock_client_config
+
+
+class FakeModel:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_models_are_shared_per_key():
+    registry = ModelClientRegistry(FakeModel, bedrock_client_config(max_pool_connections=7, max_attempts=2))
+
+    model = registry.get("nova-pro", "us-east-1")
+    assert registry.get("nova-pro", "us-east-1") is model
+    assert registry.get("nova-pro", "us-west-2") is not model
+    assert registry.get("nova-pro", "us-east-1", temperature=0.2) is not model
+    assert registry.get("nova-pro", "us-east-1", temperature=0.2) is registry.get("nova-pro", "us-east-1", temperature=0.2)
+
+    config = model.kwargs["boto_client_config"]
+    assert config.max_pool_connections == 7 and config.retries == {"total_max_attempts": 2, "mode": "standard"}
+    assert registry.stats() == {"created": 3, "reused": 3, "models": 3}
+
+
+def test_concurrent_callers_get_one_model():
+    registry = ModelClientRegistry(FakeModel)
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(registry.get("nova-pro", "us-east-1"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(model) for model in models}) == 1
+    assert registry.stats()["created"] == 1
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the prompt cache layout: a static system prompt ending in a cache
+point, and history as messages ahead of the new question
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.history_cache import SessionHistoryCache
+from agent_config.memory_hook_provider import MemoryHook
+from agent_config.prompt_cache import cache_hit_ratio, cacheable_system_prompt, history_messages
+
+NOVA = "us.amazon.nova-pro-v1:0"
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+
+def test_system_prompt_ends_with_a_cache_point_for_supported_models():
+    assert cacheable_system_prompt(["Instructions", "", "Schema"], NOVA) == [
+        {"text": "Instructions"}, {"text": "Schema"}, CACHE_POINT,
+    ]
+    assert cacheable_system_prompt(["Instructions"], "meta.llama3-70b-instruct-v1:0") == [{"text": "Instructions"}]
+
+
+def test_uncached_sections_follow_the_cache_point():
+    assert cacheable_system_prompt(["Instructions"], NOVA, uncached=["Estimates", ""]) == [
+        {"text": "Instructions"}, CACHE_POINT, {"text": "Estimates"},
+    ]
+
+
+def test_history_becomes_alternating_messages_with_a_cache_point():
+    history = [
+        ("ASSISTANT", "Hello"),  # Dropped: the conversation must start with the user
+        ("USER", "How many orders?"),
+        ("USER", "Per status please"),
+        ("ASSISTANT", "12 pending, 30 shipped"),
+        ("USER", "And returns?"),  # Dropped: unanswered, the new question follows
+    ]
+    assert history_messages(history, NOVA) == [
+        {"role": "user", "content": [{"text": "How many orders?"}, {"text": "Per status please"}]},
+        {"role": "assistant", "content": [{"text": "12 pending, 30 shipped"}, CACHE_POINT]},
+    ]
+    assert history_messages([("USER", "Unanswered")], NOVA) == []
+
+
+def test_memory_hook_keeps_the_system_prompt_static():
+    memory_client = SimpleNamespace(get_last_k_turns=lambda **_: [[
+        {"role": "USER", "content": {"text": "How many orders?"}},
+        {"role": "ASSISTANT", "content": {"text": "There are 42 orders."}},
+    ]])
+    hook = MemoryHook(memory_client, "memory", "actor", "session", writer=object(), cache=SessionHistoryCache())
+    model = SimpleNamespace(get_config=lambda: {"model_id": NOVA})
+    agent = SimpleNamespace(system_prompt="You are a DSQL Database Assistant.", messages=[], model=model)
+
+    hook.on_agent_initialized(SimpleNamespace(agent=agent))
+
+    assert agent.system_prompt == "You are a DSQL Database Assistant."
+    assert [message["role"] for message in agent.messages] == ["user", "assistant"]
+    assert agent.messages[-1]["content"][-1] == CACHE_POINT
+
+
+def test_cache_hit_ratio_counts_read_tokens_against_the_whole_prompt():
+    assert cache_hit_ratio({"inputTokens": 100, "cacheReadInputTokens": 900, "cacheWriteInputTokens": 0}) == 0.9
+    assert cache_hit_ratio({"inputTokens": 0}) == 0.0
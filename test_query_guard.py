@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test the query guard's LIMIT rewriting and EXPLAIN cost check
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.query_guard import ALLOWED, LIMIT_ADDED, LIMIT_CLAMPED, REJECTED, QueryGuard, plan_estimate
+
+
+@pytest.mark.parametrize("sql, expected, action", [
+    ("SELECT * FROM orders;", "SELECT * FROM orders LIMIT 100", LIMIT_ADDED),
+    ("select * from orders -- all of them", "select * from orders LIMIT 100", LIMIT_ADDED),
+    ("SELECT * FROM orders LIMIT 5000 OFFSET 10", "SELECT * FROM orders LIMIT 100 OFFSET 10", LIMIT_CLAMPED),
+    ("SELECT * FROM orders LIMIT ALL", "SELECT * FROM orders LIMIT 100", LIMIT_CLAMPED),
+    ("SELECT * FROM orders LIMIT 10", "SELECT * FROM orders LIMIT 10", ALLOWED),
+    (
+        "WITH recent AS (SELECT * FROM orders LIMIT 5000) SELECT * FROM recent",
+        "WITH recent AS (SELECT * FROM orders LIMIT 5000) SELECT * FROM recent LIMIT 100",
+        LIMIT_ADDED,
+    ),
+    ("SELECT * FROM orders FOR UPDATE", "SELECT * FROM orders FOR UPDATE", ALLOWED),
+    ("EXPLAIN SELECT * FROM orders", "EXPLAIN SELECT * FROM orders", ALLOWED),
+    ("SELECT 1; SELECT 2", "SELECT 1; SELECT 2", ALLOWED),
+])
+def test_limit_is_added_or_clamped(sql, expected, action):
+    assert QueryGuard(max_rows=100).limit(sql) == (expected, action)
+
+
+@pytest.mark.parametrize("sql, expected", [
+    (
+        "SELECT * FROM products WHERE name = 'a--b' AND id > 3",
+        "SELECT * FROM products WHERE name = 'a--b' AND id > 3 LIMIT 10000",
+    ),
+    (
+        "SELECT * FROM t WHERE note LIKE '%/*%' AND x='*/'",
+        "SELECT * FROM t WHERE note LIKE '%/*%' AND x='*/' LIMIT 10000",
+    ),
+    (
+        "/* top */ SELECT * FROM t WHERE x = ';' -- trailing\n;",
+        "/* top */ SELECT * FROM t WHERE x = ';' LIMIT 10000",
+    ),
+])
+def test_limit_keeps_comment_markers_inside_literals(sql, expected):
+    assert QueryGuard(max_rows=10000).limit(sql) == (expected, LIMIT_ADDED)
+
+
+def test_plan_estimate_reads_the_top_node():
+    plan = [
+        {"QUERY PLAN": "Limit  (cost=0.00..2.50 rows=100 width=64)"},
+        {"QUERY PLAN": "  ->  Nested Loop  (cost=0.00..90250.00 rows=6000000 width=64)"},
+    ]
+    assert plan_estimate(plan) == (2.5, 100)
+    assert plan_estimate([{"addr": 0, "opcode": "Init"}]) is None
+
+
+def test_expensive_queries_are_rejected():
+    guard = QueryGuard(max_rows=100, max_cost=1000, explain_skip_limit=0)
+    explained = []
+
+    async def explain(sql):
+        explained.append(sql)
+        cost = 90250.0 if "JOIN" in sql else 12.0
+        return [{"QUERY PLAN": f"Nested Loop  (cost=0.00..{cost} rows=6000000 width=64)"}]
+
+    cross_join = asyncio.run(guard.check("SELECT * FROM order_items JOIN orders ON true", explain))
+    cheap = asyncio.run(guard.check("SELECT * FROM orders", explain))
+
+    assert cross_join.action == REJECTED and "90,250" in cross_join.reason
+    assert cheap.action == LIMIT_ADDED and cheap.estimated_cost == 12.0
+    # The cost is checked on the SQL that would run, LIMIT included
+    assert explained[1] == "EXPLAIN SELECT * FROM orders LIMIT 100"
+    assert guard.stats()[REJECTED] == 1 and guard.stats()[LIMIT_ADDED] == 1
+
+
+def test_failed_explain_lets_the_query_run():
+    guard = QueryGuard(max_rows=100, max_cost=1000)
+
+    async def explain(sql):
+        raise RuntimeError("EXPLAIN not permitted")
+
+    decision = asyncio.run(guard.check("SELECT * FROM orders ORDER BY total LIMIT 10", explain))
+    assert decision.action == ALLOWED and decision.estimated_cost is None
+    assert guard.stats()["explain_failures"] == 1
+
+
+@pytest.mark.parametrize("sql, cheap", [
+    ("SELECT * FROM orders LIMIT 10", True),
+    ("SELECT id, status FROM orders WHERE status = 'shipped' LIMIT 100", True),
+    ("SELECT * FROM orders LIMIT 500", False),
+    ("SELECT * FROM orders", False),
+    ("SELECT * FROM orders ORDER BY total DESC LIMIT 10", False),
+    ("SELECT * FROM orders o JOIN customers c ON c.id = o.customer_id LIMIT 10", False),
+    ("SELECT * FROM orders, customers LIMIT 10", False),
+    ("SELECT count(*) FROM orders LIMIT 10", False),
+    ("SELECT status FROM orders GROUP BY status LIMIT 10", False),
+    ("SELECT * FROM orders WHERE id IN (SELECT order_id FROM returns) LIMIT 10", False),
+    ("WITH recent AS (SELECT * FROM orders) SELECT * FROM recent LIMIT 10", False),
+])
+def test_simple_small_limit_queries_skip_explain(sql, cheap):
+    assert QueryGuard(explain_skip_limit=100).is_cheap(sql) is cheap
+
+
+def test_explain_estimates_are_reused_for_the_same_query():
+    guard = QueryGuard(max_rows=100, max_cost=1000)
+    explained = []
+
+    async def explain(sql):
+        explained.append(sql)
+        return [{"QUERY PLAN": "Sort  (cost=0.00..12.00 rows=100 width=64)"}]
+
+    async def run():
+        for sql in (
+            "SELECT * FROM orders ORDER BY total",
+            "select *  from orders\n order by total;",  # Same query, formatted differently
+            "SELECT * FROM orders LIMIT 10",  # Skipped: cheap
+        ):
+            await guard.check(sql, explain)
+
+    asyncio.run(run())
+
+    assert explained == ["EXPLAIN SELECT * FROM orders ORDER BY total LIMIT 100"]
+    assert guard.stats()["explain_cached"] == 1 and guard.stats()["explain_skipped"] == 1
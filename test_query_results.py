@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test the query result caps, summaries and client pages
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.context import DSQLAssistantContext
+from agent_config.query_results import QueryResultHandler, result_pages, summarize_rows
+from agent_config.streaming_queue import StreamingQueue
+
+
+def make_rows(count):
+    return [{"id": i, "name": f"customer {i}", "total": i * 1.5, "note": None} for i in range(count)]
+
+
+def tool_result(rows):
+    return {"toolUseId": "t1", "status": "success", "content": [{"text": json.dumps(rows)}]}
+
+
+def test_summary_has_stats_and_fits_the_byte_cap():
+    rows = make_rows(200)
+    summary = summarize_rows(rows, "r1", head_rows=50, max_bytes=2048)
+
+    assert summary["row_count"] == 200
+    columns = {column["name"]: column for column in summary["columns"]}
+    assert columns["total"]["type"] == "number" and columns["total"]["max"] == 298.5
+    assert columns["name"]["distinct"] == 200
+    assert columns["note"]["nulls"] == 200
+    assert 0 < len(summary["head"]) < 50
+    assert len(json.dumps(summary).encode("utf-8")) <= 2048
+
+
+def test_pages_cover_the_rows_up_to_the_client_cap():
+    rows = make_rows(25)
+    frames = list(result_pages("r1", "SELECT 1", rows, page_rows=10, max_rows=22, result_format="rows"))
+
+    assert [frame["page"] for frame in frames] == [0, 1, 2]
+    assert [column["name"] for column in frames[0]["schema"]] == ["id", "name", "total", "note"]
+    assert sum(len(frame["rows"]) for frame in frames) == 22
+    assert frames[-1]["last"] and frames[-1]["truncated"]
+    assert frames[0]["rows"][1] == [1, "customer 1", 1.5, None]
+
+
+def test_columnar_pages_are_typed_per_result():
+    rows = [{"id": 1, "price": 2, "day": "2024-01-01"}, {"id": 2, "price": 2.5, "day": None}]
+    (frame,) = result_pages("r1", "SELECT 1", rows, result_format="columns")
+
+    assert frame["schema"] == [
+        {"name": "id", "type": "int64"},
+        {"name": "price", "type": "float64"},
+        {"name": "day", "type": "string"},
+    ]
+    assert frame["columns"] == [[1, 2], [2.0, 2.5], ["2024-01-01", None]]
+
+
+def test_arrow_pages_round_trip():
+    pyarrow = pytest.importorskip("pyarrow")
+    rows = make_rows(3)
+    (frame,) = result_pages("r1", "SELECT 1", rows, result_format="arrow")
+
+    table = pyarrow.ipc.open_stream(base64.b64decode(frame["arrow"])).read_all()
+    assert table.column("total").to_pylist() == [0.0, 1.5, 3.0]
+    assert str(table.schema.field("note").type) == "null"
+
+
+def test_large_result_is_summarized_and_paged_to_the_client():
+    handler = QueryResultHandler(model_max_rows=20, model_max_bytes=4096, head_rows=5, page_rows=40, pages_enabled=True)
+
+    async def run():
+        queue = StreamingQueue()
+        DSQLAssistantContext.set_response_queue_ctx(queue)
+        small_rows, large_rows = make_rows(3), make_rows(100)
+        small = await handler.handle("SELECT small", tool_result(small_rows), small_rows)
+        large = await handler.handle("SELECT large", tool_result(large_rows), large_rows)
+        await queue.finish()
+        return small, large, [frame async for frame in queue.stream()]
+
+    small, large, frames = asyncio.run(run())
+
+    assert small == tool_result(make_rows(3))
+    summary = json.loads(large["content"][0]["text"])
+    assert large["toolUseId"] == "t1" and summary["row_count"] == 100 and len(summary["head"]) == 5
+    large_frames = [frame for frame in frames if frame["sql"] == "SELECT large"]
+    assert summary["result_id"] == large_frames[0]["result_id"]
+    assert sum(len(frame["columns"][0]) for frame in large_frames) == 100
+
+
+def test_pages_are_not_sent_by_default():
+    handler = QueryResultHandler(model_max_rows=20)
+
+    async def run():
+        queue = StreamingQueue()
+        DSQLAssistantContext.set_response_queue_ctx(queue)
+        rows = make_rows(100)
+        result = await handler.handle("SELECT large", tool_result(rows), rows)
+        await queue.finish()
+        return result, [frame async for frame in queue.stream()]
+
+    result, frames = asyncio.run(run())
+
+    assert frames == []
+    assert "Only this summary is available" in json.loads(result["content"][0]["text"])["note"]
+
+
+def test_clients_choose_the_result_format_per_request():
+    handler = QueryResultHandler(model_max_rows=20)
+
+    async def request(result_format):
+        queue = StreamingQueue()
+        DSQLAssistantContext.set_response_queue_ctx(queue)
+        DSQLAssistantContext.set_result_format_ctx(result_format)
+        rows = make_rows(3)
+        await handler.handle("SELECT 1", tool_result(rows), rows)
+        await queue.finish()
+        return [frame async for frame in queue.stream()]
+
+    async def run():
+        # Each request runs in its own task, as invoke does, so one client's choice stays with it
+        return [await asyncio.create_task(request(result_format)) for result_format in (None, "rows", "parquet")]
+
+    no_format, rows_frames, unknown = asyncio.run(run())
+
+    assert no_format == []
+    assert rows_frames[0]["format"] == "rows" and len(rows_frames[0]["rows"]) == 3
+    assert unknown[0]["format"] == "columns"
+
+
+def test_publish_from_another_event_loop():
+    async def run():
+        queue = StreamingQueue(maxsize=1)
+        frames = []
+
+        async def consume():
+            async for frame in queue.stream():
+                frames.append(frame)
+
+        consumer = asyncio.create_task(consume())
+        # A nested agent's tools run on their own loop in a worker thread
+        worker = threading.Thread(
+            target=lambda: asyncio.run(_publish_all(queue, [{"page": i} for i in range(5)]))
+        )
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        await queue.finish()
+        await consumer
+        return frames
+
+    assert asyncio.run(run()) == [{"page": i} for i in range(5)]
+
+
+async def _publish_all(queue, frames):
+    for frame in frames:
+        await queue.publish(frame)
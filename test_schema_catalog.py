@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test the schema catalog: table assembly from catalog rows, table
+descriptions, digest truncation, the structure fingerprint, a single
+first load for concurrent callers and backoff after a failed load
+"""
+
+import os
+import sys
+import threading
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+import agent_config.schema_catalog as schema_catalog
+from agent_config.schema_catalog import COLUMNS_SQL, KEYS_SQL, ROW_ESTIMATES_SQL, SchemaCatalog, build_tables
+
+COLUMN_ROWS = [
+    {"table_name": "orders", "column_name": "order_id", "data_type": "integer", "is_nullable": "NO"},
+    {"table_name": "orders", "column_name": "customer_id", "data_type": "integer", "is_nullable": "NO"},
+    {"table_name": "orders", "column_name": "placed_at", "data_type": "timestamp with time zone", "is_nullable": "YES"},
+    {"table_name": "customers", "column_name": "customer_id", "data_type": "integer", "is_nullable": "NO"},
+    {"table_name": "customers", "column_name": "name", "data_type": "character varying", "is_nullable": "YES"},
+]
+KEY_ROWS = [
+    {"table_name": "orders", "column_name": "order_id", "constraint_type": "PRIMARY KEY"},
+    {"table_name": "orders", "column_name": "customer_id", "constraint_type": "FOREIGN KEY",
+     "foreign_table": "customers", "foreign_column": "customer_id"},
+    {"table_name": "customers", "column_name": "customer_id", "constraint_type": "PRIMARY KEY"},
+]
+ESTIMATE_ROWS = [
+    {"table_name": "orders", "row_estimate": 1200},
+    {"table_name": "customers", "row_estimate": None},  # Skipped: not analyzed yet
+]
+
+
+class FakeCatalogDatabase:
+    def __init__(self):
+        self.rows = {COLUMNS_SQL: COLUMN_ROWS, KEYS_SQL: KEY_ROWS, ROW_ESTIMATES_SQL: ESTIMATE_ROWS}
+        self.queries = []
+        self.failing = False
+
+    def query(self, sql):
+        self.queries.append(sql)
+        if self.failing:
+            raise RuntimeError("catalog unavailable")
+        return self.rows[sql]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+def test_build_tables_and_describe():
+    customers, orders = build_tables(COLUMN_ROWS, KEY_ROWS, ESTIMATE_ROWS)
+
+    assert [column.name for column in orders.columns] == ["order_id", "customer_id", "placed_at"]
+    assert orders.primary_key == ("order_id",)
+    assert orders.foreign_keys == (("customer_id", "customers", "customer_id"),)
+    assert orders.row_estimate == 1200 and customers.row_estimate is None
+    assert orders.describe() == (
+        "orders(order_id int PK, customer_id int -> customers.customer_id NOT NULL, placed_at timestamptz)"
+    )
+    assert customers.describe() == "customers(customer_id int PK, name varchar)"
+
+
+def test_digest_is_truncated_to_its_size_cap():
+    database = FakeCatalogDatabase()
+    database.rows[COLUMNS_SQL] = [
+        {"table_name": f"table_{index:02d}", "column_name": "id", "data_type": "integer", "is_nullable": "NO"}
+        for index in range(20)
+    ]
+    catalog = SchemaCatalog(database.query, digest_max_chars=100)
+
+    lines = catalog.digest().splitlines()
+
+    assert len("\n".join(lines[:-1])) <= 100
+    assert lines[0] == "table_00(id int NOT NULL)"
+    assert lines[-1] == f"... and {20 - len(lines) + 1} more tables (use get_schema for details)"
+
+
+def test_fingerprint_follows_the_structure_not_the_row_estimates():
+    database = FakeCatalogDatabase()
+    catalog = SchemaCatalog(database.query)
+    catalog.refresh()
+    fingerprint = catalog.fingerprint
+    assert len(fingerprint) == 16
+
+    database.rows[ROW_ESTIMATES_SQL] = [{"table_name": "orders", "row_estimate": 5000}]
+    catalog.refresh()
+    assert catalog.fingerprint == fingerprint and catalog.row_estimates() == "orders ~5000"
+    assert "5000" not in catalog.digest()  # The digest stays byte-identical for the prompt cache
+
+    database.rows[COLUMNS_SQL] = COLUMN_ROWS + [
+        {"table_name": "orders", "column_name": "status", "data_type": "text", "is_nullable": "YES"},
+    ]
+    catalog.note_statement("ALTER TABLE orders ADD COLUMN status text")
+    assert "status text" in catalog.digest() and catalog.fingerprint != fingerprint
+
+
+def test_concurrent_first_use_loads_the_catalog_once():
+    database = FakeCatalogDatabase()
+    release = threading.Event()
+    query = database.query
+
+    def slow_query(sql):
+        release.wait(5)
+        return query(sql)
+
+    catalog = SchemaCatalog(slow_query)
+    digests = []
+    threads = [threading.Thread(target=lambda: digests.append(catalog.digest())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert database.queries.count(COLUMNS_SQL) == 1
+    assert len(digests) == 8 and all(digest.startswith("customers(") for digest in digests)
+
+
+def test_failed_loads_are_not_retried_until_the_backoff_passes(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(schema_catalog, "time", clock)
+    database = FakeCatalogDatabase()
+    database.failing = True
+    catalog = SchemaCatalog(database.query, retry_seconds=30)
+
+    assert catalog.digest() == ""
+    assert catalog.digest() == "" and catalog.tables() == ()
+    assert len(database.queries) == 1  # Served empty within the backoff
+
+    clock.now += 31
+    database.failing = False
+    assert catalog.digest().startswith("customers(")
+    assert len(catalog.tables()) == 2
+
+    # A failed reload after DDL keeps the previous catalog and backs off as well
+    database.failing = True
+    catalog.invalidate()
+    queries = len(database.queries)
+    assert catalog.digest().startswith("customers(") and catalog.digest().startswith("customers(")
+    assert len(database.queries) == queries + 1
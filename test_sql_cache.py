@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the normalized-SQL result cache
+"""
+
+import sys
+import os
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.sql_cache import QueryResultCache
+from agent_config.sql_utils import normalize_sql, referenced_tables
+
+
+def result(text):
+    return {"toolUseId": "t1", "status": "success", "content": [{"text": text}]}
+
+
+def test_formatting_differences_share_a_key():
+    """Whitespace, case and comments do not change the cache key"""
+    first = normalize_sql("SELECT *\n  FROM Orders -- open orders\n WHERE status = 'open';")
+    second = normalize_sql("select * from orders where status='open'")
+    assert first == second
+    assert first[0] == "select * from orders where status = ?"
+    assert normalize_sql("select * from orders where status = 'closed'") != first
+
+
+def test_comment_markers_inside_literals_are_part_of_the_key():
+    """-- and /* inside quoted literals are not comments"""
+    dashes = normalize_sql("SELECT * FROM products WHERE name = 'a--b' AND id > 3")
+    assert dashes == ("select * from products where name = ? and id > ?", ("'a--b'", "3"))
+    assert normalize_sql("SELECT * FROM products WHERE name = 'a--c' AND id > 3") != dashes
+
+    block = normalize_sql("SELECT * FROM t WHERE note LIKE '%/*%' AND x = '*/'")
+    assert block == ("select * from t where note like ? and x = ?", ("'%/*%'", "'*/'"))
+    assert normalize_sql("SELECT * FROM t WHERE note LIKE '%/*%' AND x = 'y*/'") != block
+    assert normalize_sql('SELECT "a--b" FROM t /* real comment */') == ('select "a--b" from t', ())
+
+    cache = QueryResultCache()
+    cache.put("SELECT * FROM products WHERE name = 'a--b' AND id > 3", result('[{"id": 4}]'))
+    assert cache.get("SELECT * FROM products WHERE name = 'a--c' AND id > 3") is None
+
+
+def test_referenced_tables():
+    """Tables in FROM lists, joins and subqueries are found"""
+    sql = """SELECT c.category_name, AVG(r.rating)
+             FROM public.products p
+             JOIN categories c ON p.category_id = c.category_id, reviews r
+             WHERE p.product_id IN (SELECT product_id FROM order_items)"""
+    assert referenced_tables(sql) == {"products", "categories", "reviews", "order_items"}
+
+
+def test_hits_misses_and_table_invalidation():
+    """Cached results are served until a write touches one of their tables"""
+    cache = QueryResultCache()
+    sql = "SELECT status, COUNT(*) FROM orders GROUP BY status"
+    assert cache.get(sql) is None
+    assert cache.put(sql, result('[{"status": "open", "count": 3}]'))
+
+    hit = cache.get("select status, count(*) from orders group by status")
+    assert hit["content"][0]["text"] == '[{"status": "open", "count": 3}]'
+    assert "toolUseId" not in hit
+
+    assert cache.invalidate_tables({"customers"}) == 0
+    assert cache.invalidate_tables({"orders"}) == 1
+    assert cache.get(sql) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_errors_and_volatile_queries_are_not_cached():
+    cache = QueryResultCache()
+    assert not cache.put("SELECT 1", {"status": "error", "content": []})
+    assert not cache.put("SELECT now()", result("[]"))
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = QueryResultCache(max_entries=2, max_bytes=10)
+    cache.put("SELECT a FROM t1", result("1234"))
+    cache.put("SELECT a FROM t2", result("1234"))
+    cache.get("SELECT a FROM t1")
+    cache.put("SELECT a FROM t3", result("1234"))
+    assert cache.get("SELECT a FROM t2") is None
+    assert cache.get("SELECT a FROM t1") is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the question to SQL plan cache
+"""
+
+import contextvars
+import os
+import sys
+import threading
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.sql_plan_cache import SQLPlanCache, note_query, note_write, normalize_question, record_plan
+
+STATUS_SQL = "SELECT status, COUNT(*) FROM orders GROUP BY status"
+
+
+def test_paraphrases_normalize_to_the_same_key():
+    assert normalize_question("Show me the top customers!") == normalize_question("top customer")
+    assert normalize_question("How many orders?") != normalize_question("List orders")
+
+
+def test_exact_and_similar_lookups():
+    exact_only = SQLPlanCache()
+    exact_only.put("Break down orders by status", "v1", [STATUS_SQL])
+    assert exact_only.get("Please break down the orders by status", "v1") == (STATUS_SQL,)
+    assert exact_only.get("Break down all orders by their status", "v1") is None
+
+    similar = SQLPlanCache(min_similarity=0.6)
+    similar.put("Break down orders by status", "v1", [STATUS_SQL])
+    similar.put("top 5 products by revenue", "v1", ["SELECT ... LIMIT 5"])
+    assert similar.get("Break down all orders by their status", "v1") == (STATUS_SQL,)
+    # Different numbers are a different question, however similar the words
+    assert similar.get("top 10 products by revenue", "v1") is None
+    assert similar.stats()["similar_hits"] == 1
+
+
+def test_schema_change_drops_plans():
+    cache = SQLPlanCache()
+    cache.put("orders by status", "v1", [STATUS_SQL])
+    assert cache.get("orders by status", "v2") is None
+    assert cache.stats()["entries"] == 0
+
+    cache.put("orders by status", "v2", [STATUS_SQL])
+    cache.invalidate((STATUS_SQL,))
+    assert cache.get("orders by status", "v2") is None
+
+
+def test_long_plans_are_not_cached():
+    cache = SQLPlanCache(max_statements=2)
+    probes = ["SELECT * FROM orders LIMIT 5", "SELECT DISTINCT status FROM orders", STATUS_SQL]
+    cache.put("orders by status", "v1", probes)
+    assert cache.get("orders by status", "v1") is None
+    assert cache.stats()["too_long"] == 1 and cache.stats()["stores"] == 0
+
+    cache.put("orders by status", "v1", probes[-2:])
+    assert cache.get("orders by status", "v1") == tuple(probes[-2:])
+
+
+def test_recorder_collects_answer_sql_across_threads():
+    with record_plan() as plan:
+        # The SQL agent's tools run in a worker thread with a copied context
+        context = contextvars.copy_context()
+        worker = threading.Thread(target=context.run, args=(lambda: [
+            note_query("SELECT column_name FROM information_schema.columns", True),
+            note_query("SELECT * FROM missing_table", False),
+            note_query(STATUS_SQL, True),
+        ],))
+        worker.start()
+        worker.join()
+    assert plan.statements == [STATUS_SQL] and plan.replayable
+
+    with record_plan() as plan:
+        note_query(STATUS_SQL, True)
+        note_write()
+    assert not plan.replayable
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the TTL-cached SSM parameter loader
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from botocore.exceptions import ClientError
+from scripts.utils import SSMParameterCache
+
+PATH = "/agentcore-db-mcp-assistant/"
+
+
+class FakeSSMClient:
+    """In-memory SSM client counting GetParametersByPath calls"""
+
+    def __init__(self, values):
+        self.values = values
+        self.path_calls = 0
+        self.get_calls = 0
+        self.throttled = False
+        self.latency = 0.0
+
+    def get_paginator(self, operation_name):
+        client = self
+
+        class Paginator:
+            def paginate(self, Path, Recursive, WithDecryption):
+                client.path_calls += 1
+                time.sleep(client.latency)
+                if client.throttled:
+                    raise ClientError({"Error": {"Code": "ThrottlingException"}}, "GetParametersByPath")
+                items = [{"Name": k, "Value": v} for k, v in client.values.items() if k.startswith(Path)]
+                # Two pages to exercise pagination
+                yield {"Parameters": items[:1]}
+                yield {"Parameters": items[1:]}
+
+        return Paginator()
+
+    def get_parameter(self, Name, WithDecryption):
+        self.get_calls += 1
+        if Name not in self.values:
+            raise ClientError({"Error": {"Code": "ParameterNotFound"}}, "GetParameter")
+        return {"Parameter": {"Value": self.values[Name]}}
+
+
+def make_client():
+    return FakeSSMClient({
+        PATH + "DSQL_CLUSTER_ID": "cluster-1",
+        PATH + "AWS_REGION": "us-east-1",
+        PATH + "MEMORY_ID": "memory-1",
+    })
+
+
+def test_prefix_loaded_in_one_call():
+    """All project parameters come from a single GetParametersByPath call"""
+    client = make_client()
+    cache = SSMParameterCache(path=PATH, client=client)
+
+    assert cache.get(PATH + "DSQL_CLUSTER_ID") == "cluster-1"
+    assert cache.get(PATH + "AWS_REGION") == "us-east-1"
+    assert cache.get(PATH + "MEMORY_ID") == "memory-1"
+    assert client.path_calls == 1
+
+
+def test_stale_value_served_when_throttled():
+    """An expired value is kept when the synchronous reload is throttled"""
+    client = make_client()
+    cache = SSMParameterCache(path=PATH, client=client, ttl_seconds=0, max_stale_seconds=0)
+    assert cache.get(PATH + "MEMORY_ID") == "memory-1"
+
+    client.throttled = True
+    assert cache.get(PATH + "MEMORY_ID") == "memory-1"
+
+
+def test_missing_parameter_raises():
+    """Parameters that do not exist still surface the SSM error"""
+    cache = SSMParameterCache(path=PATH, client=make_client())
+    try:
+        cache.get(PATH + "UNKNOWN")
+    except ClientError as e:
+        assert e.response["Error"]["Code"] == "ParameterNotFound"
+    else:
+        raise AssertionError("Expected ClientError")
+
+
+def test_concurrent_cold_loads_share_one_call():
+    """Callers arriving during the first load wait for it instead of loading the path again"""
+    client = make_client()
+    client.latency = 0.05
+    cache = SSMParameterCache(path=PATH, client=client)
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(cache.get(PATH + "MEMORY_ID"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert values == ["memory-1"] * 8
+    assert client.path_calls == 1
+
+
+def test_missing_parameter_is_remembered_for_the_ttl():
+    """A parameter missing from the path is not looked up again until the TTL passes"""
+    client = make_client()
+    cache = SSMParameterCache(path=PATH, client=client)
+    for _ in range(3):
+        try:
+            cache.get(PATH + "UNKNOWN")
+        except ClientError:
+            pass
+    assert client.path_calls == 1 and client.get_calls == 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the bounded, coalescing StreamingQueue
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.streaming_queue import StreamingQueue
+
+
+async def collect(queue):
+    return [item async for item in queue.stream()]
+
+
+def test_text_deltas_are_coalesced():
+    """Adjacent text deltas are merged into frames without losing content"""
+    async def run():
+        queue = StreamingQueue(maxsize=0, max_frame_bytes=16, flush_interval=10)
+        consumer = asyncio.create_task(collect(queue))
+        for token in ["a"] * 40:
+            await queue.put(token)
+        await queue.finish()
+        return await consumer, queue.metrics()
+
+    frames, metrics = asyncio.run(run())
+    assert "".join(frames) == "a" * 40
+    # The first delta is sent alone, the rest in frames of at least 16 bytes
+    assert frames[0] == "a"
+    assert len(frames) <= 4
+    assert metrics["items_received"] == 40
+    assert metrics["frames_emitted"] == len(frames)
+
+
+def test_non_text_items_keep_their_order():
+    """Structured items flush pending text first and are never merged"""
+    async def run():
+        queue = StreamingQueue(max_frame_bytes=1024, flush_interval=10)
+        consumer = asyncio.create_task(collect(queue))
+        await queue.put("first")
+        await queue.put("hello ")
+        await queue.put("world")
+        await queue.put({"type": "event"})
+        await queue.put("!")
+        await queue.finish()
+        return await consumer
+
+    assert asyncio.run(run()) == ["first", "hello world", {"type": "event"}, "!"]
+
+
+def test_pending_text_flushed_after_interval():
+    """Small deltas are delivered once the flush interval elapses"""
+    async def run():
+        queue = StreamingQueue(max_frame_bytes=1024, flush_interval=0.01)
+        await queue.put("first")
+        await queue.put("tail")
+        await asyncio.sleep(0.05)
+        return queue.metrics()
+
+    assert asyncio.run(run())["queue_depth"] == 2
+
+
+def test_full_queue_applies_backpressure():
+    """Producers wait once maxsize frames are buffered"""
+    async def run():
+        queue = StreamingQueue(maxsize=2, max_frame_bytes=0)
+        await queue.put("a")
+        await queue.put("b")
+        blocked = asyncio.create_task(queue.put("c"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        # Closing from the consumer side releases the waiting producer
+        queue.close()
+        await asyncio.wait_for(blocked, 1)
+        return queue.metrics()
+
+    assert asyncio.run(run())["producer_waits"] >= 1
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test structured logging: payload hashing and truncation, sampling, quiet
+library loggers and formatting on the listener thread
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+import threading
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.structured_logging import (
+    StructuredFormatter,
+    configure_logging,
+    log_event,
+    payload_digest,
+    stop_logging,
+)
+
+
+def make_record(**fields):
+    record = logging.makeLogRecord({"name": "agent_config.test", "levelname": "INFO", "msg": "test.event"})
+    record.__dict__.update(fields)
+    return record
+
+
+def test_payloads_are_hashed_and_long_fields_truncated():
+    question = "How many orders did each customer place last month?"
+    entry = json.loads(StructuredFormatter("json", "hash", max_field_chars=10).format(
+        make_record(query=question, table="customer_orders_2024", rows=12)
+    ))
+    assert entry["event"] == "test.event" and entry["rows"] == 12
+    assert entry["query"] == {"sha256": payload_digest(question), "chars": len(question)}
+    assert entry["table"] == "customer_o... (20 chars)"
+
+    entry = json.loads(StructuredFormatter("json", "truncate", max_field_chars=10).format(make_record(query=question)))
+    assert entry["query"] == f"How many o... ({len(question)} chars)"
+
+
+def test_sampled_events_are_dropped_before_a_record_is_built():
+    logger = logging.getLogger("agent_config.test_sampling")
+    logger.setLevel(logging.INFO)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    try:
+        log_event(logger, logging.INFO, "never", sample=0.0)
+        log_event(logger, logging.DEBUG, "disabled")
+        log_event(logger, logging.INFO, "always", rows=3)
+        log_event(logger, logging.INFO, "sampled", sample=0.999999)
+    finally:
+        logger.removeHandler(handler)
+    assert [record.getMessage() for record in records] == ["always", "sampled"]
+    assert records[0].rows == 3 and records[1].sample_rate == 0.999999
+
+
+def test_records_are_formatted_on_the_listener_thread():
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    levels = {name: logging.getLogger(name).level for name in ("agent_config", "botocore", "mcp")}
+    formatting_threads = []
+    original_format = StructuredFormatter.format
+
+    def recording_format(self, record):
+        formatting_threads.append(threading.current_thread())
+        return original_format(self, record)
+
+    stream = io.StringIO()
+    StructuredFormatter.format = recording_format
+    try:
+        configure_logging(level="INFO", levels="mcp=ERROR", stream=stream)
+        configure_logging(level="DEBUG")  # Idempotent: the first configuration stays
+        log_event(logging.getLogger("agent_config.test"), logging.INFO, "test.event", sql="SELECT 1")
+        logging.getLogger("botocore.test").info("library noise")
+        assert logging.getLogger("botocore").getEffectiveLevel() == logging.WARNING
+        assert logging.getLogger("mcp").getEffectiveLevel() == logging.ERROR
+        stop_logging()
+    finally:
+        StructuredFormatter.format = original_format
+        stop_logging()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["logger"] == "agent_config.test" and entry["sql"]["sha256"] == payload_digest("SELECT 1")
+    assert formatting_threads and threading.main_thread() not in formatting_threads
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the request pipeline telemetry
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agent_config import telemetry
+
+
+@pytest.fixture
+def otel(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    reader = InMemoryMetricReader()
+    meter_provider = MeterProvider(metric_readers=[reader])
+
+    monkeypatch.setattr(telemetry, "TELEMETRY_ENABLED", True)
+    monkeypatch.setattr(telemetry, "_tracer", tracer_provider.get_tracer("test"))
+    monkeypatch.setattr(telemetry, "_instruments", {})
+    monkeypatch.setattr(telemetry, "metrics", SimpleNamespace(get_meter=meter_provider.get_meter))
+    return exporter, reader
+
+
+def _histogram_points(reader, name):
+    points = []
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name == name:
+                    points.extend(metric.data.data_points)
+    return points
+
+
+def test_disabled_stage_is_a_shared_noop(monkeypatch):
+    monkeypatch.setattr(telemetry, "TELEMETRY_ENABLED", False)
+    with telemetry.stage("invoke", {"session.id": "s1"}) as span:
+        span.set_attribute("stream.frames", 3)
+    assert telemetry.stage("other") is telemetry.stage("invoke")
+    telemetry.record_tokens(10, 5)
+
+
+def test_nested_stages_produce_parented_spans_and_durations(otel):
+    exporter, reader = otel
+    with telemetry.stage("invoke", {"session.id": "s1", "actor.id": None}):
+        with telemetry.stage("mcp.call_tool", {"tool.name": "readonly_query"}, {"tool.name": "readonly_query"}) as span:
+            span.set_attribute("db.rows", 7)
+
+    child, parent = exporter.get_finished_spans()
+    assert parent.name == "invoke" and dict(parent.attributes) == {"session.id": "s1"}
+    assert child.parent.span_id == parent.context.span_id
+    assert child.attributes["db.rows"] == 7
+
+    stages = {point.attributes["stage"]: point for point in _histogram_points(reader, "dsql_assistant.stage.duration")}
+    assert set(stages) == {"invoke", "mcp.call_tool"}
+    assert stages["mcp.call_tool"].attributes["tool.name"] == "readonly_query"
+    assert "session.id" not in stages["invoke"].attributes  # high-cardinality values stay on spans
+
+
+def test_failed_stage_is_marked_as_error(otel):
+    exporter, reader = otel
+    with pytest.raises(RuntimeError):
+        with telemetry.stage("memory.load"):
+            raise RuntimeError("throttled")
+
+    (span,) = exporter.get_finished_spans()
+    assert not span.status.is_ok
+    (point,) = _histogram_points(reader, "dsql_assistant.stage.duration")
+    assert point.attributes["error"] is True
+
+
+def test_generator_stage_is_current_only_while_producing_items(otel):
+    exporter, _ = otel
+
+    async def produce():
+        for index in range(2):
+            with telemetry.stage("model.call"):
+                await asyncio.sleep(0)
+            yield index
+
+    async def stream():
+        with telemetry.stage("agent.stream", current=False) as span:
+            async for item in telemetry.traced_iter(span, produce()):
+                yield item
+
+    async def consume():
+        async for _ in stream():
+            with telemetry.stage("consumer.work"):
+                pass
+
+    asyncio.run(consume())
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    parent = spans["agent.stream"]
+    assert spans["model.call"].parent.span_id == parent.context.span_id
+    assert spans["consumer.work"].parent is None  # The consumer's work is not nested under the generator
+
+
+def test_non_current_stage_records_errors(otel):
+    exporter, _ = otel
+    with pytest.raises(RuntimeError):
+        with telemetry.stage("invoke", current=False):
+            raise RuntimeError("stream failed")
+
+    (span,) = exporter.get_finished_spans()
+    assert not span.status.is_ok and span.events[0].name == "exception"
+
+
+def test_tokens_are_recorded_by_direction(otel):
+    _, reader = otel
+    telemetry.record_tokens(120, 30, {"agent": "sql"}, cache_read_tokens=900, cache_write_tokens=0)
+
+    points = {point.attributes["direction"]: point for point in _histogram_points(reader, "dsql_assistant.tokens")}
+    assert points["input"].sum == 120 and points["output"].sum == 30
+    assert points["cache_read"].sum == 900 and points["cache_write"].sum == 0
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the startup warm-up stages and readiness reporting
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the agentcore path to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+agentcore_path = os.path.join(current_dir, 'agentcore-strands-db-mcp-assistant')
+sys.path.insert(0, agentcore_path)
+
+from agent_config.warmup import Warmup
+
+
+def test_stages_run_in_order_and_are_timed():
+    calls = []
+    warmup = Warmup([
+        ("first", lambda: calls.append("first")),
+        ("second", lambda: (time.sleep(0.02), calls.append("second"))),
+    ])
+    report = warmup.run()
+
+    assert calls == ["first", "second"]
+    assert report["finished"] and report["ready"]
+    assert set(report["stages"]) == {"first", "second"}
+    assert report["stages"]["second"] >= 20
+
+
+def test_failing_stage_is_recorded_and_later_stages_still_run():
+    calls = []
+
+    def broken():
+        raise RuntimeError("no credentials")
+
+    report = Warmup([("config", broken), ("schema", lambda: calls.append("schema"))]).run()
+
+    assert calls == ["schema"]
+    assert report["errors"] == {"config": "no credentials"}
+
+
+def test_not_ready_while_running_and_ready_after_max_seconds():
+    release = threading.Event()
+    warmup = Warmup([("mcp_sessions", release.wait)], max_seconds=0.05)
+    assert warmup.ready  # never started
+
+    warmup.start()
+    assert not warmup.ready
+    time.sleep(0.1)
+    assert warmup.ready  # a hung stage does not keep the container busy
+
+    release.set()
+    assert warmup.wait(1)
+    assert warmup.report()["finished"]